@@ -1,3 +1,10 @@
 from django.contrib import admin
+from apps.authentication.models import AuthToken
 
-# Register your models here.
+
+@admin.register(AuthToken)
+class AuthTokenAdmin(admin.ModelAdmin):
+    list_display = ('user', 'created', 'last_used')
+    search_fields = ('user__username',)
+    readonly_fields = ('digest', 'created', 'last_used')
+    raw_id_fields = ('user',)
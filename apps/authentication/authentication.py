@@ -0,0 +1,156 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import router
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import BaseAuthentication, get_authorization_header
+
+from apps.authentication.last_used import recorder
+from apps.authentication.models import AuthToken, hash_token
+from apps.core.cache import LocalTTLCache, VersionStamps
+
+
+def get_token_cache():
+    global _token_cache
+    if _token_cache is None:
+        _token_cache = LocalTTLCache(
+            max_entries=getattr(settings, 'AUTH_TOKEN_CACHE_MAX_ENTRIES', 10000),
+            ttl=getattr(settings, 'AUTH_TOKEN_CACHE_TTL', 300))
+    return _token_cache
+
+
+_token_cache = None
+
+
+def get_user_stamps():
+    return VersionStamps(getattr(settings, 'AUTH_TOKEN_CACHE_ALIAS', 'default'))
+
+
+def user_stamp(user_id):
+    return f'auth-user:{user_id}'
+
+
+def invalidate_user_tokens(user_id):
+    """
+    Invalida en todos los procesos los tokens cacheados del usuario: el
+    sello cambia y las entradas guardadas con el anterior se descartan.
+    """
+    get_user_stamps().bump_on_commit(user_stamp(user_id))
+
+
+class CachedTokenAuthentication(BaseAuthentication):
+    """
+    Autenticación `Authorization: Token <clave>` contra AuthToken.
+
+    Cada proceso guarda en memoria (LRU con caducidad) hash del token ->
+    copia de las columnas del usuario y caducidad del token, así que una
+    petición autenticada no consulta la base de datos. La entrada se valida con el sello de versión
+    del usuario, que cambia al cerrar sesión, al guardar el usuario
+    (contraseña, desactivación, roles...) y al borrarlo.
+    """
+    keyword = 'Token'
+
+    def get_key(self, request):
+        auth = get_authorization_header(request).split()
+        if not auth or auth[0].lower() != self.keyword.lower().encode():
+            return None
+        if len(auth) != 2:
+            raise exceptions.AuthenticationFailed(
+                _('Cabecera de token no válida.'))
+        try:
+            return auth[1].decode()
+        except UnicodeError:
+            raise exceptions.AuthenticationFailed(
+                _('Cabecera de token no válida.'))
+
+    def authenticate(self, request):
+        key = self.get_key(request)
+        if key is None:
+            return None
+        return self.authenticate_credentials(key)
+
+    async def aauthenticate(self, request):
+        """Versión asíncrona para las vistas async (ver apps.core.views.async_api)."""
+        key = self.get_key(request)
+        if key is None:
+            return None
+        return await self.aauthenticate_credentials(key)
+
+    def authenticate_credentials(self, key):
+        digest = hash_token(key)
+        cache = get_token_cache()
+        stamps = get_user_stamps()
+
+        entry = cache.get(digest)
+        if entry is not None and stamps.get(user_stamp(entry[0])) != entry[1]:
+            cache.delete(digest)
+            entry = None
+
+        if entry is None:
+            entry = self.load_entry(digest, stamps)
+            cache.set(digest, entry)
+        return self.build_credentials(digest, entry)
+
+    async def aauthenticate_credentials(self, key):
+        digest = hash_token(key)
+        cache = get_token_cache()
+        stamps = get_user_stamps()
+
+        entry = cache.get(digest)
+        if entry is not None and await stamps.aget(user_stamp(entry[0])) != entry[1]:
+            cache.delete(digest)
+            entry = None
+
+        if entry is None:
+            entry = await self.aload_entry(digest, stamps)
+            cache.set(digest, entry)
+        return self.build_credentials(digest, entry)
+
+    def build_credentials(self, digest, entry):
+        user_id, version, field_names, values, expires = entry
+        # La entrada cacheada puede sobrevivir al token: se comprueba siempre
+        if expires is not None and expires <= timezone.now():
+            raise exceptions.AuthenticationFailed(_('Token caducado.'))
+        User = get_user_model()
+        # Instancia nueva por petición: la entrada cacheada no se comparte
+        user = User.from_db(router.db_for_read(User), field_names, values)
+        if not user.is_active:
+            raise exceptions.AuthenticationFailed(
+                _('Usuario inactivo o eliminado.'))
+
+        recorder.record(digest)
+        return user, AuthToken(digest=digest, user=user)
+
+    def make_entry(self, token, version):
+        user = token.user
+        field_names = tuple(f.attname for f in user._meta.concrete_fields)
+        values = tuple(getattr(user, name) for name in field_names)
+        return token.user_id, version, field_names, values, token.expires
+
+    def load_entry(self, digest, stamps):
+        user_id = AuthToken.objects.filter(
+            digest=digest).values_list('user_id', flat=True).first()
+        if user_id is None:
+            raise exceptions.AuthenticationFailed(_('Token no válido.'))
+        # El sello se lee antes que el usuario: un cambio posterior a la
+        # lectura cambia el sello (tras su commit) y descarta esta entrada.
+        version = stamps.get(user_stamp(user_id))
+        token = AuthToken.objects.select_related('user').filter(digest=digest).first()
+        if token is None:
+            raise exceptions.AuthenticationFailed(_('Token no válido.'))
+        return self.make_entry(token, version)
+
+    async def aload_entry(self, digest, stamps):
+        user_id = await AuthToken.objects.filter(
+            digest=digest).values_list('user_id', flat=True).afirst()
+        if user_id is None:
+            raise exceptions.AuthenticationFailed(_('Token no válido.'))
+        version = await stamps.aget(user_stamp(user_id))
+        token = await AuthToken.objects.select_related('user').filter(digest=digest).afirst()
+        if token is None:
+            raise exceptions.AuthenticationFailed(_('Token no válido.'))
+        return self.make_entry(token, version)
+
+    def authenticate_header(self, request):
+        return self.keyword
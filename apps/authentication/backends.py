@@ -0,0 +1,59 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+
+from apps.authentication.hashing import (
+    amake_password, averify_password, make_password, verify_password
+)
+
+
+class PooledModelBackend(ModelBackend):
+    """
+    ModelBackend que verifica las contraseñas en el pool de hashing
+    (apps.authentication.hashing), también desde las vistas async: el
+    aauthenticate de Django lo hace en el propio bucle de eventos.
+
+    Si el hash usa otro algoritmo o parámetros distintos de los de
+    PASSWORD_HASHERS, se recalcula tras un inicio de sesión correcto.
+    """
+
+    def get_username(self, username, kwargs):
+        if username is None:
+            username = kwargs.get(get_user_model().USERNAME_FIELD)
+        return username
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        username = self.get_username(username, kwargs)
+        if username is None or password is None:
+            return None
+        UserModel = get_user_model()
+        try:
+            user = UserModel._default_manager.get_by_natural_key(username)
+        except UserModel.DoesNotExist:
+            # Mismo coste que con un usuario existente (enumeración por tiempo)
+            make_password(password)
+            return None
+        is_correct, must_update = verify_password(password, user.password)
+        if not (is_correct and self.user_can_authenticate(user)):
+            return None
+        if must_update:
+            user.password = make_password(password)
+            user.save(update_fields=['password'])
+        return user
+
+    async def aauthenticate(self, request, username=None, password=None, **kwargs):
+        username = self.get_username(username, kwargs)
+        if username is None or password is None:
+            return None
+        UserModel = get_user_model()
+        try:
+            user = await UserModel._default_manager.aget_by_natural_key(username)
+        except UserModel.DoesNotExist:
+            await amake_password(password)
+            return None
+        is_correct, must_update = await averify_password(password, user.password)
+        if not (is_correct and self.user_can_authenticate(user)):
+            return None
+        if must_update:
+            user.password = await amake_password(password)
+            await user.asave(update_fields=['password'])
+        return user
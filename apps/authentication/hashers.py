@@ -0,0 +1,48 @@
+from django.conf import settings
+from django.contrib.auth import hashers
+
+
+class ScryptPasswordHasher(hashers.ScryptPasswordHasher):
+    """
+    scrypt con los parámetros de PASSWORD_SCRYPT_*. Al cambiarlos, las
+    contraseñas se vuelven a calcular en el siguiente inicio de sesión
+    (must_update compara los del hash con estos).
+    """
+
+    @property
+    def work_factor(self):
+        return getattr(settings, 'PASSWORD_SCRYPT_WORK_FACTOR', 2 ** 15)
+
+    @property
+    def block_size(self):
+        return getattr(settings, 'PASSWORD_SCRYPT_BLOCK_SIZE', 8)
+
+    @property
+    def parallelism(self):
+        return getattr(settings, 'PASSWORD_SCRYPT_PARALLELISM', 3)
+
+    @property
+    def maxmem(self):
+        # scrypt usa 128 * r * N bytes y OpenSSL lo limita a 32 MiB por
+        # defecto: margen para los parámetros configurados
+        return 2 * 128 * self.block_size * self.work_factor
+
+
+class Argon2PasswordHasher(hashers.Argon2PasswordHasher):
+    """
+    Argon2id con los parámetros de PASSWORD_ARGON2_* (memory_cost en KiB).
+    Requiere argon2-cffi. Un solo carril por defecto: el paralelismo lo da
+    el pool de apps.authentication.hashing, no cada hash.
+    """
+
+    @property
+    def time_cost(self):
+        return getattr(settings, 'PASSWORD_ARGON2_TIME_COST', 2)
+
+    @property
+    def memory_cost(self):
+        return getattr(settings, 'PASSWORD_ARGON2_MEMORY_COST', 19 * 1024)
+
+    @property
+    def parallelism(self):
+        return getattr(settings, 'PASSWORD_ARGON2_PARALLELISM', 1)
@@ -0,0 +1,93 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions, status
+
+
+class HashingBusy(exceptions.APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = _('Demasiados inicios de sesión a la vez, inténtalo de nuevo.')
+    default_code = 'hashing_busy'
+    # Segundos de Retry-After: el manejador de excepciones de DRF lo añade
+    wait = 1
+
+
+class HashingPool:
+    """
+    Pool acotado para calcular hashes de contraseñas fuera del hilo de la
+    petición. PBKDF2, scrypt y Argon2 liberan el GIL, así que los hilos
+    reparten el trabajo entre núcleos sin procesos aparte.
+
+    Como mucho `workers` hashes a la vez y `queue` esperando; con el pool
+    lleno, las peticiones síncronas esperan un hueco hasta `timeout`
+    segundos y las asíncronas fallan en el acto (HashingBusy, 503), de modo
+    que una ráfaga de inicios de sesión no acapara los workers.
+    """
+
+    def __init__(self, workers, queue, timeout):
+        self.executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix='password-hashing')
+        self.slots = threading.BoundedSemaphore(workers + queue)
+        self.timeout = timeout
+
+    def submit(self, blocking, func, *args):
+        acquired = self.slots.acquire(timeout=self.timeout) if blocking else \
+            self.slots.acquire(blocking=False)
+        if not acquired:
+            raise HashingBusy()
+        try:
+            future = self.executor.submit(func, *args)
+        except BaseException:
+            self.slots.release()
+            raise
+        future.add_done_callback(lambda done: self.slots.release())
+        return future
+
+    def run(self, func, *args):
+        return self.submit(True, func, *args).result()
+
+    async def arun(self, func, *args):
+        return await asyncio.wrap_future(self.submit(False, func, *args))
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                workers = getattr(settings, 'PASSWORD_HASHING_WORKERS', None) or os.cpu_count() or 1
+                _pool = HashingPool(
+                    workers,
+                    getattr(settings, 'PASSWORD_HASHING_QUEUE', 4 * workers),
+                    getattr(settings, 'PASSWORD_HASHING_TIMEOUT', 5))
+    return _pool
+
+
+def make_password(password):
+    return get_pool().run(hashers.make_password, password)
+
+
+async def amake_password(password):
+    return await get_pool().arun(hashers.make_password, password)
+
+
+def verify_password(password, encoded):
+    """(correcta, hay que recalcularla): ver django.contrib.auth.hashers."""
+    return get_pool().run(hashers.verify_password, password, encoded)
+
+
+async def averify_password(password, encoded):
+    return await get_pool().arun(hashers.verify_password, password, encoded)
+
+
+def check_password(password, encoded):
+    return verify_password(password, encoded)[0]
@@ -0,0 +1,81 @@
+import atexit
+import logging
+import threading
+
+from django.conf import settings
+from django.db import DatabaseError, connections, router
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+class LastUsedRecorder:
+    """
+    Acumula los tokens usados y escribe `last_used` en un único UPDATE cada
+    AUTH_TOKEN_LAST_USED_INTERVAL segundos desde un hilo en segundo plano,
+    en lugar de una escritura por petición. La precisión de `last_used`
+    es por tanto la del intervalo.
+    """
+
+    def __init__(self):
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+
+    def get_interval(self):
+        return getattr(settings, 'AUTH_TOKEN_LAST_USED_INTERVAL', 60)
+
+    def record(self, digest):
+        with self._lock:
+            self._pending.add(digest)
+            if self._thread is None or not self._thread.is_alive():
+                self._start()
+
+    def _start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name='auth-token-last-used', daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.get_interval()):
+            self.flush()
+
+    def flush(self):
+        from apps.authentication.models import AuthToken
+
+        with self._lock:
+            pending, self._pending = self._pending, set()
+        if not pending:
+            return 0
+        try:
+            return AuthToken.objects.filter(digest__in=pending).update(
+                last_used=timezone.now())
+        except DatabaseError:
+            logger.exception('No se pudo guardar el último uso de los tokens')
+            return 0
+        finally:
+            if threading.current_thread() is self._thread:
+                connections.close_all()
+
+    def table_exists(self):
+        from apps.authentication.models import AuthToken
+
+        connection = connections[router.db_for_write(AuthToken)]
+        try:
+            with connection.cursor() as cursor:
+                return AuthToken._meta.db_table in connection.introspection.table_names(cursor)
+        except DatabaseError:
+            return False
+
+    def stop(self):
+        self._stop.set()
+        # Al salir del proceso la base de datos puede no existir ya (la de
+        # los tests se destruye antes de atexit): entonces no hay nada que guardar
+        if self._pending and self.table_exists():
+            self.flush()
+
+
+recorder = LastUsedRecorder()
+atexit.register(recorder.stop)
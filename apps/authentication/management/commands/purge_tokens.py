@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from apps.authentication.models import AuthToken
+
+
+class Command(BaseCommand):
+    help = 'Borra los tokens de acceso caducados (AUTH_TOKEN_MAX_AGE)'
+
+    def handle(self, *args, **options):
+        total, _ = AuthToken.objects.expired().delete()
+        self.stdout.write(self.style.SUCCESS(f'{total} tokens caducados borrados'))
@@ -1,3 +1,94 @@
+import hashlib
+import secrets
+from datetime import timedelta
+
+from django.conf import settings
 from django.db import models
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+
+def hash_token(key):
+    # Los tokens son aleatorios de 160 bits: basta un hash rápido
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+def get_max_age():
+    """Vida de un token en segundos desde su creación (None: no caducan)."""
+    return getattr(settings, 'AUTH_TOKEN_MAX_AGE', 30 * 24 * 60 * 60)
+
+
+def get_max_per_user():
+    return getattr(settings, 'AUTH_TOKEN_MAX_PER_USER', 10)
+
+
+class AuthTokenManager(models.Manager):
+    def create_token(self, user):
+        """
+        Crea un token y devuelve (token, clave en claro). Si el usuario pasa
+        de AUTH_TOKEN_MAX_PER_USER sesiones, se borran las más antiguas.
+        """
+        key = secrets.token_hex(20)
+        token = self.create(digest=hash_token(key), user=user)
+        self.prune(user)
+        return token, key
+
+    async def acreate_token(self, user):
+        key = secrets.token_hex(20)
+        token = await self.acreate(digest=hash_token(key), user=user)
+        await self.aprune(user)
+        return token, key
+
+    def surplus(self, user):
+        return self.filter(user=user).order_by('-created', '-digest')[get_max_per_user():]
+
+    def prune(self, user):
+        digests = list(self.surplus(user).values_list('digest', flat=True))
+        if digests:
+            # Borrado con señales: invalida los tokens cacheados del usuario
+            self.filter(digest__in=digests).delete()
+
+    async def aprune(self, user):
+        digests = [digest async for digest in self.surplus(user).values_list('digest', flat=True)]
+        if digests:
+            await self.filter(digest__in=digests).adelete()
+
+    def expired(self):
+        max_age = get_max_age()
+        if max_age is None:
+            return self.none()
+        return self.filter(created__lte=timezone.now() - timedelta(seconds=max_age))
+
+
+class AuthToken(models.Model):
+    """
+    Token de acceso a la API. Solo se guarda el hash SHA-256 de la clave;
+    la clave en claro se entrega una única vez al iniciar sesión. Caduca
+    AUTH_TOKEN_MAX_AGE segundos después de crearse (purge_tokens borra los
+    caducados).
+    """
+    digest = models.CharField(_('Hash'), max_length=64, primary_key=True)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='auth_tokens'
+    )
+    created = models.DateTimeField(_('Creado'), auto_now_add=True)
+    # Se actualiza por lotes (ver apps.authentication.last_used)
+    last_used = models.DateTimeField(_('Último uso'), null=True, blank=True)
+
+    objects = AuthTokenManager()
+
+    class Meta:
+        verbose_name = _('Token')
+        verbose_name_plural = _('Tokens')
+
+    def __str__(self):
+        return f'{self.user} ({self.digest[:8]})'
 
-# Create your models here.
+    @property
+    def expires(self):
+        max_age = get_max_age()
+        if max_age is None:
+            return None
+        return self.created + timedelta(seconds=max_age)
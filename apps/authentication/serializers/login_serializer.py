@@ -7,20 +7,26 @@ class LoginSerializer(serializers.Serializer):
     username = serializers.CharField()
     password = serializers.CharField(
         style={'input_type': 'password'}, trim_whitespace=False)
+    # La vista async autentica después con aauthenticate
+    authenticate_user = True
 
     def validate(self, attrs):
         username = attrs.get('username')
         password = attrs.get('password')
 
-        if username and password:
-            user = authenticate(request=self.context.get(
-                'request'), username=username, password=password)
-            if not user:
-                raise serializers.ValidationError(
-                    _('Credenciales incorrectas'), code='authorization')
-        else:
+        if not (username and password):
             raise serializers.ValidationError(
                 _('Debe ingresar nombre de usuario y contraseña.'), code='invalid')
 
-        attrs['user'] = user
+        if self.authenticate_user:
+            user = authenticate(request=self.context.get(
+                'request'), username=username, password=password)
+            if not user:
+                raise self.invalid_credentials()
+            attrs['user'] = user
         return attrs
+
+    @staticmethod
+    def invalid_credentials():
+        return serializers.ValidationError(
+            _('Credenciales incorrectas'), code='authorization')
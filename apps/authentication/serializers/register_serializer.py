@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from django.contrib.auth.hashers import make_password
+from apps.authentication.hashing import make_password
 from apps.users.models import User
 from django.core.exceptions import ValidationError
 
@@ -0,0 +1,18 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.authentication.authentication import invalidate_user_tokens
+from apps.authentication.models import AuthToken
+
+
+@receiver(post_save, sender=get_user_model())
+@receiver(post_delete, sender=get_user_model())
+def user_changed(sender, instance, **kwargs):
+    # Contraseña, desactivación, roles...: los tokens cacheados se recargan
+    invalidate_user_tokens(instance.pk)
+
+
+@receiver(post_delete, sender=AuthToken)
+def token_deleted(sender, instance, **kwargs):
+    invalidate_user_tokens(instance.user_id)
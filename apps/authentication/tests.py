@@ -1,3 +1,194 @@
-from django.test import TestCase
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.authentication import authentication, hashing
+from apps.authentication.last_used import LastUsedRecorder
+from apps.authentication.models import AuthToken
+from apps.users.models import User
+
+
+class HashingBusyTests(TestCase):
+    """Con el pool de hashing lleno, todas las rutas responden 503 con Retry-After."""
+
+    def setUp(self):
+        self.user = User.objects.create(
+            username='reader', email='reader@example.com', first_name='Luis',
+            last_name='Lector')
+        self.user.set_password('Clave-Segura-123!')
+        self.user.save(update_fields=['password'])
+        # Pool sin huecos libres: ningún hash puede entrar
+        self.previous_pool = hashing._pool
+        hashing._pool = hashing.HashingPool(1, 0, 0.01)
+        hashing._pool.slots.acquire()
+
+    def tearDown(self):
+        hashing._pool.executor.shutdown()
+        hashing._pool = self.previous_pool
+
+    def assertBusy(self, response):
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response['Retry-After'], '1')
+
+    def test_login(self):
+        self.assertBusy(APIClient().post('/api/auth/login/', {
+            'username': 'reader', 'password': 'Clave-Segura-123!'}, format='json'))
+
+    def test_async_login(self):
+        self.assertBusy(self.client.post('/api/async/login/', {
+            'username': 'reader', 'password': 'Clave-Segura-123!'},
+            content_type='application/json'))
+
+    def test_register(self):
+        self.assertBusy(APIClient().post('/api/auth/register/', {
+            'username': 'nuevo', 'email': 'nuevo@example.com', 'first_name': 'Nuevo',
+            'last_name': 'Usuario', 'password': 'Otra-Clave-99!',
+            'confirm_password': 'Otra-Clave-99!'}, format='json'))
+
+    def test_password_change(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        self.assertBusy(client.post('/api/users/perfil/change-password/', {
+            'old_password': 'Clave-Segura-123!', 'new_password': 'Nueva-Clave-456!'},
+            format='json'))
+
+
+class LastUsedRecorderTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create(
+            username='reader', email='reader@example.com', first_name='Luis',
+            last_name='Lector')
+        self.token, _ = AuthToken.objects.create_token(self.user)
+        self.recorder = LastUsedRecorder()
+        self.recorder._pending.add(self.token.digest)
+
+    def test_stop_flushes_pending(self):
+        self.recorder.stop()
+        self.token.refresh_from_db()
+        self.assertIsNotNone(self.token.last_used)
+
+    def test_stop_skips_flush_without_table(self):
+        # Como al salir tras destruir la base de datos de los tests
+        with mock.patch.object(connection.introspection, 'table_names', return_value=[]), \
+                mock.patch.object(self.recorder, 'flush') as flush:
+            self.recorder.stop()
+        flush.assert_not_called()
+
+
+@override_settings(AUTH_TOKEN_MAX_AGE=3600, AUTH_TOKEN_MAX_PER_USER=2)
+class TokenLifecycleTests(TestCase):
+
+    def setUp(self):
+        authentication._token_cache = None
+        self.user = User.objects.create(
+            username='reader', email='reader@example.com', first_name='Luis',
+            last_name='Lector')
+
+    def get_perfil(self, key):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Token {key}')
+        return client.get('/api/users/perfil/')
+
+    def test_oldest_sessions_are_closed_over_the_limit(self):
+        keys = []
+        for age in (3, 2):
+            token, key = AuthToken.objects.create_token(self.user)
+            AuthToken.objects.filter(pk=token.pk).update(
+                created=timezone.now() - timedelta(minutes=age))
+            keys.append(key)
+        self.assertEqual(self.get_perfil(keys[0]).status_code, 200)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            _, newest = AuthToken.objects.create_token(self.user)
+
+        self.assertEqual(AuthToken.objects.filter(user=self.user).count(), 2)
+        # También la entrada ya cacheada del token borrado
+        self.assertEqual(self.get_perfil(keys[0]).status_code, 401)
+        self.assertEqual(self.get_perfil(keys[1]).status_code, 200)
+        self.assertEqual(self.get_perfil(newest).status_code, 200)
+
+    def test_expired_token_is_rejected_even_if_cached(self):
+        token, key = AuthToken.objects.create_token(self.user)
+        self.assertEqual(self.get_perfil(key).status_code, 200)
+
+        later = timezone.now() + timedelta(hours=2)
+        with mock.patch('apps.authentication.authentication.timezone.now', return_value=later):
+            response = self.get_perfil(key)
+        self.assertEqual(response.status_code, 401)
+
+        AuthToken.objects.filter(pk=token.pk).update(created=timezone.now() - timedelta(hours=2))
+        authentication._token_cache = None
+        self.assertEqual(self.get_perfil(key).status_code, 401)
+
+    def test_purge_tokens_deletes_only_expired(self):
+        old, _ = AuthToken.objects.create_token(self.user)
+        AuthToken.objects.filter(pk=old.pk).update(created=timezone.now() - timedelta(hours=2))
+        current, _ = AuthToken.objects.create_token(self.user)
+
+        out = StringIO()
+        call_command('purge_tokens', stdout=out)
+        self.assertIn('1 tokens caducados borrados', out.getvalue())
+        self.assertEqual(list(AuthToken.objects.values_list('pk', flat=True)), [current.pk])
+
+
+class TokenInvalidationTests(TestCase):
+    """Un token ya cacheado deja de valer tras logout, cambio de contraseña o desactivación."""
+
+    def setUp(self):
+        authentication._token_cache = None
+        self.user = User.objects.create(
+            username='reader', email='reader@example.com', first_name='Luis',
+            last_name='Lector')
+        self.user.set_password('Clave-Segura-123!')
+        self.user.save(update_fields=['password'])
+        _, self.key = AuthToken.objects.create_token(self.user)
+        _, self.other_key = AuthToken.objects.create_token(self.user)
+        # Cachea los dos tokens
+        for key in (self.key, self.other_key):
+            self.assertEqual(self.get_perfil(key).status_code, 200)
+
+    def client_for(self, key):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Token {key}')
+        return client
+
+    def get_perfil(self, key):
+        return self.client_for(key).get('/api/users/perfil/')
+
+    def test_logout(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client_for(self.key).post('/api/auth/logout/')
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(self.get_perfil(self.key).status_code, 401)
+        self.assertEqual(self.get_perfil(self.other_key).status_code, 200)
+
+    def test_password_change(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client_for(self.key).post('/api/users/perfil/change-password/', {
+                'old_password': 'Clave-Segura-123!', 'new_password': 'Nueva-Clave-456!'},
+                format='json')
+        self.assertEqual(response.status_code, 200)
+        # Se cierran las demás sesiones; la que cambió la contraseña sigue
+        self.assertEqual(self.get_perfil(self.other_key).status_code, 401)
+        self.assertEqual(self.get_perfil(self.key).status_code, 200)
+
+    def test_deactivation(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_active = False
+            self.user.save()
+        self.assertEqual(self.get_perfil(self.key).status_code, 401)
+
+    @override_settings(AUTH_TOKEN_CACHE_TTL=0)
+    def test_without_cache_changes_from_other_processes_apply(self):
+        # Como en producción sin REDIS_URL: el sello de otro worker no se ve
+        authentication._token_cache = None
+        self.assertEqual(self.get_perfil(self.key).status_code, 200)
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        self.assertEqual(self.get_perfil(self.key).status_code, 401)
@@ -0,0 +1,48 @@
+from django.contrib.auth import aauthenticate
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import exceptions, status
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from apps.authentication.hashing import HashingBusy
+from apps.authentication.models import AuthToken
+from apps.authentication.serializers.login_serializer import LoginSerializer
+from apps.authentication.views.auth_views import get_login_data
+from apps.core.replicas import use_primary
+from apps.core.views.async_api import render_json
+
+
+class CredentialsSerializer(LoginSerializer):
+    # Solo los campos: la contraseña se verifica con aauthenticate
+    authenticate_user = False
+
+
+# Versión async de LoginView: la contraseña se verifica en el pool de
+# hashing (PooledModelBackend.aauthenticate) sin ocupar un hilo por petición
+@csrf_exempt
+async def login(request):
+    if request.method != 'POST':
+        return render_json(
+            {'detail': exceptions.MethodNotAllowed(request.method).detail},
+            status.HTTP_405_METHOD_NOT_ALLOWED, {'Allow': 'POST'})
+    try:
+        parsers = [parser() for parser in api_settings.DEFAULT_PARSER_CLASSES]
+        data = Request(request, parsers=parsers).data
+    except (exceptions.ParseError, exceptions.UnsupportedMediaType) as exc:
+        return render_json({'detail': exc.detail}, exc.status_code)
+
+    serializer = CredentialsSerializer(data=data)
+    if not serializer.is_valid():
+        return render_json(serializer.errors, status.HTTP_400_BAD_REQUEST)
+    try:
+        with use_primary():
+            user = await aauthenticate(request, **serializer.validated_data)
+            if user is None:
+                error = LoginSerializer.invalid_credentials()
+                return render_json({'non_field_errors': error.detail},
+                                   status.HTTP_400_BAD_REQUEST)
+            token, key = await AuthToken.objects.acreate_token(user)
+    except HashingBusy as exc:
+        return render_json({'detail': exc.detail}, exc.status_code,
+                           {'Retry-After': '%d' % exc.wait})
+    return render_json(get_login_data(user, key))
@@ -2,12 +2,12 @@ from django.utils.decorators import method_decorator
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from rest_framework.authtoken.models import Token
 from rest_framework.permissions import AllowAny
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 
 # Serializadores
+from apps.authentication.models import AuthToken
 from apps.authentication.serializers.login_serializer import LoginSerializer
 from apps.authentication.serializers.password_reset_serializer import (
     PasswordResetRequestSerializer,
@@ -16,6 +16,19 @@ from apps.authentication.serializers.password_reset_serializer import (
 from apps.authentication.serializers.register_serializer import RegisterSerializer
 
 
+def get_login_data(user, key):
+    return {
+        'token': key,
+        'user': {
+            'id': user.id,
+            'username': user.username,
+            'email': user.email,
+            'first_name': user.first_name,
+            'last_name': user.last_name
+        }
+    }
+
+
 @swagger_auto_schema(
     operation_description="Inicio de sesión de usuario",
     request_body=LoginSerializer,
@@ -41,18 +54,11 @@ class LoginView(APIView):
             data=request.data, context={'request': request})
         if serializer.is_valid():
             user = serializer.validated_data['user']
-            token, created = Token.objects.get_or_create(user=user)
+            # Un token nuevo por inicio de sesión (solo se guarda su hash); se
+            # cierran las sesiones más antiguas por encima de AUTH_TOKEN_MAX_PER_USER
+            token, key = AuthToken.objects.create_token(user)
 
-            return Response({
-                'token': token.key,
-                'user': {
-                    'id': user.id,
-                    'username': user.username,
-                    'email': user.email,
-                    'first_name': user.first_name,
-                    'last_name': user.last_name
-                }
-            }, status=status.HTTP_200_OK)
+            return Response(get_login_data(user, key), status=status.HTTP_200_OK)
 
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -68,7 +74,7 @@ class LoginView(APIView):
 class LogoutView(APIView):
     def post(self, request):
         try:
-            request.user.auth_token.delete()
+            AuthToken.objects.filter(digest=request.auth.digest).delete()
             return Response({"message": "Logout exitoso"}, status=status.HTTP_204_NO_CONTENT)
         except Exception as e:
             return Response({"error": "No se pudo cerrar sesión"}, status=status.HTTP_400_BAD_REQUEST)
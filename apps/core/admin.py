@@ -1,3 +1,17 @@
 from django.contrib import admin
 
-# Register your models here.
+from apps.core.jobs import retry_jobs
+from apps.core.models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'name', 'queue', 'status', 'attempts', 'run_after', 'locked_by')
+    list_filter = ('status', 'queue', 'name')
+    readonly_fields = ('attempts', 'locked_by', 'locked_at', 'last_error', 'created', 'updated')
+    actions = ['reintentar']
+
+    @admin.action(description='Reintentar los trabajos fallidos')
+    def reintentar(self, request, queryset):
+        count = retry_jobs(queryset)
+        self.message_user(request, f'{count} trabajos encolados de nuevo')
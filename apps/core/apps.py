@@ -1,6 +1,15 @@
 from django.apps import AppConfig
+from django.db.models.signals import pre_migrate
+from django.utils.module_loading import autodiscover_modules
 
 
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.core'
+
+    def ready(self):
+        from apps.core.signals import create_postgresql_extensions
+        pre_migrate.connect(create_postgresql_extensions, sender=self,
+                            dispatch_uid='core_create_postgresql_extensions')
+        # Registra las tareas en segundo plano (`tasks.py` de cada app)
+        autodiscover_modules('tasks')
@@ -0,0 +1,149 @@
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from django.core.cache import caches
+from django.core.cache.backends.filebased import FileBasedCache
+from django.db import transaction
+
+
+class LRUFileBasedCache(FileBasedCache):
+    """
+    FileBasedCache con expulsión LRU: cada lectura refresca el mtime del
+    fichero y, al superar MAX_ENTRIES, se eliminan primero los menos usados
+    (Django elimina una muestra aleatoria).
+    """
+
+    def get(self, key, default=None, version=None):
+        value = super().get(key, default, version)
+        if value is not default:
+            try:
+                os.utime(self._key_to_file(key, version))
+            except FileNotFoundError:
+                pass
+        return value
+
+    def _cull(self):
+        filelist = self._list_cache_files()
+        num_entries = len(filelist)
+        if num_entries < self._max_entries:
+            return
+        if self._cull_frequency == 0:
+            return self.clear()
+
+        def mtime(fname):
+            try:
+                return os.path.getmtime(fname)
+            except FileNotFoundError:
+                return 0
+
+        filelist.sort(key=mtime)
+        for fname in filelist[:int(num_entries / self._cull_frequency)]:
+            self._delete(fname)
+
+
+class VersionStamps:
+    """
+    Sellos de versión compartidos en un alias de CACHES.
+
+    Cada nombre ('posts', 'post:12', ...) tiene un token opaco que cambia
+    en cada `bump`. Las entradas de caché incluyen los tokens en su clave,
+    así que tras un cambio las antiguas dejan de ser alcanzables. Un sello
+    expulsado se regenera con un token nuevo, nunca con uno ya usado.
+    """
+    prefix = 'version:'
+
+    def __init__(self, alias):
+        self.alias = alias
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def get_many(self, names):
+        keys = {self.prefix + name: name for name in names}
+        found = self.cache.get_many(list(keys))
+        versions = {keys[key]: value for key, value in found.items()}
+        for name in names:
+            if name not in versions:
+                token = uuid.uuid4().hex
+                if not self.cache.add(self.prefix + name, token, timeout=None):
+                    token = self.cache.get(self.prefix + name, token)
+                versions[name] = token
+        return versions
+
+    def get(self, name):
+        return self.get_many([name])[name]
+
+    async def aget_many(self, names):
+        keys = {self.prefix + name: name for name in names}
+        found = await self.cache.aget_many(list(keys))
+        versions = {keys[key]: value for key, value in found.items()}
+        for name in names:
+            if name not in versions:
+                token = uuid.uuid4().hex
+                if not await self.cache.aadd(self.prefix + name, token, timeout=None):
+                    token = await self.cache.aget(self.prefix + name, token)
+                versions[name] = token
+        return versions
+
+    async def aget(self, name):
+        return (await self.aget_many([name]))[name]
+
+    def bump(self, *names):
+        self.cache.set_many(
+            {self.prefix + name: uuid.uuid4().hex for name in names}, timeout=None)
+
+    def bump_on_commit(self, *names, using=None):
+        # Tras el commit, para que ningún lector guarde datos previos al
+        # cambio bajo la versión nueva.
+        names = [name for name in names if name]
+        if names:
+            transaction.on_commit(lambda: self.bump(*names), using=using)
+
+
+class LocalTTLCache:
+    """
+    Caché en memoria del proceso, LRU con caducidad por entrada. Segura
+    entre hilos. Pensada para datos pequeños y muy leídos que se validan
+    aparte (p. ej. con VersionStamps) para enterarse de cambios hechos en
+    otros procesos.
+    """
+
+    def __init__(self, max_entries=1000, ttl=300):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+            expires, value = item
+            if expires < time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
@@ -0,0 +1,9 @@
+from django.db import connections
+
+
+def is_postgresql(using='default'):
+    """
+    Indica si el alias de base de datos usa PostgreSQL. Sirve también en la
+    definición de modelos (índices GIN, opclasses...) porque no abre conexión.
+    """
+    return connections[using].vendor == 'postgresql'
@@ -0,0 +1,276 @@
+import math
+import os
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.utils import timezone
+
+# Secciones de la petición, en el orden de la cabecera Server-Timing
+SECTIONS = ('db', 'filter', 'serialize', 'render')
+
+_current = ContextVar('request_metrics', default=None)
+
+
+class RequestMetrics:
+    """Tiempos (ms) y consultas de una petición."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.times = dict.fromkeys(SECTIONS, 0.0)
+        self.queries = 0
+        self.endpoint = None
+        # Sin execute_wrapper (ASGI) no hay datos de SQL
+        self.sql = False
+
+    def add(self, section, elapsed):
+        self.times[section] += elapsed * 1000
+
+    def __call__(self, execute, sql, params, many, context):
+        # connection.execute_wrapper: tiempo de cada consulta SQL
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.add('db', time.perf_counter() - start)
+
+    def total(self):
+        return (time.perf_counter() - self.started) * 1000
+
+    def server_timing(self, total):
+        entries = []
+        if self.sql:
+            entries.append(f'db;dur={self.times["db"]:.1f};desc="{self.queries} consultas"')
+        entries += [f'{section};dur={self.times[section]:.1f}'
+                    for section in SECTIONS[1:] if self.times[section]]
+        entries.append(f'total;dur={total:.1f}')
+        return ', '.join(entries)
+
+
+def get_current_metrics():
+    return _current.get()
+
+
+@contextmanager
+def timer(section):
+    """Suma la duración del bloque a `section` de la petición en curso."""
+    metrics = _current.get()
+    if metrics is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.add(section, time.perf_counter() - start)
+
+
+class Histogram:
+    """
+    Histograma logarítmico: cubetas que crecen un 5%, así que los
+    percentiles tienen un error relativo menor del 5% con memoria acotada.
+    """
+    GROWTH = 1.05
+    MINIMUM = 0.01
+
+    def __init__(self):
+        self.buckets = {}
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def add(self, value):
+        if value <= self.MINIMUM:
+            index = 0
+        else:
+            index = math.ceil(math.log(value / self.MINIMUM, self.GROWTH))
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def percentile(self, fraction):
+        if not self.count:
+            return 0.0
+        rank = fraction * self.count
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return min(self.MINIMUM * self.GROWTH ** index, self.max)
+        return self.max
+
+    def summary(self):
+        return {
+            'p50': round(self.percentile(0.50), 2),
+            'p95': round(self.percentile(0.95), 2),
+            'p99': round(self.percentile(0.99), 2),
+            'max': round(self.max, 2),
+            'media': round(self.sum / self.count, 2) if self.count else 0.0,
+        }
+
+
+class MetricsRegistry:
+    """Histogramas por endpoint (vista y acción) de este proceso."""
+    FIELDS = ('total',) + SECTIONS + ('consultas', 'bytes')
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.endpoints = {}
+            self.since = timezone.now()
+
+    def record(self, endpoint, values):
+        with self.lock:
+            histograms = self.endpoints.get(endpoint)
+            if histograms is None:
+                histograms = self.endpoints[endpoint] = {
+                    field: Histogram() for field in self.FIELDS}
+            for field, value in values.items():
+                histograms[field].add(value)
+
+    def snapshot(self):
+        with self.lock:
+            endpoints = [
+                {'endpoint': endpoint, 'peticiones': histograms['total'].count,
+                 **{field: histogram.summary() for field, histogram in histograms.items()}}
+                for endpoint, histograms in self.endpoints.items()
+            ]
+            since = self.since
+        endpoints.sort(key=lambda item: item['total']['p95'], reverse=True)
+        return {'pid': os.getpid(), 'desde': since, 'endpoints': endpoints}
+
+
+registry = MetricsRegistry()
+
+
+def get_endpoint(request, view_func):
+    """'PostViewSet.list', 'PerfilView.get' o el nombre de la vista."""
+    view_class = getattr(view_func, 'cls', None) or getattr(view_func, 'view_class', None)
+    method = request.method.lower()
+    if view_class is None:
+        return getattr(request.resolver_match, 'view_name', None) or view_func.__name__
+    actions = getattr(view_func, 'actions', None) or {}
+    return f'{view_class.__name__}.{actions.get(method, method)}'
+
+
+def server_timing_allowed(request):
+    mode = getattr(settings, 'INSTRUMENTATION_SERVER_TIMING', 'staff')
+    if mode == 'staff':
+        user = getattr(request, 'user', None)
+        return bool(user and user.is_staff)
+    return mode == 'all'
+
+
+class InstrumentationMiddleware:
+    """
+    Mide cada petición: consultas SQL y su tiempo (execute_wrapper en todas
+    las conexiones), filtrado y serialización (InstrumentedViewMixin), render
+    de la respuesta y tamaño. Lo añade a los histogramas del proceso por
+    endpoint (GET /api/metricas/) y lo envía en la cabecera Server-Timing
+    según INSTRUMENTATION_SERVER_TIMING ('all', 'staff' u 'off').
+
+    En modo asíncrono solo registra el total y el tamaño: las consultas del
+    ORM async se ejecutan en otro hilo (ver QueryBudgetMiddleware).
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+            # Ganchos async: los síncronos se ejecutarían en un hilo aparte
+            self.process_view = self.aprocess_view
+            self.process_template_response = self.aprocess_template_response
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not getattr(settings, 'INSTRUMENTATION_ENABLED', True):
+            return self.get_response(request)
+
+        metrics = RequestMetrics()
+        metrics.sql = True
+        token = _current.set(metrics)
+        try:
+            with ExitStack() as stack:
+                for alias in connections:
+                    stack.enter_context(connections[alias].execute_wrapper(metrics))
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, metrics)
+
+    async def __acall__(self, request):
+        if not getattr(settings, 'INSTRUMENTATION_ENABLED', True):
+            return await self.get_response(request)
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, metrics)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        metrics = _current.get()
+        if metrics is not None:
+            metrics.endpoint = get_endpoint(request, view_func)
+        return None
+
+    def process_template_response(self, request, response):
+        # Las Response de DRF se renderizan después de la vista
+        metrics = _current.get()
+        if metrics is not None:
+            start = time.perf_counter()
+            response.add_post_render_callback(
+                lambda rendered: metrics.add('render', time.perf_counter() - start))
+        return response
+
+    async def aprocess_view(self, request, view_func, view_args, view_kwargs):
+        return InstrumentationMiddleware.process_view(self, request, view_func, view_args, view_kwargs)
+
+    async def aprocess_template_response(self, request, response):
+        return InstrumentationMiddleware.process_template_response(self, request, response)
+
+    def finish(self, request, response, metrics):
+        total = metrics.total()
+        if metrics.endpoint is not None:
+            values = {'total': total, **metrics.times}
+            if metrics.sql:
+                values['consultas'] = metrics.queries
+            if not response.streaming:
+                values['bytes'] = len(response.content)
+            registry.record(metrics.endpoint, values)
+        if server_timing_allowed(request):
+            response['Server-Timing'] = metrics.server_timing(total)
+        return response
+
+
+class InstrumentedViewMixin:
+    """Mide el filtrado y la serialización de las vistas genéricas de DRF."""
+
+    def filter_queryset(self, queryset):
+        with timer('filter'):
+            return super().filter_queryset(queryset)
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        if _current.get() is not None:
+            # Solo el serializador raíz: incluye los anidados y la lista
+            to_representation = serializer.to_representation
+
+            def timed_to_representation(instance):
+                with timer('serialize'):
+                    return to_representation(instance)
+            serializer.to_representation = timed_to_representation
+        return serializer
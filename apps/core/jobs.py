@@ -0,0 +1,293 @@
+"""
+Trabajos en segundo plano.
+
+Las tareas se declaran con el decorador `task` en el módulo `tasks.py` de
+cada app (se cargan al arrancar) y se encolan con `enqueue` o
+`tarea.enqueue(**payload)`. El payload debe ser serializable a JSON.
+
+El backend (JOBS_BACKEND) decide cómo se ejecutan:
+
+- DatabaseBackend (por defecto): inserta un Job en la misma transacción
+  que la petición; `manage.py run_jobs` los ejecuta y reintenta con
+  espera exponencial.
+- ImmediateBackend: ejecuta la tarea en el propio proceso al confirmar la
+  transacción (desarrollo, scripts).
+"""
+import logging
+import os
+import socket
+import threading
+import time
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, connections, transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+_registry = {}
+
+
+class Task:
+    def __init__(self, func, name, queue='default', max_attempts=None):
+        self.func = func
+        self.name = name
+        self.queue = queue
+        self.max_attempts = max_attempts
+        self.on_failure = None
+
+    def __call__(self, **payload):
+        return self.func(**payload)
+
+    def enqueue(self, **payload):
+        return enqueue(self.name, **payload)
+
+    def failure(self, func):
+        """Registra `func(error, **payload)`, llamada si se agotan los intentos."""
+        self.on_failure = func
+        return func
+
+
+def task(name=None, queue='default', max_attempts=None):
+    def decorator(func):
+        registered = Task(func, name or f'{func.__module__}.{func.__qualname__}',
+                          queue, max_attempts)
+        _registry[registered.name] = registered
+        return registered
+    return decorator
+
+
+def get_task(name):
+    try:
+        return _registry[name]
+    except KeyError:
+        raise LookupError(f'Tarea no registrada: {name}')
+
+
+def get_queues():
+    return sorted({registered.queue for registered in _registry.values()}) or ['default']
+
+
+def get_max_attempts(registered):
+    return registered.max_attempts or getattr(settings, 'JOBS_MAX_ATTEMPTS', 3)
+
+
+def get_backend():
+    return import_string(getattr(settings, 'JOBS_BACKEND', 'apps.core.jobs.DatabaseBackend'))()
+
+
+def enqueue(name, run_after=None, **payload):
+    return get_backend().enqueue(get_task(name), payload, run_after)
+
+
+class DatabaseBackend:
+    def enqueue(self, registered, payload, run_after=None):
+        from apps.core.models import Job
+
+        return Job.objects.create(
+            name=registered.name, queue=registered.queue, payload=payload,
+            max_attempts=get_max_attempts(registered),
+            run_after=run_after or timezone.now())
+
+
+class ImmediateBackend:
+    def enqueue(self, registered, payload, run_after=None):
+        def run():
+            try:
+                registered(**payload)
+            except Exception as exc:
+                logger.exception('La tarea %s ha fallado', registered.name)
+                if registered.on_failure is not None:
+                    registered.on_failure(exc, **payload)
+        transaction.on_commit(run)
+
+
+def get_lock_timeout():
+    return getattr(settings, 'JOBS_LOCK_TIMEOUT', 15 * 60)
+
+
+def get_heartbeat_interval():
+    return getattr(settings, 'JOBS_HEARTBEAT_INTERVAL', None) or get_lock_timeout() / 3
+
+
+def get_retry_delay(attempts):
+    base = getattr(settings, 'JOBS_RETRY_BACKOFF', 30)
+    return timedelta(seconds=base * 2 ** (attempts - 1))
+
+
+class Worker:
+    """
+    Ejecuta los trabajos pendientes de las colas indicadas, de uno en uno.
+
+    Un trabajo se reclama con un UPDATE condicionado a que siga pendiente,
+    así que varios workers (en una o varias máquinas) pueden compartir cola
+    sin bloqueos de fila. Mientras se ejecuta un trabajo, un hilo renueva
+    su locked_at cada JOBS_HEARTBEAT_INTERVAL; los de un worker caído (sin
+    latido durante JOBS_LOCK_TIMEOUT) se devuelven a la cola, o se marcan
+    fallidos si ya agotaron sus intentos. El resultado solo se escribe si el
+    trabajo sigue reclamado por este worker.
+    """
+
+    def __init__(self, queues=('default',), poll_interval=None, batch_size=10):
+        self.queues = list(queues)
+        self.poll_interval = poll_interval or getattr(settings, 'JOBS_POLL_INTERVAL', 2)
+        self.batch_size = batch_size
+        self.name = f'{socket.gethostname()}:{os.getpid()}'
+        self.stopping = False
+
+    def get_queryset(self):
+        from apps.core.models import Job
+
+        return Job.objects.filter(queue__in=self.queues)
+
+    def run(self, burst=False, max_jobs=None):
+        """Procesa trabajos hasta stop(); con `burst` termina al vaciar la cola."""
+        processed = 0
+        while not self.stopping and (max_jobs is None or processed < max_jobs):
+            close_old_connections()
+            self.requeue_stale()
+            job = self.claim()
+            if job is None:
+                if burst:
+                    break
+                time.sleep(self.poll_interval)
+                continue
+            self.execute(job)
+            processed += 1
+        close_old_connections()
+        return processed
+
+    def stop(self, *args):
+        self.stopping = True
+
+    def claim(self):
+        from apps.core.models import Job
+
+        candidates = self.get_queryset().filter(
+            status=Job.PENDING, run_after__lte=timezone.now(),
+        ).order_by('run_after', 'id').values_list('pk', flat=True)[:self.batch_size]
+        for pk in candidates:
+            claimed = Job.objects.filter(pk=pk, status=Job.PENDING).update(
+                status=Job.RUNNING, locked_by=self.name, locked_at=timezone.now(),
+                attempts=F('attempts') + 1)
+            if claimed:
+                return Job.objects.get(pk=pk)
+        return None
+
+    def owned(self, job):
+        """El trabajo, si sigue en curso y reclamado por este worker."""
+        from apps.core.models import Job
+
+        return Job.objects.filter(pk=job.pk, status=Job.RUNNING, locked_by=self.name)
+
+    def touch(self, job):
+        """Latido: renueva locked_at; False si el trabajo ya no es de este worker."""
+        return bool(self.owned(job).update(locked_at=timezone.now()))
+
+    def execute(self, job):
+        from apps.core.models import Job
+
+        start = time.perf_counter()
+        heartbeat = Heartbeat(self, job, get_heartbeat_interval())
+        heartbeat.start()
+        try:
+            registered = get_task(job.name)
+            registered(**job.payload)
+        except Exception as exc:
+            heartbeat.stop()
+            self.handle_error(job, exc)
+            return
+        heartbeat.stop()
+        logger.info('%s completado en %.2fs', job, time.perf_counter() - start)
+        if getattr(settings, 'JOBS_DELETE_COMPLETED', True):
+            finished = self.owned(job).delete()[0]
+        else:
+            finished = self.owned(job).update(
+                status=Job.DONE, locked_by='', locked_at=None, updated=timezone.now())
+        if not finished:
+            logger.warning('%s ya no pertenece a %s: no se marca completado', job, self.name)
+
+    def handle_error(self, job, exc):
+        from apps.core.models import Job
+
+        error = ''.join(traceback.format_exception(exc))
+        if job.attempts < job.max_attempts:
+            logger.warning('%s falló (intento %s de %s): %s',
+                           job, job.attempts, job.max_attempts, exc)
+            self.owned(job).update(
+                status=Job.PENDING, locked_by='', locked_at=None, last_error=error,
+                run_after=timezone.now() + get_retry_delay(job.attempts),
+                updated=timezone.now())
+            return
+
+        logger.error('%s falló definitivamente: %s', job, exc)
+        if self.owned(job).update(status=Job.FAILED, locked_by='', locked_at=None,
+                                  last_error=error, updated=timezone.now()):
+            call_on_failure(job, exc)
+
+    def requeue_stale(self):
+        """
+        Devuelve a la cola los trabajos sin latido durante JOBS_LOCK_TIMEOUT
+        y marca fallidos los que ya agotaron sus intentos.
+        """
+        from apps.core.models import Job
+
+        timeout = get_lock_timeout()
+        stale = self.get_queryset().filter(
+            status=Job.RUNNING, locked_at__lt=timezone.now() - timedelta(seconds=timeout))
+        for job in stale.filter(attempts__gte=F('max_attempts')):
+            exc = TimeoutError(f'Sin latido de {job.locked_by} durante {timeout}s')
+            # Condicionado al mismo bloqueo: otro worker pudo adelantarse
+            if Job.objects.filter(pk=job.pk, status=Job.RUNNING, locked_at=job.locked_at).update(
+                    status=Job.FAILED, locked_by='', locked_at=None, last_error=str(exc),
+                    updated=timezone.now()):
+                logger.error('%s falló definitivamente: %s', job, exc)
+                call_on_failure(job, exc)
+        return stale.update(status=Job.PENDING, locked_by='', locked_at=None,
+                            updated=timezone.now())
+
+
+class Heartbeat(threading.Thread):
+    """Renueva cada `interval` segundos el bloqueo del trabajo en curso."""
+
+    def __init__(self, worker, job, interval):
+        super().__init__(name=f'heartbeat-{job.pk}', daemon=True)
+        self.worker = worker
+        self.job = job
+        self.interval = interval
+        self.finished = threading.Event()
+
+    def run(self):
+        try:
+            while not self.finished.wait(self.interval):
+                if not self.worker.touch(self.job):
+                    logger.warning('%s ya no pertenece a %s', self.job, self.worker.name)
+                    break
+        finally:
+            # Conexión propia del hilo
+            connections.close_all()
+
+    def stop(self):
+        self.finished.set()
+        self.join()
+
+
+def call_on_failure(job, exc):
+    registered = _registry.get(job.name)
+    if registered is not None and registered.on_failure is not None:
+        try:
+            registered.on_failure(exc, **job.payload)
+        except Exception:
+            logger.exception('Error en on_failure de %s', job)
+
+
+def retry_jobs(queryset):
+    """Vuelve a encolar trabajos fallidos con los intentos a cero."""
+    from apps.core.models import Job
+
+    return queryset.filter(status=Job.FAILED).update(
+        status=Job.PENDING, attempts=0, run_after=timezone.now(), updated=timezone.now())
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core.openapi import build_artifact, get_schema_dir, read_artifact, schema_fingerprint
+
+
+class Command(BaseCommand):
+    help = ('Genera el esquema OpenAPI en OPENAPI_SCHEMA_DIR (JSON, JSON gzip y YAML). '
+            'Solo lo regenera si ha cambiado el código que define la API')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true',
+                            help='Regenera aunque el artefacto esté al día')
+        parser.add_argument('--check', action='store_true',
+                            help='No escribe nada; falla si el artefacto no está al día')
+
+    def handle(self, *args, **options):
+        if options['check']:
+            artifact = read_artifact()
+            if artifact is None or artifact.fingerprint != schema_fingerprint():
+                raise CommandError(f'El esquema de {get_schema_dir()} no está al día')
+            self.stdout.write(self.style.SUCCESS('El esquema está al día'))
+            return
+
+        artifact, generated = build_artifact(force=options['force'])
+        if not generated:
+            self.stdout.write(f'Sin cambios en la API: se mantiene {get_schema_dir()}')
+            return
+        self.stdout.write(self.style.SUCCESS(
+            f'Esquema generado en {get_schema_dir()} ({len(artifact.json)} bytes, '
+            f'{len(artifact.gzip)} con gzip)'))
@@ -0,0 +1,31 @@
+import signal
+
+from django.core.management.base import BaseCommand
+
+from apps.core.jobs import Worker, get_queues
+
+
+class Command(BaseCommand):
+    help = ('Ejecuta los trabajos en segundo plano encolados en la base de datos '
+            '(se pueden lanzar varios workers en paralelo)')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--queue', action='append', dest='queues',
+                            help='Cola a atender (repetible; por defecto todas las conocidas)')
+        parser.add_argument('--burst', action='store_true',
+                            help='Termina cuando no quedan trabajos listos')
+        parser.add_argument('--max-jobs', type=int,
+                            help='Termina tras procesar este número de trabajos')
+        parser.add_argument('--poll-interval', type=float)
+
+    def handle(self, *args, **options):
+        worker = Worker(queues=options['queues'] or get_queues(),
+                        poll_interval=options['poll_interval'])
+        # SIGTERM/SIGINT: termina el trabajo en curso y sale
+        signal.signal(signal.SIGTERM, worker.stop)
+        signal.signal(signal.SIGINT, worker.stop)
+
+        self.stdout.write(f"Worker {worker.name} en las colas: {', '.join(worker.queues)}")
+        processed = worker.run(burst=options['burst'], max_jobs=options['max_jobs'])
+        self.stdout.write(self.style.SUCCESS(f'{processed} trabajos procesados'))
+
@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 
@@ -20,3 +21,70 @@ class AuditableMixins(models.Model):
 
     class Meta:
         abstract = True
+
+
+class ManagedFieldsMixin(models.Model):
+    """
+    Columnas que solo se escriben con UPDATE atómicos (F()) desde fuera del
+    modelo, como los contadores de apps.post.counters. Una instancia leída
+    antes (p. ej. el usuario cacheado de la autenticación por token) tiene
+    valores anteriores: save() sin update_fields no las vuelve a escribir.
+    Para guardarlas hay que nombrarlas en update_fields.
+    """
+    managed_fields = ()
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        if (self.managed_fields and not self._state.adding
+                and kwargs.get('update_fields') is None and not kwargs.get('force_insert')):
+            deferred = self.get_deferred_fields()
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.managed_fields
+                and field.attname not in deferred
+            ]
+        super().save(*args, **kwargs)
+
+
+class Job(models.Model):
+    """Trabajo en segundo plano de la cola en base de datos (ver apps.core.jobs)."""
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUSES = (
+        (PENDING, _('Pendiente')),
+        (RUNNING, _('En curso')),
+        (DONE, _('Completado')),
+        (FAILED, _('Fallido')),
+    )
+
+    name = models.CharField(max_length=100)
+    queue = models.CharField(max_length=50, default='default')
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=STATUSES, default=PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=3)
+    run_after = models.DateTimeField(default=timezone.now)
+    locked_by = models.CharField(max_length=100, blank=True, default='')
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True, default='')
+    created = models.DateTimeField(auto_now_add=True)
+    updated = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = _('Trabajo')
+        verbose_name_plural = _('Trabajos')
+        indexes = [
+            # Siguiente trabajo listo de cada cola
+            models.Index(fields=['queue', 'run_after', 'id'], name='core_job_ready_idx',
+                         condition=models.Q(status='pending')),
+            # Trabajos en curso abandonados por un worker caído
+            models.Index(fields=['locked_at'], name='core_job_running_idx',
+                         condition=models.Q(status='running')),
+        ]
+
+    def __str__(self):
+        return f'{self.name} #{self.pk} ({self.status})'
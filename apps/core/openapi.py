@@ -0,0 +1,174 @@
+import gzip
+import hashlib
+import json
+import os
+import threading
+from importlib import import_module
+from importlib.metadata import version
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from drf_yasg import openapi
+from drf_yasg.codecs import OpenAPICodecJson, OpenAPICodecYaml
+from drf_yasg.generators import OpenAPISchemaGenerator
+from rest_framework.test import APIRequestFactory, force_authenticate
+from rest_framework.views import APIView
+
+API_VERSION = 'v1'
+API_INFO = openapi.Info(
+    title="Blog API",
+    default_version=API_VERSION,
+    description="Documentación del Blog API",
+    terms_of_service="https://www.google.com/policies/terms/",
+    contact=openapi.Contact(email="contact@example.com"),
+    license=openapi.License(name="MIT License"),
+)
+
+# Código que no cambia el esquema
+IGNORED_DIRS = {'management', 'migrations', '__pycache__'}
+
+
+class SchemaArtifact:
+    """Esquema ya serializado (JSON, JSON gzip y YAML) y su ETag."""
+
+    def __init__(self, json_bytes, gzip_bytes, yaml_bytes, fingerprint):
+        self.json = json_bytes
+        self.gzip = gzip_bytes
+        self.yaml = yaml_bytes
+        self.fingerprint = fingerprint
+        self.etag = '"%s"' % hashlib.sha256(json_bytes).hexdigest()
+
+
+def get_schema_dir():
+    return str(getattr(settings, 'OPENAPI_SCHEMA_DIR', settings.BASE_DIR / 'build' / 'openapi'))
+
+
+def get_source_files():
+    """Archivos de los que depende el esquema: URLconf y apps del proyecto."""
+    base_dir = str(settings.BASE_DIR)
+    files = {import_module(settings.ROOT_URLCONF).__file__}
+    for app_config in apps.get_app_configs():
+        if not app_config.path.startswith(base_dir):
+            continue
+        for root, dirs, names in os.walk(app_config.path):
+            dirs[:] = sorted(d for d in dirs if d not in IGNORED_DIRS)
+            files.update(os.path.join(root, name) for name in names if name.endswith('.py'))
+    return sorted(files)
+
+
+def schema_fingerprint():
+    """
+    Huella del código que define la API (URLconf, vistas, serializadores...)
+    y de las versiones de DRF y drf-yasg: si no cambia, el esquema tampoco.
+    """
+    digest = hashlib.sha256()
+    for package in ('djangorestframework', 'drf-yasg'):
+        digest.update(f'{package}={version(package)}\n'.encode())
+    digest.update(repr(getattr(settings, 'SWAGGER_SETTINGS', {})).encode())
+    base_dir = str(settings.BASE_DIR)
+    for path in get_source_files():
+        digest.update(os.path.relpath(path, base_dir).encode())
+        with open(path, 'rb') as source:
+            digest.update(hashlib.sha256(source.read()).digest())
+    return digest.hexdigest()
+
+
+def get_mock_request():
+    """Petición anónima, como la de un visitante de /swagger.json."""
+    request = APIRequestFactory().get('/swagger.json')
+    force_authenticate(request, AnonymousUser())
+    return APIView().initialize_request(request)
+
+
+def generate_schema(fingerprint=None):
+    """
+    Genera el esquema público. Sin host ni esquemas: Swagger UI usa los de
+    la página, así que el mismo artefacto vale para todos los dominios.
+    """
+    generator = OpenAPISchemaGenerator(info=API_INFO, version=API_VERSION)
+    schema = generator.get_schema(request=get_mock_request(), public=True)
+    schema.pop('host', None)
+    schema.pop('schemes', None)
+    json_bytes = OpenAPICodecJson(validators=[]).encode(schema)
+    yaml_bytes = OpenAPICodecYaml(validators=[]).encode(schema)
+    return SchemaArtifact(json_bytes, gzip.compress(json_bytes, 9, mtime=0), yaml_bytes,
+                          fingerprint or schema_fingerprint())
+
+
+def write_artifact(artifact, directory=None):
+    directory = directory or get_schema_dir()
+    os.makedirs(directory, exist_ok=True)
+    files = {
+        'swagger.json': artifact.json,
+        'swagger.json.gz': artifact.gzip,
+        'swagger.yaml': artifact.yaml,
+        # Al final: sin él, un artefacto a medio escribir no se usa
+        'meta.json': json.dumps({'fingerprint': artifact.fingerprint}).encode(),
+    }
+    for name, content in files.items():
+        tmp_path = os.path.join(directory, f'.{name}.tmp')
+        with open(tmp_path, 'wb') as output:
+            output.write(content)
+        os.replace(tmp_path, os.path.join(directory, name))
+
+
+def read_artifact(directory=None):
+    """Artefacto guardado, o None si no existe."""
+    directory = directory or get_schema_dir()
+    try:
+        with open(os.path.join(directory, 'meta.json'), 'rb') as meta:
+            fingerprint = json.load(meta)['fingerprint']
+        contents = []
+        for name in ('swagger.json', 'swagger.json.gz', 'swagger.yaml'):
+            with open(os.path.join(directory, name), 'rb') as stored:
+                contents.append(stored.read())
+    except (FileNotFoundError, KeyError, ValueError):
+        return None
+    return SchemaArtifact(*contents, fingerprint)
+
+
+def build_artifact(force=False):
+    """
+    Devuelve (artefacto, regenerado): el guardado si sigue vigente; si no,
+    uno nuevo que se escribe en OPENAPI_SCHEMA_DIR.
+    """
+    fingerprint = schema_fingerprint()
+    artifact = None if force else read_artifact()
+    if artifact is not None and artifact.fingerprint == fingerprint:
+        return artifact, False
+    artifact = generate_schema(fingerprint)
+    try:
+        write_artifact(artifact)
+    except OSError:  # directorio de solo lectura: se sirve desde memoria
+        pass
+    return artifact, True
+
+
+_artifact = None
+_artifact_lock = threading.Lock()
+
+
+def get_artifact():
+    """
+    Artefacto del proceso. La huella se comprueba una vez por proceso (el
+    código no cambia sin reiniciarlo), así que en producción la generación
+    ocurre en `manage.py generate_openapi` durante el despliegue.
+    """
+    global _artifact
+    if _artifact is None:
+        with _artifact_lock:
+            if _artifact is None:
+                _artifact = build_artifact()[0]
+    return _artifact
+
+
+class UISchemaGenerator(OpenAPISchemaGenerator):
+    """
+    Para las páginas de Swagger UI y ReDoc: solo necesitan título y versión,
+    la especificación la descargan de /swagger.json (SPEC_URL).
+    """
+
+    def get_schema(self, request=None, public=False):
+        return openapi.Swagger(info=self.info, paths=openapi.Paths(paths={}), _prefix='/',
+                               _version=self.version)
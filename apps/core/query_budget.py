@@ -0,0 +1,132 @@
+import logging
+from contextlib import ExitStack, contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+class QueryCounter:
+    """
+    Cuenta las consultas SQL ejecutadas en todas las bases de datos mediante
+    `connection.execute_wrapper`. Se usa como context manager.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.queries = []
+        self._stack = None
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        self.queries.append(sql)
+        return execute(sql, params, many, context)
+
+    def __enter__(self):
+        self._stack = ExitStack()
+        for alias in connections:
+            self._stack.enter_context(connections[alias].execute_wrapper(self))
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stack.close()
+
+
+@contextmanager
+def assert_max_queries(budget, label='bloque'):
+    """
+    Helper para tests: falla si el bloque ejecuta más de `budget` consultas.
+
+        with assert_max_queries(3):
+            client.get('/api/post/posts/1/')
+    """
+    with QueryCounter() as counter:
+        yield counter
+    if counter.count > budget:
+        raise QueryBudgetExceeded(
+            '%s: %d consultas (presupuesto %d)\n%s' % (
+                label, counter.count, budget, '\n'.join(counter.queries)))
+
+
+def get_query_budget(view_func):
+    """
+    Presupuesto declarado por la vista en `query_budgets`, indexado por
+    acción de ViewSet ('list', 'retrieve'...) o por método HTTP en APIView.
+    """
+    view_class = getattr(view_func, 'cls', None)
+    budgets = getattr(view_class, 'query_budgets', None)
+    if not budgets:
+        return None, None
+    return budgets, getattr(view_func, 'actions', None)
+
+
+class QueryBudgetMiddleware:
+    """
+    Comprueba en cada petición el presupuesto de consultas de la vista
+    (desde process_view: vista, autenticación de DRF y render).
+
+    QUERY_BUDGET_MODE: 'off', 'warn' (log + cabecera X-Query-Count) o
+    'raise' (QueryBudgetExceeded, pensado para desarrollo y tests).
+
+    En modo asíncrono (ASGI) no cuenta: el ORM async ejecuta las consultas
+    en otro hilo, con otra conexión, y contar ahí mezclaría peticiones
+    concurrentes. Los presupuestos se comprueban en el camino síncrono.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+            # Sin process_view síncrono, que Django ejecutaría en un hilo
+            self.process_view = self.aprocess_view
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.get_response(request)
+        mode = getattr(settings, 'QUERY_BUDGET_MODE', 'off')
+        if mode == 'off':
+            return self.get_response(request)
+
+        with QueryCounter() as counter:
+            request._query_counter = counter
+            response = self.get_response(request)
+
+        budget = getattr(request, '_query_budget', None)
+        if budget is None:
+            return response
+
+        used = counter.count - request._queries_before_view
+        response['X-Query-Count'] = str(used)
+        if used > budget:
+            message = '%s %s: %d consultas (presupuesto %d)' % (
+                request.method, request.path, used, budget)
+            if mode == 'raise':
+                raise QueryBudgetExceeded(
+                    message + '\n' + '\n'.join(counter.queries[request._queries_before_view:]))
+            logger.warning(message)
+        return response
+
+    async def aprocess_view(self, request, view_func, view_args, view_kwargs):
+        return None
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        counter = getattr(request, '_query_counter', None)
+        if counter is None:
+            return None
+        budgets, actions = get_query_budget(view_func)
+        if budgets is None:
+            return None
+        key = request.method.lower()
+        if actions:
+            key = actions.get(key, key)
+        request._query_budget = budgets.get(key)
+        request._queries_before_view = counter.count
+        return None
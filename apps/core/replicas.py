@@ -0,0 +1,150 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.functional import SimpleLazyObject, empty
+
+# Alias usado para las lecturas de la petición en curso. Sin valor (fuera
+# de una petición, comandos, shell...) se lee del primario.
+_read_alias = ContextVar('read_alias', default=None)
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+def get_replicas():
+    return list(getattr(settings, 'DATABASE_REPLICAS', ()))
+
+
+def get_read_alias():
+    return _read_alias.get() or DEFAULT_DB_ALIAS
+
+
+def use_replica():
+    """Envía las lecturas siguientes a una réplica (la misma toda la petición)."""
+    replicas = get_replicas()
+    if replicas and _read_alias.get() is None:
+        _read_alias.set(random.choice(replicas))
+
+
+def pin_primary():
+    _read_alias.set(DEFAULT_DB_ALIAS)
+
+
+@contextmanager
+def use_primary():
+    """Lecturas del bloque en el primario (autenticación, read-your-writes)."""
+    token = _read_alias.set(DEFAULT_DB_ALIAS)
+    try:
+        yield
+    finally:
+        _read_alias.reset(token)
+
+
+def get_sticky_cache():
+    return caches[getattr(settings, 'REPLICA_STICKY_CACHE_ALIAS', 'default')]
+
+
+def sticky_key(user_id):
+    return f'replica-sticky:{user_id}'
+
+
+def mark_sticky(user_id):
+    """Tras una escritura, el usuario lee del primario durante un tiempo."""
+    seconds = getattr(settings, 'REPLICA_STICKY_SECONDS', 5)
+    if seconds:
+        get_sticky_cache().set(sticky_key(user_id), 1, timeout=seconds)
+
+
+def is_sticky(user_id):
+    return bool(get_sticky_cache().get(sticky_key(user_id)))
+
+
+async def amark_sticky(user_id):
+    seconds = getattr(settings, 'REPLICA_STICKY_SECONDS', 5)
+    if seconds:
+        await get_sticky_cache().aset(sticky_key(user_id), 1, timeout=seconds)
+
+
+async def ais_sticky(user_id):
+    return bool(await get_sticky_cache().aget(sticky_key(user_id)))
+
+
+class ReplicaRouter:
+    """
+    Lecturas a la réplica elegida para la petición (ver use_replica) y
+    escrituras siempre al primario. Las réplicas contienen los mismos datos,
+    así que se permiten relaciones entre cualquier par de alias.
+    """
+
+    def db_for_read(self, model, **hints):
+        instance = hints.get('instance')
+        if instance is not None and instance._state.db:
+            return instance._state.db
+        return get_read_alias()
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+
+class ReplicaStickinessMiddleware:
+    """
+    Aísla el alias de lectura de cada petición y, tras una escritura con
+    éxito de un usuario autenticado, fija sus lecturas al primario durante
+    REPLICA_STICKY_SECONDS para que vea sus cambios aunque la réplica vaya
+    con retraso. Qué lecturas van a réplicas lo decide la vista
+    (BaseModelViewSet.initial). Funciona en modo síncrono y asíncrono.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        token = _read_alias.set(None)
+        try:
+            response = self.get_response(request)
+        finally:
+            _read_alias.reset(token)
+
+        user = self.get_writer(request, response)
+        if user is not None:
+            mark_sticky(user.pk)
+        return response
+
+    async def __acall__(self, request):
+        token = _read_alias.set(None)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _read_alias.reset(token)
+
+        user = self.get_writer(request, response)
+        if user is not None:
+            await amark_sticky(user.pk)
+        return response
+
+    def get_writer(self, request, response):
+        if (request.method in SAFE_METHODS or response.status_code >= 400
+                or not get_replicas()):
+            return None
+        # DRF copia el usuario autenticado en la petición de Django. Un
+        # usuario perezoso sin evaluar no lo ha usado ninguna vista: no se
+        # carga aquí (en modo async sería una consulta síncrona)
+        user = getattr(request, 'user', None)
+        if isinstance(user, SimpleLazyObject) and user._wrapped is empty:
+            return None
+        if user is not None and user.is_authenticated:
+            return user
+        return None
@@ -0,0 +1,63 @@
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+from rest_framework.settings import api_settings
+
+
+class BulkListSerializer(serializers.ListSerializer):
+    """
+    ListSerializer para operaciones masivas: valida cada elemento por
+    separado sin que uno inválido invalide el resto.
+
+    - `validated_data`: lista de (índice, datos) de los elementos válidos.
+    - `item_errors`: dict índice -> errores de los inválidos.
+    - `item_instances`: dict índice -> instancia (solo actualizaciones).
+
+    Para actualizar, `instance` es un dict pk -> objeto y cada elemento
+    debe incluir su 'id'.
+    """
+
+    def run_child_validation(self, data):
+        if isinstance(self.instance, dict):
+            try:
+                instance = self.instance.get(int(data.get('id')))
+            except (AttributeError, TypeError, ValueError):
+                instance = None
+            if instance is None:
+                raise ValidationError({'id': ['No encontrado.']})
+            self.child.instance = instance
+            self.child.initial_data = data
+        return super().run_child_validation(data)
+
+    def to_internal_value(self, data):
+        if not isinstance(data, list):
+            message = self.error_messages['not_a_list'].format(
+                input_type=type(data).__name__)
+            raise ValidationError({api_settings.NON_FIELD_ERRORS_KEY: [message]},
+                                  code='not_a_list')
+        if self.max_length is not None and len(data) > self.max_length:
+            message = self.error_messages['max_length'].format(
+                max_length=self.max_length)
+            raise ValidationError({api_settings.NON_FIELD_ERRORS_KEY: [message]},
+                                  code='max_length')
+
+        self.item_errors = {}
+        self.item_instances = {}
+        valid = []
+        for index, item in enumerate(data):
+            try:
+                valid.append((index, self.run_child_validation(item)))
+            except ValidationError as exc:
+                self.item_errors[index] = exc.detail
+            else:
+                if isinstance(self.instance, dict):
+                    self.item_instances[index] = self.child.instance
+
+        self.item_errors.update(self.validate_batch(valid))
+        return [(index, item) for index, item in valid if index not in self.item_errors]
+
+    def validate_batch(self, items):
+        """
+        Validaciones que requieren ver todo el lote (unicidad, etc.) con una
+        sola consulta. Devuelve índice -> errores.
+        """
+        return {}
@@ -0,0 +1,17 @@
+from django.db import connections
+
+# Extensiones de PostgreSQL que necesitan los índices de los modelos
+POSTGRESQL_EXTENSIONS = ['pg_trgm']
+
+
+def create_postgresql_extensions(sender, using, **kwargs):
+    """
+    Se ejecuta en pre_migrate, antes de crear tablas e índices. Requiere
+    que el usuario de la base de datos pueda crear extensiones.
+    """
+    connection = connections[using]
+    if connection.vendor != 'postgresql':
+        return
+    with connection.cursor() as cursor:
+        for extension in POSTGRESQL_EXTENSIONS:
+            cursor.execute(f'CREATE EXTENSION IF NOT EXISTS {extension}')
@@ -1,3 +1,119 @@
-from django.test import TestCase
+import time
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from apps.core.jobs import Worker, task
+from apps.core.models import Job
+
+calls = []
+
+
+@task(name='core.tests.ok', queue='tests')
+def ok_task(value):
+    calls.append(value)
+
+
+@task(name='core.tests.falla', queue='tests', max_attempts=2)
+def failing_task(value):
+    raise ValueError(value)
+
+
+@failing_task.failure
+def failing_task_failed(error, value):
+    calls.append(('fallido', value, type(error)))
+
+
+@task(name='core.tests.reclamado', queue='tests')
+def reclaimed_task():
+    # Otro worker lo reclama mientras este lo ejecuta
+    Job.objects.filter(name='core.tests.reclamado').update(locked_by='otro:1')
+
+
+@override_settings(JOBS_DELETE_COMPLETED=True)
+class WorkerTests(TestCase):
+
+    def setUp(self):
+        calls.clear()
+        self.worker = Worker(queues=['tests'])
+
+    def test_claim_locks_the_job_once(self):
+        ok_task.enqueue(value=1)
+        job = self.worker.claim()
+        self.assertEqual((job.status, job.locked_by, job.attempts),
+                         (Job.RUNNING, self.worker.name, 1))
+        self.assertIsNotNone(job.locked_at)
+        self.assertIsNone(Worker(queues=['tests']).claim())
+
+    def test_completed_job_is_deleted(self):
+        ok_task.enqueue(value=1)
+        self.assertEqual(self.worker.run(burst=True), 1)
+        self.assertEqual(calls, [1])
+        self.assertFalse(Job.objects.exists())
+
+    def test_failed_job_is_retried_then_marked_failed(self):
+        job = failing_task.enqueue(value='x')
+        with self.assertLogs('apps.core.jobs', 'WARNING'):
+            self.worker.execute(self.worker.claim())
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (Job.PENDING, 1))
+        self.assertGreater(job.run_after, timezone.now())
+        self.assertIn('ValueError: x', job.last_error)
+
+        Job.objects.filter(pk=job.pk).update(run_after=timezone.now())
+        with self.assertLogs('apps.core.jobs', 'ERROR'):
+            self.worker.execute(self.worker.claim())
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts, job.locked_by), (Job.FAILED, 2, ''))
+        self.assertEqual(calls, [('fallido', 'x', ValueError)])
+
+    def test_stale_job_is_requeued(self):
+        job = ok_task.enqueue(value=1)
+        self.worker.claim()
+        Job.objects.filter(pk=job.pk).update(
+            locked_at=timezone.now() - timedelta(hours=1))
+
+        self.assertEqual(self.worker.requeue_stale(), 1)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.locked_by, job.attempts), (Job.PENDING, '', 1))
+
+    def test_stale_job_without_attempts_left_is_marked_failed(self):
+        job = failing_task.enqueue(value='y')
+        Job.objects.filter(pk=job.pk).update(
+            status=Job.RUNNING, attempts=2, locked_by='caido:1',
+            locked_at=timezone.now() - timedelta(hours=1))
+
+        with self.assertLogs('apps.core.jobs', 'ERROR'):
+            self.assertEqual(self.worker.requeue_stale(), 0)
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.FAILED)
+        self.assertIn('caido:1', job.last_error)
+        self.assertEqual(calls, [('fallido', 'y', TimeoutError)])
+
+    def test_heartbeat_renews_the_lock_only_while_owned(self):
+        ok_task.enqueue(value=1)
+        job = self.worker.claim()
+        Job.objects.filter(pk=job.pk).update(locked_at=timezone.now() - timedelta(hours=1))
+
+        self.assertTrue(self.worker.touch(job))
+        self.assertEqual(self.worker.requeue_stale(), 0)
+        Job.objects.filter(pk=job.pk).update(locked_by='otro:1')
+        self.assertFalse(self.worker.touch(job))
+
+    @override_settings(JOBS_HEARTBEAT_INTERVAL=0.01)
+    def test_heartbeat_runs_while_the_task_executes(self):
+        ok_task.enqueue(value=1)
+        with mock.patch.object(Worker, 'touch', return_value=True) as touch, \
+                mock.patch.object(ok_task, 'func', side_effect=lambda value: time.sleep(0.1)):
+            self.worker.run(burst=True)
+        self.assertGreater(touch.call_count, 1)
+
+    def test_completion_after_losing_the_lock_leaves_the_job(self):
+        job = reclaimed_task.enqueue()
+        with self.assertLogs('apps.core.jobs', 'WARNING'):
+            self.worker.execute(self.worker.claim())
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.locked_by), (Job.RUNNING, 'otro:1'))
 
-# Create your tests here.
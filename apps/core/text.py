@@ -0,0 +1,20 @@
+import re
+import unicodedata
+
+WORD_RE = re.compile(r'\w+')
+
+
+def normalize_text(value):
+    """
+    Minúsculas, sin acentos y con los espacios colapsados:
+    '  José  Pérez ' -> 'jose perez'
+    """
+    if not value:
+        return ''
+    value = unicodedata.normalize('NFKD', str(value))
+    value = ''.join(char for char in value if not unicodedata.combining(char))
+    return ' '.join(value.lower().split())
+
+
+def tokenize(value):
+    return WORD_RE.findall(normalize_text(value))
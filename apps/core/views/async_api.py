@@ -0,0 +1,89 @@
+from functools import wraps
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.exceptions import ObjectDoesNotExist
+from django.http import Http404, HttpResponse
+from rest_framework import exceptions, status
+from rest_framework.authentication import SessionAuthentication
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from apps.core.replicas import SAFE_METHODS, ais_sticky, get_replicas, use_primary, use_replica
+
+
+async def aauthenticate(request):
+    """
+    Recorre DEFAULT_AUTHENTICATION_CLASSES como DRF, usando `aauthenticate`
+    cuando la clase lo tiene y `request.auser()` para la sesión. Contra el
+    primario, igual que BaseModelViewSet.initial.
+    """
+    with use_primary():
+        for authentication_class in api_settings.DEFAULT_AUTHENTICATION_CLASSES:
+            authenticator = authentication_class()
+            if hasattr(authenticator, 'aauthenticate'):
+                result = await authenticator.aauthenticate(request)
+                if result is not None:
+                    return result[0], authenticator
+            elif issubclass(authentication_class, SessionAuthentication):
+                user = await request.auser()
+                if user.is_authenticated and user.is_active:
+                    return user, authenticator
+    return AnonymousUser(), None
+
+
+def render_json(data, status_code=status.HTTP_200_OK, headers=None):
+    response = HttpResponse(
+        JSONRenderer().render(data), status=status_code,
+        content_type='application/json')
+    for name, value in (headers or {}).items():
+        response[name] = value
+    return response
+
+
+def async_api_view(permission=None):
+    """
+    Vista de lectura asíncrona y nativa (sin pasar por los hilos de DRF).
+
+    La vista recibe una `rest_framework.request.Request` (query_params,
+    user...) y devuelve datos serializables; los errores se expresan con las
+    excepciones de DRF y salen con el mismo formato que en las vistas DRF.
+    `permission(user)` decide el acceso de un usuario autenticado. No debe
+    tocar la base de datos de forma síncrona: usar el ORM async (aget,
+    acount, async for...).
+    """
+    def decorator(view):
+        @wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            if request.method not in SAFE_METHODS:
+                return render_json(
+                    {'detail': exceptions.MethodNotAllowed(request.method).detail},
+                    status.HTTP_405_METHOD_NOT_ALLOWED,
+                    {'Allow': ', '.join(SAFE_METHODS)})
+            authenticator = None
+            try:
+                user, authenticator = await aauthenticate(request)
+                if not user.is_authenticated:
+                    raise exceptions.NotAuthenticated()
+                if permission is not None and not permission(user):
+                    raise exceptions.PermissionDenied()
+                if get_replicas() and not await ais_sticky(user.pk):
+                    use_replica()
+
+                request.user = user
+                drf_request = Request(request)
+                drf_request.user = user
+                data = await view(drf_request, *args, **kwargs)
+            except exceptions.APIException as exc:
+                headers = {}
+                if isinstance(exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+                    header = authenticator.authenticate_header(request) if authenticator else 'Token'
+                    headers['WWW-Authenticate'] = header
+                detail = exc.detail if isinstance(exc.detail, (list, dict)) else {'detail': exc.detail}
+                return render_json(detail, exc.status_code, headers)
+            except (Http404, ObjectDoesNotExist):
+                return render_json({'detail': exceptions.NotFound().detail},
+                                   status.HTTP_404_NOT_FOUND)
+            return render_json(data)
+        return wrapper
+    return decorator
@@ -3,13 +3,36 @@ from rest_framework.response import Response
 from rest_framework import status
 from django.utils import timezone
 
+from apps.core.instrumentation import InstrumentedViewMixin
+from apps.core.replicas import SAFE_METHODS, get_replicas, is_sticky, use_primary, use_replica
+
 
 def get_user_fullname(user):
     full_name = f"{user.first_name} {user.last_name}".strip()
     return full_name or user.username
 
 
-class BaseModelViewSet(viewsets.ModelViewSet):
+class BaseModelViewSet(InstrumentedViewMixin, viewsets.ModelViewSet):
+    def initial(self, request, *args, **kwargs):
+        # Autenticación y permisos contra el primario: un token o usuario
+        # recién creado puede no haber llegado aún a la réplica
+        with use_primary():
+            super().initial(request, *args, **kwargs)
+        if request.method in SAFE_METHODS and get_replicas():
+            user = request.user
+            if not (user.is_authenticated and is_sticky(user.pk)):
+                use_replica()
+
+    def get_audit_values(self, action):
+        """
+        Campos de auditoría de `action` ('created', 'updated' o 'deleted')
+        calculados una sola vez, para aplicarlos a un lote completo.
+        """
+        return {
+            f'{action}_by': get_user_fullname(self.request.user),
+            f'{action}_date': timezone.now(),
+        }
+
     def perform_create(self, serializer):
         request = self.request
         user = request.user
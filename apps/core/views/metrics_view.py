@@ -0,0 +1,36 @@
+from drf_yasg import openapi
+from drf_yasg.utils import swagger_auto_schema
+from rest_framework import status
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from apps.core.instrumentation import registry
+
+
+class MetricasView(APIView):
+    """
+    Percentiles por endpoint que ha medido InstrumentationMiddleware en el
+    proceso que atiende la petición (cada worker tiene los suyos).
+    """
+    permission_classes = [IsAdminUser]
+
+    @swagger_auto_schema(
+        operation_description=(
+            "p50/p95/p99 por endpoint (vista.acción) de este proceso: total, db, "
+            "filter, serialize y render en ms, consultas y bytes de la respuesta"),
+        responses={
+            200: openapi.Response("Métricas del proceso"),
+            403: "No tienes permiso para realizar esta acción"
+        }
+    )
+    def get(self, request):
+        return Response(registry.snapshot())
+
+    @swagger_auto_schema(
+        operation_description="Reinicia las métricas de este proceso",
+        responses={204: "Métricas reiniciadas", 403: "No tienes permiso para realizar esta acción"}
+    )
+    def delete(self, request):
+        registry.reset()
+        return Response(status=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,62 @@
+import re
+
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.views.decorators.http import require_safe
+from drf_yasg.views import get_schema_view
+
+from apps.core.openapi import API_INFO, UISchemaGenerator, get_artifact
+
+ACCEPTS_GZIP = re.compile(r'\bgzip\b')
+
+
+def serve_artifact(request, schema_format):
+    """
+    Esquema precalculado (apps.core.openapi) con ETag por representación y
+    la versión gzip ya comprimida cuando el cliente la acepta.
+    """
+    artifact = get_artifact()
+    etag = artifact.etag
+    encoding = None
+    if schema_format == 'yaml':
+        content, content_type = artifact.yaml, 'application/yaml; charset=utf-8'
+        etag = etag[:-1] + '-yaml"'
+    elif ACCEPTS_GZIP.search(request.headers.get('Accept-Encoding', '')):
+        content, content_type, encoding = artifact.gzip, 'application/json; charset=utf-8', 'gzip'
+        etag = etag[:-1] + '-gzip"'
+    else:
+        content, content_type = artifact.json, 'application/json; charset=utf-8'
+
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = HttpResponse(content, content_type=content_type)
+        response['Content-Length'] = len(content)
+        if encoding:
+            response['Content-Encoding'] = encoding
+    response['ETag'] = etag
+    response['Vary'] = 'Accept-Encoding'
+    response['Cache-Control'] = 'public, max-age=0, must-revalidate'
+    return response
+
+
+@require_safe
+def schema_json(request):
+    return serve_artifact(request, 'json')
+
+
+@require_safe
+def schema_yaml(request):
+    return serve_artifact(request, 'yaml')
+
+
+class SchemaUIView(get_schema_view(API_INFO, public=True, generator_class=UISchemaGenerator)):
+    """
+    Swagger UI y ReDoc sin introspección: la página solo lleva título y
+    versión y carga la especificación de SPEC_URL. `?format=openapi` sirve
+    el artefacto.
+    """
+
+    def get(self, request, version='', format=None):
+        if request.accepted_renderer.media_type != 'text/html':
+            return serve_artifact(request._request, request.accepted_renderer.format)
+        return super().get(request, version, format)
@@ -0,0 +1,184 @@
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+
+
+class Projection:
+    """Columnas y relaciones que necesita un serializador."""
+
+    def __init__(self):
+        self.only = set()
+        self.select_related = set()
+        self.prefetch_related = set()
+
+
+def build_projection(serializer, model, prefix='', projection=None):
+    """
+    Recorre los campos de `serializer` y acumula en una Projection las
+    columnas (`only`), joins (`select_related`) y prefetches necesarios.
+    Devuelve None si algún campo no permite deducirlo (p. ej. source='*'
+    sin declarar en Meta.projection_sources).
+    """
+    projection = projection or Projection()
+    opts = model._meta
+    projection.only.add(prefix + opts.pk.name)
+    sources = getattr(getattr(serializer, 'Meta', None), 'projection_sources', {})
+
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+        if name in sources:
+            bits = sources[name]
+        elif field.source == '*':
+            return None
+        else:
+            bits = [field.source]
+
+        for source in bits:
+            path = source.replace('.', '__')
+            head = path.split('__')[0]
+            try:
+                model_field = opts.get_field(head)
+            except FieldDoesNotExist:
+                # Propiedad o método del modelo: no se puede proyectar
+                return None
+
+            if isinstance(field, serializers.ListSerializer) or (
+                    model_field.is_relation and (model_field.many_to_many or model_field.one_to_many)):
+                projection.prefetch_related.add(prefix + head)
+            elif model_field.is_relation:
+                if head == model_field.attname != model_field.name:
+                    # source='category_id': solo la columna, sin join
+                    projection.only.add(prefix + head)
+                    continue
+                if isinstance(field, serializers.PrimaryKeyRelatedField) and head == path:
+                    projection.only.add(prefix + head)
+                    continue
+                projection.select_related.add(prefix + head)
+                if isinstance(field, serializers.BaseSerializer):
+                    if build_projection(field, model_field.related_model,
+                                        prefix + head + '__', projection) is None:
+                        return None
+                elif head != path:
+                    projection.only.add(prefix + path)
+                else:
+                    # Relación representada con __str__: se carga completa
+                    projection.only.update(
+                        prefix + head + '__' + f.attname
+                        for f in model_field.related_model._meta.concrete_fields)
+            else:
+                projection.only.add(prefix + path)
+
+    return projection
+
+
+def parse_sparse_fieldset(params, fields_param='fields', exclude_param='exclude'):
+    """(campos pedidos, campos excluidos) de la query string; None si faltan."""
+    def parse(param):
+        value = params.get(param)
+        if not value:
+            return None
+        return {name.strip() for name in value.split(',') if name.strip()}
+
+    return parse(fields_param), parse(exclude_param)
+
+
+def apply_sparse_fieldset(serializer, fields, exclude, fields_param='fields'):
+    """Quita del serializador (o de su `child`) los campos no pedidos."""
+    if fields is None and exclude is None:
+        return serializer
+
+    target = getattr(serializer, 'child', serializer)
+    available = set(target.fields)
+    unknown = ((fields or set()) | (exclude or set())) - available
+    if unknown:
+        raise ValidationError({
+            fields_param: 'Campos no válidos: %s' % ', '.join(sorted(unknown))
+        })
+
+    for name in available:
+        if (fields is not None and name not in fields) or (exclude and name in exclude):
+            target.fields.pop(name)
+    return serializer
+
+
+def project_queryset(queryset, serializer, extra_fields=(), get_prefetch=None):
+    """
+    Aplica al queryset la proyección de `serializer` (ver build_projection);
+    `get_prefetch(lookup)` permite usar objetos Prefetch a medida.
+    """
+    projection = build_projection(serializer, queryset.model)
+    if projection is None:
+        return queryset
+
+    get_prefetch = get_prefetch or (lambda lookup: lookup)
+    only = projection.only | set(extra_fields)
+    queryset = queryset.select_related(None).prefetch_related(None)
+    if projection.select_related:
+        queryset = queryset.select_related(*sorted(projection.select_related))
+    if projection.prefetch_related:
+        queryset = queryset.prefetch_related(*[
+            get_prefetch(lookup) for lookup in sorted(projection.prefetch_related)
+        ])
+    return queryset.only(*sorted(only))
+
+
+class SparseFieldsetMixin:
+    """
+    Soporta `?fields=a,b` y `?exclude=c` en las acciones de lectura.
+
+    Los campos no pedidos se eliminan del serializador y la proyección
+    resultante se aplica al queryset: `.only()` con las columnas usadas,
+    `select_related` solo para las relaciones anidadas pedidas y
+    `prefetch_related` solo para las colecciones pedidas. Sin parámetros se
+    proyecta igualmente a los campos del serializador, así que las columnas
+    grandes que no se muestran nunca se leen. Las vistas async usan las
+    mismas funciones del módulo.
+    """
+    sparse_fields_param = 'fields'
+    sparse_exclude_param = 'exclude'
+    projection_actions = ('list', 'retrieve')
+    # Columnas que se cargan siempre (ordenación, paginación...)
+    projection_extra_fields = ()
+
+    def uses_projection(self):
+        request = getattr(self, 'request', None)
+        return (
+            request is not None
+            and request.method in ('GET', 'HEAD')
+            and getattr(self, 'action', None) in self.projection_actions
+        )
+
+    def get_sparse_fieldset(self):
+        return parse_sparse_fieldset(
+            self.request.query_params, self.sparse_fields_param, self.sparse_exclude_param)
+
+    def apply_sparse_fieldset(self, serializer):
+        return apply_sparse_fieldset(
+            serializer, *self.get_sparse_fieldset(), self.sparse_fields_param)
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        if self.uses_projection():
+            self.apply_sparse_fieldset(serializer)
+        return serializer
+
+    def get_projection_serializer(self):
+        serializer = self.get_serializer_class()(
+            context=self.get_serializer_context())
+        return self.apply_sparse_fieldset(serializer)
+
+    def get_prefetch(self, lookup):
+        """Punto de extensión para usar objetos Prefetch a medida."""
+        return lookup
+
+    def project_queryset(self, queryset):
+        return project_queryset(
+            queryset, self.get_projection_serializer(),
+            self.projection_extra_fields, self.get_prefetch)
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.uses_projection():
+            queryset = self.project_queryset(queryset)
+        return queryset
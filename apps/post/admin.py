@@ -3,6 +3,7 @@ from django.contrib import admin
 from apps.post.models.categoria import Categoria
 from apps.post.models.post import Post
 from apps.post.models.contenido_multimedia import ContenidoMultimedia
+from apps.post.search import search_posts
 
 
 @admin.register(Categoria)
@@ -19,7 +20,16 @@ class PostAdmin(admin.ModelAdmin):
     prepopulated_fields = {'slug': ('titulo',)}
     search_fields = ('titulo', 'contenido')
 
+    def get_search_results(self, request, queryset, search_term):
+        # Usa el índice de búsqueda en lugar de icontains sobre el contenido
+        if not search_term:
+            return queryset, False
+        return search_posts(queryset, search_term), False
+
 
 @admin.register(ContenidoMultimedia)
 class ContenidoMultimediaAdmin(admin.ModelAdmin):
-    list_display = ('articulo', 'tipo', 'descripcion')
+    list_display = ('articulo', 'tipo', 'descripcion', 'estado_procesamiento')
+    list_filter = ('tipo', 'estado_procesamiento')
+    readonly_fields = ('estado_procesamiento', 'error_procesamiento', 'mime_type',
+                       'metadatos', 'miniatura')
@@ -0,0 +1,152 @@
+from collections import Counter
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from apps.post.models.archivo_media import ArchivoMedia
+from apps.post.models.blob_media import BlobMedia
+from apps.post.models.contenido_multimedia import ContenidoMultimedia
+from apps.post.models.post import Post
+from apps.post.storage import BLOBS_DIR, blob_sha256, get_blob_storage
+
+
+def get_grace():
+    """Antigüedad mínima de un blob sin referencias para borrarlo."""
+    return timedelta(seconds=getattr(settings, 'MEDIA_BLOB_GC_GRACE', 24 * 60 * 60))
+
+
+def acquire_blob(name):
+    sha256 = blob_sha256(name)
+    if sha256 is None:  # archivo anterior al almacenamiento por contenido
+        return
+    blob, _ = BlobMedia.objects.get_or_create(
+        nombre=name, defaults={'sha256': sha256, 'tamano': blob_size(name)})
+    BlobMedia.objects.filter(pk=blob.pk).update(
+        referencias=F('referencias') + 1, updated_date=timezone.now())
+
+
+def release_blob(name):
+    if blob_sha256(name) is None:
+        return
+    BlobMedia.objects.filter(nombre=name, referencias__gt=0).update(
+        referencias=F('referencias') - 1, updated_date=timezone.now())
+
+
+def update_references(previous, current):
+    """Mueve una referencia del blob `previous` al blob `current`."""
+    previous, current = previous or '', current or ''
+    if previous == current:
+        return
+    if current:
+        acquire_blob(current)
+    if previous:
+        release_blob(previous)
+
+
+def blob_size(name):
+    try:
+        return get_blob_storage().size(name)
+    except FileNotFoundError:
+        return None
+
+
+def referenced_names():
+    """Contador nombre -> referencias según los propios registros."""
+    names = Counter(ContenidoMultimedia.objects.filter(
+        archivo__startswith=f'{BLOBS_DIR}/').values_list('archivo', flat=True).iterator())
+    names.update(Post.objects.filter(
+        imagen_portada__startswith=f'{BLOBS_DIR}/').values_list('imagen_portada', flat=True).iterator())
+    return names
+
+
+def reconcile_references():
+    """
+    Recalcula BlobMedia.referencias desde los registros (las QuerySet.update()
+    sobre los campos de archivo no pasan por las señales). Devuelve cuántos
+    blobs se han corregido.
+    """
+    counts = referenced_names()
+    fixed = 0
+    for blob in BlobMedia.objects.only('nombre', 'referencias').iterator():
+        expected = counts.pop(blob.nombre, 0)
+        if blob.referencias != expected:
+            BlobMedia.objects.filter(pk=blob.pk).update(
+                referencias=expected, updated_date=timezone.now())
+            fixed += 1
+    for name, expected in counts.items():
+        BlobMedia.objects.create(nombre=name, sha256=blob_sha256(name),
+                                 tamano=blob_size(name), referencias=expected)
+        fixed += 1
+    return fixed
+
+
+def is_referenced(name):
+    return (ContenidoMultimedia.objects.filter(archivo=name).exists()
+            or Post.objects.filter(imagen_portada=name).exists())
+
+
+def is_recent(storage, name, cutoff):
+    """Guardado o reutilizado (ContentAddressedStorage lo toca) tras `cutoff`."""
+    try:
+        return storage.get_modified_time(name) >= cutoff
+    except FileNotFoundError:
+        return False
+
+
+def collect_orphans(cutoff, dry_run=False):
+    """
+    Borra los blobs sin referencias desde antes de `cutoff`. Cada blob se
+    bloquea y se vuelve a comprobar antes de borrarlo, por si otra subida
+    lo acaba de reutilizar. Devuelve (blobs, bytes) liberados.
+    """
+    storage = get_blob_storage()
+    total = freed = 0
+    candidates = BlobMedia.objects.filter(
+        referencias=0, updated_date__lt=cutoff).values_list('pk', flat=True)
+    for pk in list(candidates.iterator()):
+        with transaction.atomic():
+            blob = BlobMedia.objects.select_for_update().filter(
+                pk=pk, referencias=0, updated_date__lt=cutoff).first()
+            if blob is None or is_referenced(blob.nombre) or is_recent(storage, blob.nombre, cutoff):
+                continue
+            total += 1
+            freed += blob.tamano or 0
+            if dry_run:
+                continue
+            ArchivoMedia.objects.filter(nombre=blob.nombre).delete()
+            blob.delete()
+            storage.purge(blob.nombre)
+    return total, freed
+
+
+def collect_untracked(cutoff, dry_run=False):
+    """
+    Borra los archivos de blobs/ sin BlobMedia (guardados pero nunca
+    asignados a un registro, p. ej. una subida rechazada tras guardarla).
+    Devuelve (archivos, bytes) liberados.
+    """
+    storage = get_blob_storage()
+    total = freed = 0
+    for name in walk(storage, BLOBS_DIR):
+        if BlobMedia.objects.filter(nombre=name).exists() or is_referenced(name) \
+                or is_recent(storage, name, cutoff):
+            continue
+        total += 1
+        freed += storage.size(name)
+        if not dry_run:
+            storage.purge(name)
+    return total, freed
+
+
+def walk(storage, path):
+    try:
+        directories, files = storage.listdir(path)
+    except FileNotFoundError:
+        return
+    for name in files:
+        yield f'{path}/{name}'
+    for directory in directories:
+        yield from walk(storage, f'{path}/{directory}')
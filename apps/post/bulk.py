@@ -0,0 +1,155 @@
+import logging
+
+from django.conf import settings
+from django.db import DatabaseError, router, transaction
+
+from apps.post.cache import invalidate_posts
+from apps.post.counters import CounterChanges, snapshot
+from apps.post.models.post import Post
+from apps.post.search import index_posts
+
+logger = logging.getLogger(__name__)
+
+# Campos derivados que calcula Post.prepare_save()
+DERIVED_FIELDS = ('slug', 'autor_nombre', 'contenido_html', 'contenido_html_hash')
+# Error de los elementos de un bloque que no se pudo guardar
+CHUNK_ERROR = 'No se pudo guardar este bloque de artículos; vuelve a intentarlo.'
+
+
+def get_chunk_size():
+    return getattr(settings, 'POST_BULK_CHUNK_SIZE', 200)
+
+
+def get_max_items():
+    """Elementos admitidos por petición en las operaciones masivas."""
+    return getattr(settings, 'POST_BULK_MAX_ITEMS', 1000)
+
+
+def chunked(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def after_bulk_write(post_ids, category_ids=(), search=True, counters=None, using=None):
+    """
+    Efectos que las señales post_save aplican a cada artículo y que
+    bulk_create/bulk_update/update() no disparan. `counters` (CounterChanges)
+    se aplica en la transacción abierta por el llamador.
+    """
+    if search:
+        index_posts(post_ids, using=using)
+    if counters is not None:
+        counters.apply(using=using)
+    invalidate_posts(post_ids=post_ids, category_ids=category_ids)
+
+
+def bulk_create_posts(items, autor, audit):
+    """
+    Crea los artículos de `items` (índice, datos validados) por bloques, cada
+    uno en su transacción. Devuelve índice -> artículo creado e índice ->
+    error de los bloques que fallaron (los anteriores ya están guardados).
+    """
+    using = router.db_for_write(Post)
+    created, failed = {}, {}
+    for chunk in chunked(items, get_chunk_size()):
+        posts = []
+        for index, data in chunk:
+            post = Post(autor=autor, **data, **audit)
+            post.prepare_save()
+            posts.append((index, post))
+
+        try:
+            with transaction.atomic(using=using):
+                Post.objects.using(using).bulk_create([post for _, post in posts])
+                ids = [post.pk for _, post in posts]
+                if None in ids:
+                    # Backends sin RETURNING: se recuperan por título (único)
+                    pks = dict(Post.objects.using(using).filter(
+                        titulo__in=[post.titulo for _, post in posts]
+                    ).values_list('titulo', 'pk'))
+                    for _, post in posts:
+                        post.pk = pks[post.titulo]
+                    ids = [post.pk for _, post in posts]
+                counters = CounterChanges()
+                for _, post in posts:
+                    counters.add(None, snapshot(post))
+                after_bulk_write(
+                    ids, [post.category_id for _, post in posts], counters=counters,
+                    using=using)
+        except DatabaseError:
+            chunk_failed(failed, [index for index, _ in posts])
+            continue
+        created.update(posts)
+    return created, failed
+
+
+def bulk_update_posts(items, instances, audit):
+    """
+    Aplica las actualizaciones parciales de `items` (índice, datos validados)
+    sobre `instances` (índice -> artículo) con bulk_update por bloques.
+    Devuelve índice -> artículo actualizado e índice -> error, como
+    bulk_create_posts.
+    """
+    using = router.db_for_write(Post)
+    updated, failed = {}, {}
+    for chunk in chunked(items, get_chunk_size()):
+        posts = []
+        fields = set(audit)
+        category_ids = set()
+        counters = CounterChanges()
+        for index, data in chunk:
+            post = instances[index]
+            previous = snapshot(post)
+            category_ids.add(post.category_id)
+            for field, value in data.items():
+                setattr(post, field, value)
+            for field, value in audit.items():
+                setattr(post, field, value)
+            post.prepare_save()
+            category_ids.add(post.category_id)
+            counters.add(previous, snapshot(post))
+            fields.update(data)
+            posts.append((index, post))
+
+        fields.update(DERIVED_FIELDS)
+        try:
+            with transaction.atomic(using=using):
+                Post.objects.using(using).bulk_update(
+                    [post for _, post in posts], sorted(fields))
+                after_bulk_write([post.pk for _, post in posts], category_ids,
+                                 counters=counters, using=using)
+        except DatabaseError:
+            chunk_failed(failed, [index for index, _ in posts])
+            continue
+        updated.update(posts)
+    return updated, failed
+
+
+def bulk_set_state(posts, values):
+    """
+    Cambia estado/is_active de `posts` con un UPDATE por bloque. Los campos
+    indexados para la búsqueda no cambian, así que no se reindexa. Devuelve
+    id -> error de los bloques que fallaron.
+    """
+    using = router.db_for_write(Post)
+    failed = {}
+    for chunk in chunked(posts, get_chunk_size()):
+        counters = CounterChanges()
+        for post in chunk:
+            counters.add(snapshot(post), snapshot(post, values))
+        try:
+            with transaction.atomic(using=using):
+                Post.objects.using(using).filter(
+                    pk__in=[post.pk for post in chunk]).update(**values)
+                after_bulk_write([post.pk for post in chunk],
+                                 {post.category_id for post in chunk},
+                                 search=False, counters=counters, using=using)
+        except DatabaseError:
+            chunk_failed(failed, [post.pk for post in chunk])
+    return failed
+
+
+def chunk_failed(failed, keys):
+    # El bloque se deshace entero; los anteriores ya están confirmados
+    logger.exception('Falló un bloque de %s artículos de una operación masiva', len(keys))
+    failed.update((key, {'detail': CHUNK_ERROR}) for key in keys)
@@ -0,0 +1,154 @@
+import hashlib
+import json
+import re
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework import status
+from rest_framework.response import Response
+
+from apps.core.cache import VersionStamps
+from apps.core.replicas import use_primary
+from apps.post.catalog import invalidate_catalog
+
+# Forma canónica de un id, la de los sellos 'post:<id>' y 'categoria:<id>'
+CANONICAL_ID = re.compile(r'[1-9][0-9]*')
+
+
+def get_cache_alias():
+    return getattr(settings, 'POST_RESPONSE_CACHE_ALIAS', None)
+
+
+def get_version_stamps():
+    alias = get_cache_alias()
+    return VersionStamps(alias) if alias else None
+
+
+def invalidate_posts(post_ids=(), category_ids=(), lists=True):
+    stamps = get_version_stamps()
+    if stamps is None:
+        return
+    names = ['posts'] if lists else []
+    names += [f'post:{pk}' for pk in set(post_ids) if pk]
+    names += [f'categoria:{pk}' for pk in set(category_ids) if pk]
+    stamps.bump_on_commit(*names)
+
+
+def invalidate_categories():
+    # Respuestas de artículos cacheadas y catálogo de categorías en memoria
+    stamps = get_version_stamps()
+    if stamps is not None:
+        stamps.bump_on_commit('categorias')
+    invalidate_catalog()
+
+
+def invalidate_authors():
+    stamps = get_version_stamps()
+    if stamps is not None:
+        stamps.bump_on_commit('autores')
+
+
+def make_etag(data):
+    payload = json.dumps(data, sort_keys=True, default=str).encode()
+    return '"%s"' % hashlib.sha1(payload).hexdigest()
+
+
+def etag_matches(request, etag):
+    header = request.headers.get('If-None-Match', '')
+    candidates = [value.strip() for value in header.split(',')]
+    return etag in candidates or '*' in candidates
+
+
+class PostResponseCacheMixin:
+    """
+    Caché de respuestas list/retrieve de artículos publicados.
+
+    Solo se cachea a los lectores (usuarios sin rol de escritor ni staff),
+    que ven todos la misma salida. La clave combina los parámetros de la
+    petición con los sellos de versión de los que depende la respuesta:
+
+    - list: 'posts', o 'categoria:<id>' si se filtra por categoría.
+    - retrieve: 'post:<id>'.
+    - siempre: 'categorias' y 'autores' (nombres mostrados en la salida).
+
+    Las señales de Post, Categoria, ContenidoMultimedia y User cambian esos
+    sellos tras el commit, por lo que nunca se sirve una respuesta anterior
+    a una escritura. Los ids que no están en forma canónica ('05', '+5',
+    '5.0') buscan el mismo artículo o categoría pero no coinciden con el
+    sello, así que esas peticiones no se cachean. Las respuestas que se
+    guardan se construyen en el primario, nunca en una réplica con retraso.
+    Responde con ETag y 304 ante If-None-Match.
+
+    Sellos y respuestas tienen que estar en una caché compartida por todos
+    los procesos: con LocMem cada worker solo ve sus propias escrituras
+    (config/settings_production.py desactiva la caché sin REDIS_URL).
+    """
+
+    def is_response_cacheable(self, request):
+        user = request.user
+        return (
+            get_cache_alias() is not None
+            and request.method in ('GET', 'HEAD')
+            and user.is_authenticated
+            and not (user.is_staff or user.is_superuser or user.is_writer)
+            and self.has_canonical_ids(request)
+        )
+
+    def has_canonical_ids(self, request):
+        values = request.query_params.getlist('categoria')
+        if self.action == 'retrieve':
+            values.append(str(self.kwargs.get(self.lookup_field)))
+        return all(CANONICAL_ID.fullmatch(value) for value in values if value)
+
+    def get_cache_dependencies(self, request):
+        deps = ['categorias', 'autores']
+        if self.action == 'retrieve':
+            deps.append(f'post:{self.kwargs.get(self.lookup_field)}')
+        elif request.query_params.get('categoria'):
+            deps.append(f"categoria:{request.query_params['categoria']}")
+        else:
+            deps.append('posts')
+        return deps
+
+    def get_cache_key(self, request, versions):
+        params = sorted(
+            (key, value)
+            for key in request.query_params
+            for value in request.query_params.getlist(key)
+        )
+        raw = json.dumps([self.action, self.kwargs.get(self.lookup_field),
+                          params, sorted(versions.items())])
+        return 'post-response:%s' % hashlib.sha1(raw.encode()).hexdigest()
+
+
+    def cached_response(self, request, build_response):
+        if not self.is_response_cacheable(request):
+            return build_response()
+
+        # Las versiones se leen antes de consultar la base de datos
+        versions = get_version_stamps().get_many(
+            self.get_cache_dependencies(request))
+        cache = caches[get_cache_alias()]
+        key = self.get_cache_key(request, versions)
+
+        entry = cache.get(key)
+        if entry is None:
+            # Del primario: una réplica con retraso podría devolver datos
+            # anteriores al sello ya leído y se guardarían con él
+            with use_primary():
+                response = build_response()
+            if response.status_code != status.HTTP_200_OK:
+                return response
+            entry = {'data': response.data, 'etag': make_etag(response.data)}
+            cache.set(key, entry)
+            cache_status = 'MISS'
+        else:
+            cache_status = 'HIT'
+
+        if etag_matches(request, entry['etag']):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = Response(entry['data'], status=status.HTTP_200_OK)
+        response['ETag'] = entry['etag']
+        response['X-Cache'] = cache_status
+        return response
@@ -0,0 +1,101 @@
+import threading
+from collections import namedtuple
+
+from django.conf import settings
+
+from apps.core.cache import VersionStamps
+from apps.core.replicas import use_primary
+from apps.post.models.categoria import Categoria
+
+# Sello de versión del catálogo: lo cambian las señales de Categoria (ver
+# invalidate_categories) y los contadores de artículos (apps.post.counters)
+STAMP = 'catalogo-categorias'
+
+# Columnas que usan CategoriaListSerializer y las validaciones de artículos
+CategoriaInfo = namedtuple(
+    'CategoriaInfo', ['id', 'name', 'is_active', 'created_date', 'created_by',
+                      'num_publicados', 'ultima_publicacion'])
+
+
+def get_stamps():
+    return VersionStamps(getattr(settings, 'CATEGORY_CATALOG_ALIAS', 'default'))
+
+
+def invalidate_catalog(using=None):
+    get_stamps().bump_on_commit(STAMP, using=using)
+
+
+class CategoryCatalog:
+    """
+    Catálogo de categorías en memoria del proceso (id -> CategoriaInfo),
+    activas e inactivas, ordenadas por nombre.
+
+    Se carga en el primer uso y se valida en cada lectura con el sello
+    STAMP de CATEGORY_CATALOG_ALIAS, que cambia tras el commit de cualquier
+    alta, cambio o borrado lógico de una categoría o de sus contadores de
+    artículos publicados. Con el sello vigente no hay consultas; si ha
+    cambiado, se recarga entero del primario (la tabla es pequeña).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = None
+        self._categorias = None
+
+    def cached(self, version):
+        # Sin caché compartida los sellos son de cada proceso y no se verían
+        # los cambios hechos en otro: se lee de la BD en cada uso
+        if not getattr(settings, 'CATEGORY_CATALOG_CACHE', True):
+            return None
+        with self._lock:
+            if self._categorias is not None and self._version == version:
+                return self._categorias
+        return None
+
+    def store(self, version, rows):
+        categorias = {row[0]: CategoriaInfo(*row) for row in rows}
+        with self._lock:
+            self._version = version
+            self._categorias = categorias
+        return categorias
+
+    def get_queryset(self):
+        return Categoria.objects.order_by('name').values_list(*CategoriaInfo._fields)
+
+    def get_all(self):
+        # El sello se lee antes que la tabla: un cambio posterior a la
+        # lectura lo vuelve a cambiar y descarta esta copia
+        version = get_stamps().get(STAMP)
+        categorias = self.cached(version)
+        if categorias is None:
+            with use_primary():
+                categorias = self.store(version, list(self.get_queryset()))
+        return categorias
+
+    async def aget_all(self):
+        version = await get_stamps().aget(STAMP)
+        categorias = self.cached(version)
+        if categorias is None:
+            with use_primary():
+                rows = [row async for row in self.get_queryset()]
+            categorias = self.store(version, rows)
+        return categorias
+
+    def get(self, pk):
+        return self.get_all().get(pk)
+
+    def active(self, categorias=None):
+        categorias = self.get_all() if categorias is None else categorias
+        return [categoria for categoria in categorias.values() if categoria.is_active]
+
+    def clear(self):
+        with self._lock:
+            self._version = None
+            self._categorias = None
+
+
+catalog = CategoryCatalog()
+
+
+def get_catalog():
+    return catalog
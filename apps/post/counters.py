@@ -0,0 +1,144 @@
+from collections import defaultdict
+
+from django.db import router
+from django.db.models import Count, F, Max, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+
+from apps.post.catalog import invalidate_catalog
+from apps.post.models.categoria import Categoria
+from apps.post.models.post import PUBLICADOS, Post
+from apps.users.models import User
+
+# Campos de Post de los que dependen los contadores
+COUNTED_FIELDS = ('estado', 'is_active', 'category_id', 'autor_id', 'fecha_publicacion')
+
+# Modelo con contadores y campo de Post que lo referencia
+TARGETS = ((Categoria, 'category_id'), (User, 'autor_id'))
+
+
+def snapshot(post, values=None):
+    """Valores de COUNTED_FIELDS del artículo, con `values` aplicados encima."""
+    current = {field: getattr(post, field) for field in COUNTED_FIELDS}
+    current.update((field, value) for field, value in (values or {}).items()
+                   if field in current)
+    return current
+
+
+def loaded_snapshot(post):
+    """Valores leídos de la BD (Post._loaded_values), None si falta alguno."""
+    loaded = getattr(post, '_loaded_values', None) or {}
+    if any(field not in loaded for field in COUNTED_FIELDS):
+        return None
+    return {field: loaded[field] for field in COUNTED_FIELDS}
+
+
+def is_counted(values):
+    # Mismo criterio que PUBLICADOS
+    return values is not None and values['estado'] == 'publicado' and bool(values['is_active'])
+
+
+def count_subquery(field):
+    return Coalesce(Subquery(
+        Post.objects.filter(PUBLICADOS, **{field: OuterRef('pk')}).order_by()
+        .values(field).annotate(total=Count('pk')).values('total')), 0)
+
+
+def latest_subquery(field):
+    return Subquery(
+        Post.objects.filter(PUBLICADOS, fecha_publicacion__isnull=False,
+                            **{field: OuterRef('pk')})
+        .order_by('-fecha_publicacion').values('fecha_publicacion')[:1])
+
+
+class CounterChanges:
+    """
+    Cambios en los contadores de una o varias escrituras de artículos. Por
+    categoría y por autor acumula la diferencia de publicados, la fecha de
+    publicación más reciente ganada y si alguna publicación se ha perdido
+    (entonces la fecha se recalcula). apply() los escribe con un UPDATE por
+    fila afectada, dentro de la transacción de la escritura.
+    """
+
+    def __init__(self):
+        self.deltas = {field: defaultdict(lambda: [0, None, False]) for _, field in TARGETS}
+        self.recompute = {field: set() for _, field in TARGETS}
+
+    def add(self, previous, current):
+        """`previous`/`current`: snapshot() antes y después, None si no existe."""
+        before = previous if is_counted(previous) else None
+        after = current if is_counted(current) else None
+        if before == after:
+            return
+        for _, field in TARGETS:
+            if before and before[field]:
+                change = self.deltas[field][before[field]]
+                change[0] -= 1
+                change[2] = True
+            if after and after[field]:
+                change = self.deltas[field][after[field]]
+                change[0] += 1
+                fecha = after['fecha_publicacion']
+                if fecha and (change[1] is None or fecha > change[1]):
+                    change[1] = fecha
+
+    def add_unknown(self, current):
+        """Sin valores anteriores (leído con only()): se recalculan del todo."""
+        for _, field in TARGETS:
+            if current[field]:
+                self.recompute[field].add(current[field])
+
+    def apply(self, using=None):
+        for model, field in TARGETS:
+            for pk, (delta, fecha, lost) in self.deltas[field].items():
+                if pk in self.recompute[field]:
+                    continue
+                values = {}
+                if delta:
+                    values['num_publicados'] = Greatest(F('num_publicados') + delta, Value(0))
+                if lost:
+                    values['ultima_publicacion'] = latest_subquery(field)
+                elif fecha:
+                    values['ultima_publicacion'] = Greatest(
+                        Coalesce(F('ultima_publicacion'), Value(fecha)), Value(fecha))
+                if values:
+                    model.objects.using(using).filter(pk=pk).update(**values)
+            recompute_counters(model, field, self.recompute[field], using=using)
+        if self.deltas['category_id'] or self.recompute['category_id']:
+            invalidate_catalog(using=using)
+
+
+def recompute_counters(model, field, pks, using=None):
+    """Recalcula desde Post los contadores de las filas `pks` de `model`."""
+    if pks:
+        model.objects.using(using).filter(pk__in=pks).update(
+            num_publicados=count_subquery(field),
+            ultima_publicacion=latest_subquery(field))
+
+
+def reconcile_counters(using=None):
+    """
+    Recalcula en bloque todos los contadores: una agregación por modelo y un
+    UPDATE solo de las filas que no coinciden. Devuelve modelo -> filas
+    corregidas.
+    """
+    using = using or router.db_for_write(Post)
+    fixed = {}
+    for model, field in TARGETS:
+        stats = {
+            row[field]: (row['total'], row['ultima'])
+            for row in Post.objects.using(using).filter(PUBLICADOS).order_by()
+            .values(field).annotate(total=Count('pk'), ultima=Max('fecha_publicacion'))
+        }
+        stale = [
+            pk for pk, total, ultima in model.objects.using(using).values_list(
+                'pk', 'num_publicados', 'ultima_publicacion').iterator()
+            if stats.get(pk, (0, None)) != (total, ultima)
+        ]
+        # Los valores se recalculan en el propio UPDATE, así que incluyen lo
+        # escrito desde la agregación
+        for start in range(0, len(stale), 500):
+            recompute_counters(model, field, stale[start:start + 500], using=using)
+        fixed[model] = len(stale)
+    if fixed[Categoria]:
+        invalidate_catalog(using=using)
+    return fixed
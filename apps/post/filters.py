@@ -1,14 +1,18 @@
 import django_filters
 from django.db.models import Q
+from apps.core.text import normalize_text
 from apps.post.models.post import Post
 
 
 class PostFilter(django_filters.FilterSet):
     autor_nombre = django_filters.CharFilter(
-        field_name='autor',
-        lookup_expr='icontains',
+        field_name='autor_nombre',
         method='filter_by_author_name'
     )
+    autor_prefijo = django_filters.CharFilter(
+        field_name='autor_nombre',
+        method='filter_by_author_prefix'
+    )
     fecha_publicacion = django_filters.DateFilter(
         field_name='fecha_publicacion',
         lookup_expr='date__exact'
@@ -17,10 +21,27 @@ class PostFilter(django_filters.FilterSet):
 
     class Meta:
         model = Post
-        fields = ['autor_nombre', 'fecha_publicacion', 'categoria']
+        fields = ['autor_nombre', 'autor_prefijo',
+                  'fecha_publicacion', 'categoria']
 
+    # Ambos filtros usan Post.autor_nombre (sin join y sin acentos). En
+    # PostgreSQL el índice trigram resuelve los LIKE con comodín inicial
+    # ('%x%' y el '% x%' del inicio de apellido; selectivo desde 3
+    # caracteres) y varchar_pattern_ops el 'x%'. En otros motores se recorre
+    # el listado por fecha comprobando cada fila: benchmarks/post_indexes.py
+    # mide las tres formas
     def filter_by_author_name(self, queryset, name, value):
+        value = normalize_text(value)
+        if not value:
+            return queryset
+        return queryset.filter(autor_nombre__contains=value)
+
+    def filter_by_author_prefix(self, queryset, name, value):
+        # Coincide con el inicio del nombre o de cualquiera de los apellidos
+        value = normalize_text(value)
+        if not value:
+            return queryset
         return queryset.filter(
-            Q(autor__first_name__icontains=value) |
-            Q(autor__last_name__icontains=value)
+            Q(autor_nombre__startswith=value) |
+            Q(autor_nombre__contains=' ' + value)
         )
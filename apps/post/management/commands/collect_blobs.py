@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.post.blobs import collect_orphans, collect_untracked, get_grace, reconcile_references
+
+
+class Command(BaseCommand):
+    help = ('Borra del almacenamiento por contenido los blobs sin referencias '
+            'desde hace más de MEDIA_BLOB_GC_GRACE segundos')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reconcile', action='store_true',
+                            help='Recalcula antes las referencias desde los registros')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Solo informa de lo que se borraría')
+
+    def handle(self, *args, **options):
+        dry_run = options['dry_run']
+        if options['reconcile']:
+            fixed = reconcile_references()
+            self.stdout.write(f'{fixed} blobs con referencias corregidas')
+
+        cutoff = timezone.now() - get_grace()
+        orphans, orphan_bytes = collect_orphans(cutoff, dry_run)
+        untracked, untracked_bytes = collect_untracked(cutoff, dry_run)
+        verb = 'se borrarían' if dry_run else 'borrados'
+        self.stdout.write(self.style.SUCCESS(
+            f'{orphans + untracked} blobs {verb} ({orphans} sin referencias, '
+            f'{untracked} sin registrar), {orphan_bytes + untracked_bytes} bytes'))
@@ -0,0 +1,56 @@
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS
+
+from apps.post.media import register_media_file
+from apps.post.models.archivo_media import ArchivoMedia
+from apps.post.models.contenido_multimedia import ContenidoMultimedia
+from apps.post.models.post import Post
+
+
+class Command(BaseCommand):
+    help = ('Registra en ArchivoMedia (con su sha256) los archivos de portadas y '
+            'multimedia que aún no lo están, para que la vista de medios los sirva')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true',
+                            help='Recalcula también los archivos ya registrados')
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        using = options['database']
+        registered = set()
+        if not options['all']:
+            registered = set(ArchivoMedia.objects.using(using).exclude(
+                sha256='').values_list('nombre', 'articulo_id'))
+
+        total = missing = 0
+        for name, articulo_id in self.get_files(using):
+            if not name or (name, articulo_id) in registered:
+                continue
+            try:
+                register_media_file(name, articulo_id)
+            except FileNotFoundError:
+                missing += 1
+                self.stderr.write(f'No existe en el almacenamiento: {name}')
+                continue
+            total += 1
+            if total % 500 == 0:
+                self.stdout.write(f'{total} archivos registrados...')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'{total} archivos registrados, {missing} no encontrados'))
+
+    def get_files(self, using):
+        posts = Post.objects.using(using).exclude(imagen_portada='').exclude(
+            imagen_portada__isnull=True)
+        for pk, imagen, variants in posts.values_list(
+                'pk', 'imagen_portada', 'portada_variantes').iterator():
+            yield imagen, pk
+            for by_width in (variants or {}).values():
+                for name in by_width.values():
+                    yield name, pk
+        multimedia = ContenidoMultimedia.objects.using(using).values_list(
+            'articulo_id', 'archivo', 'miniatura')
+        for articulo_id, archivo, miniatura in multimedia.iterator():
+            yield archivo, articulo_id
+            yield miniatura, articulo_id
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.post.models.subida import SubidaMultimedia
+from apps.post.uploads import discard_upload
+
+
+class Command(BaseCommand):
+    help = 'Borra las subidas por partes caducadas y sus partes del almacenamiento'
+
+    def handle(self, *args, **options):
+        total = 0
+        for subida in SubidaMultimedia.objects.filter(expira__lte=timezone.now()).iterator():
+            discard_upload(subida)
+            total += 1
+        self.stdout.write(self.style.SUCCESS(f'{total} subidas caducadas borradas'))
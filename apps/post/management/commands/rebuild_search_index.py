@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS
+
+from apps.post.models.post import Post
+from apps.post.search import index_posts, uses_search_vector
+
+
+class Command(BaseCommand):
+    help = 'Reconstruye por lotes el índice de búsqueda de los artículos'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        using = options['database']
+        backend = 'tsvector' if uses_search_vector(using) else 'índice invertido'
+
+        queryset = Post.objects.using(using).order_by('pk')
+        last_pk = 0
+        total = 0
+        while True:
+            ids = list(queryset.filter(pk__gt=last_pk).values_list(
+                'pk', flat=True)[:batch_size])
+            if not ids:
+                break
+            index_posts(ids, using=using)
+            last_pk = ids[-1]
+            total += len(ids)
+            self.stdout.write(f'{total} artículos indexados...')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Índice de búsqueda ({backend}) reconstruido: {total} artículos'))
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS
+
+from apps.post.counters import reconcile_counters
+from apps.post.models.categoria import Categoria
+from apps.users.models import User
+
+
+class Command(BaseCommand):
+    help = ('Recalcula los contadores de artículos publicados (num_publicados y '
+            'ultima_publicacion) de categorías y autores')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        fixed = reconcile_counters(using=options['database'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Contadores corregidos: {fixed[Categoria]} categorías, {fixed[User]} autores'))
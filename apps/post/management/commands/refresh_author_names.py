@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS
+
+from apps.core.text import normalize_text
+from apps.post.models.post import Post
+from apps.users.models import User
+
+
+class Command(BaseCommand):
+    help = 'Recalcula Post.autor_nombre (nombre de autor normalizado para los filtros)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        using = options['database']
+        autores = User.objects.using(using).filter(
+            pk__in=Post.objects.using(using).values('autor_id')
+        ).values_list('pk', 'first_name', 'last_name')
+
+        total = 0
+        for pk, first_name, last_name in autores.iterator():
+            autor_nombre = normalize_text(f'{first_name} {last_name}')
+            total += Post.objects.using(using).filter(autor_id=pk).exclude(
+                autor_nombre=autor_nombre).update(autor_nombre=autor_nombre)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'{total} artículos actualizados'))
@@ -0,0 +1,63 @@
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+import os
+
+import django
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS
+
+from apps.post.media import get_cover_formats, get_cover_widths, render_cover_variants
+from apps.post.models.post import Post
+from apps.post.tasks import save_cover_variants
+
+
+def render_one(post_id, imagen, widths, formats):
+    try:
+        return post_id, imagen, render_cover_variants(imagen, widths, formats), None
+    except Exception as exc:
+        return post_id, imagen, None, str(exc)
+
+
+class Command(BaseCommand):
+    help = ('Genera en paralelo las variantes responsive de las portadas '
+            '(tras cambiar POST_COVER_WIDTHS/POST_COVER_FORMATS o para portadas '
+            'anteriores)')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=os.cpu_count())
+        parser.add_argument('--all', action='store_true',
+                            help='Regenera también las portadas que ya tienen variantes')
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        widths, formats = get_cover_widths(), get_cover_formats()
+        queryset = Post.objects.using(options['database']).exclude(
+            imagen_portada='').exclude(imagen_portada__isnull=True)
+        if not options['all']:
+            queryset = queryset.filter(portada_variantes={})
+        covers = queryset.order_by('pk').values_list('pk', 'imagen_portada')
+
+        counts = Counter()
+        # initializer: con el método 'spawn' los procesos hijos no heredan
+        # la configuración de Django
+        with ProcessPoolExecutor(max_workers=options['workers'],
+                                 initializer=django.setup) as executor:
+            pending = []
+            for post_id, imagen in covers.iterator(chunk_size=500):
+                pending.append(executor.submit(render_one, post_id, imagen, widths, formats))
+                # Como mucho dos portadas en vuelo por proceso
+                if len(pending) >= options['workers'] * 2:
+                    counts[self.save(*pending.pop(0).result())] += 1
+            for future in pending:
+                counts[self.save(*future.result())] += 1
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{counts['ok']} portadas procesadas ({', '.join(formats)}; "
+            f"{', '.join(map(str, widths))} px), {counts['error']} errores"))
+
+    def save(self, post_id, imagen, result, error):
+        if error is not None:
+            self.stderr.write(f'Artículo {post_id} ({imagen}): {error}')
+            return 'error'
+        save_cover_variants(post_id, imagen, *result)
+        return 'ok'
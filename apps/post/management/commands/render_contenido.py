@@ -0,0 +1,69 @@
+from concurrent.futures import ProcessPoolExecutor
+import os
+
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS
+
+from apps.post.cache import invalidate_posts
+from apps.post.models.post import Post
+from apps.post.rendering import (
+    content_hash, get_markdown_config, get_renderer_version, render_batch
+)
+
+
+class Command(BaseCommand):
+    help = ('Re-renderiza en paralelo el HTML de los artículos desfasados '
+            '(tras cambiar la configuración del renderizador de Markdown)')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=200)
+        parser.add_argument('--workers', type=int, default=os.cpu_count())
+        parser.add_argument('--all', action='store_true',
+                            help='Re-renderiza también los artículos al día')
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        using = options['database']
+        config = get_markdown_config()
+        version = get_renderer_version(config)
+        batches = self.get_stale_batches(
+            using, version, options['batch_size'], options['all'])
+
+        total = 0
+        with ProcessPoolExecutor(max_workers=options['workers']) as executor:
+            pending = []
+            for items in batches:
+                pending.append(executor.submit(
+                    render_batch, items, config, version))
+                # Como mucho dos lotes en vuelo por proceso
+                if len(pending) >= options['workers'] * 2:
+                    total += self.save_batch(pending.pop(0).result(), using)
+            for future in pending:
+                total += self.save_batch(future.result(), using)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'{total} artículos re-renderizados (renderizador {version})'))
+
+    def get_stale_batches(self, using, version, batch_size, render_all):
+        queryset = Post.objects.using(using).order_by('pk').values_list(
+            'pk', 'contenido', 'contenido_html_hash')
+        batch = []
+        for pk, contenido, digest in queryset.iterator(chunk_size=batch_size):
+            if render_all or digest != content_hash(contenido, version):
+                batch.append((pk, contenido))
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def save_batch(self, rendered, using):
+        posts = [
+            Post(pk=pk, contenido_html=html, contenido_html_hash=digest)
+            for pk, html, digest in rendered
+        ]
+        Post.objects.using(using).bulk_update(
+            posts, ['contenido_html', 'contenido_html_hash'])
+        invalidate_posts(post_ids=[post.pk for post in posts], lists=False)
+        self.stdout.write(f'{len(posts)} artículos guardados...')
+        return len(posts)
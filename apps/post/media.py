@@ -0,0 +1,293 @@
+import hashlib
+import json
+import mimetypes
+import os
+import shutil
+import subprocess
+import tempfile
+from contextlib import contextmanager
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps
+
+from apps.post.models.archivo_media import ArchivoMedia
+from apps.post.models.contenido_multimedia import ContenidoMultimedia
+from apps.post.models.post import Post
+from apps.post.storage import blob_sha256
+
+try:
+    import magic
+except ImportError:  # python-magic sin libmagic en el sistema
+    magic = None
+
+try:
+    import pillow_avif  # noqa: F401  Registra AVIF en Pillow sin soporte nativo
+except ImportError:
+    pass
+
+# Bytes de cabecera suficientes para que libmagic identifique el formato
+SNIFF_BYTES = 2048
+
+COVER_VARIANTS_DIR = 'articulos/portadas/variantes'
+# Formato de las variantes -> formato de Pillow
+VARIANT_FORMATS = {'avif': 'AVIF', 'webp': 'WEBP', 'jpeg': 'JPEG', 'png': 'PNG'}
+
+
+def sniff_mime(fieldfile):
+    """Tipo MIME según el contenido del archivo (por la extensión sin libmagic)."""
+    if magic is None:
+        return mimetypes.guess_type(fieldfile.name)[0] or 'application/octet-stream'
+    fieldfile.open('rb')
+    try:
+        fieldfile.seek(0)
+        head = fieldfile.read(SNIFF_BYTES)
+    finally:
+        fieldfile.close()
+    return magic.from_buffer(head, mime=True)
+
+
+@contextmanager
+def local_path(fieldfile):
+    """Ruta local del archivo; con almacenamientos remotos, una copia temporal."""
+    try:
+        path = fieldfile.path
+    except NotImplementedError:
+        path = None
+    if path is not None:
+        yield path
+        return
+    suffix = os.path.splitext(fieldfile.name)[1]
+    with tempfile.NamedTemporaryFile(suffix=suffix) as copy:
+        fieldfile.open('rb')
+        try:
+            for chunk in fieldfile.chunks():
+                copy.write(chunk)
+        finally:
+            fieldfile.close()
+        copy.flush()
+        yield copy.name
+
+
+def open_image(fieldfile, size=None):
+    """
+    Abre la imagen ya orientada según EXIF. Con `size`, los JPEG se
+    decodifican directamente a una escala reducida (draft), mucho más rápido
+    que decodificar la imagen completa para luego reducirla.
+    """
+    fieldfile.open('rb')
+    try:
+        image = Image.open(fieldfile)
+        if size is not None:
+            image.draft('RGB', size)
+        image.load()
+    finally:
+        fieldfile.close()
+    return ImageOps.exif_transpose(image)
+
+
+def image_metadata(fieldfile):
+    fieldfile.open('rb')
+    try:
+        with Image.open(fieldfile) as image:
+            width, height = image.size
+            orientation = image.getexif().get(0x0112, 1)
+            image_format = image.format
+    finally:
+        fieldfile.close()
+    if orientation in (5, 6, 7, 8):  # rotada 90/270 grados
+        width, height = height, width
+    return {'ancho': width, 'alto': height, 'formato': image_format}
+
+
+def make_thumbnail(fieldfile, size=None):
+    """Miniatura WebP que cabe en MEDIA_THUMBNAIL_SIZE, como ContentFile."""
+    size = size or getattr(settings, 'MEDIA_THUMBNAIL_SIZE', (480, 480))
+    image = open_image(fieldfile, size)
+    image.thumbnail(size, Image.Resampling.LANCZOS)
+    if image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA' if 'A' in image.getbands() else 'RGB')
+    output = BytesIO()
+    image.save(output, 'WEBP', quality=getattr(settings, 'MEDIA_THUMBNAIL_QUALITY', 80))
+    name = os.path.splitext(os.path.basename(fieldfile.name))[0] + '.webp'
+    return ContentFile(output.getvalue(), name=name)
+
+
+def video_metadata(fieldfile):
+    """
+    Duración, dimensiones y códecs con ffprobe. Sin ffprobe instalado
+    devuelve un diccionario vacío.
+    """
+    ffprobe = getattr(settings, 'MEDIA_FFPROBE_PATH', None) or shutil.which('ffprobe')
+    if not ffprobe:
+        return {}
+    with local_path(fieldfile) as path:
+        output = subprocess.run(
+            [ffprobe, '-v', 'error', '-print_format', 'json',
+             '-show_format', '-show_streams', path],
+            capture_output=True, text=True, check=True,
+            timeout=getattr(settings, 'MEDIA_FFPROBE_TIMEOUT', 60))
+    probe = json.loads(output.stdout)
+
+    metadata = {}
+    duration = probe.get('format', {}).get('duration')
+    if duration:
+        metadata['duracion'] = round(float(duration), 3)
+    for stream in probe.get('streams', []):
+        if stream.get('codec_type') == 'video' and 'codec_video' not in metadata:
+            metadata.update({'ancho': stream.get('width'), 'alto': stream.get('height'),
+                             'codec_video': stream.get('codec_name')})
+        elif stream.get('codec_type') == 'audio' and 'codec_audio' not in metadata:
+            metadata['codec_audio'] = stream.get('codec_name')
+    return metadata
+
+
+def file_sha256(name, storage=default_storage):
+    digest = hashlib.sha256()
+    with storage.open(name, 'rb') as stored:
+        for chunk in stored.chunks():
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def register_media(nombre, articulo_id, **values):
+    """
+    Asocia el archivo `nombre` a su artículo para servirlo con la
+    visibilidad de este; `values`: sha256, tamano, content_type.
+    """
+    ArchivoMedia.objects.update_or_create(
+        nombre=nombre, articulo_id=articulo_id, defaults=values)
+
+
+def cover_files(variants):
+    """Rutas de las variantes de Post.portada_variantes."""
+    return [path for by_width in (variants or {}).values() for path in by_width.values()]
+
+
+def media_in_use(articulo_id):
+    """Archivos que el artículo usa ahora: multimedia, miniaturas y portada."""
+    names = set()
+    for archivo, miniatura in ContenidoMultimedia.objects.filter(
+            articulo_id=articulo_id).values_list('archivo', 'miniatura'):
+        names.update((archivo, miniatura))
+    post = Post.objects.filter(pk=articulo_id).values(
+        'imagen_portada', 'portada_variantes').first()
+    if post is not None:
+        names.add(post['imagen_portada'])
+        names.update(cover_files(post['portada_variantes']))
+    return names
+
+
+def unregister_media(names, articulo_id):
+    """
+    Deja de servir `names` con la visibilidad del artículo, salvo los que
+    este sigue usando (el mismo blob en otro de sus contenidos).
+    """
+    names = {name for name in names if name} - media_in_use(articulo_id)
+    if names:
+        ArchivoMedia.objects.filter(articulo_id=articulo_id, nombre__in=names).delete()
+
+
+def move_media(names, from_id, to_id):
+    """Pasa `names` del artículo `from_id` a `to_id` conservando hash y tamaño."""
+    names = [name for name in names if name]
+    records = {record.pop('nombre'): record for record in ArchivoMedia.objects.filter(
+        articulo_id=from_id, nombre__in=names).values(
+        'nombre', 'sha256', 'tamano', 'content_type')}
+    for name in names:
+        register_media(name, to_id, **records.get(name, {}))
+    unregister_media(names, from_id)
+
+
+def register_media_file(name, articulo_id, content_type=None, storage=default_storage):
+    """
+    register_media leyendo del almacenamiento el hash y el tamaño; los
+    blobs ya llevan el hash en el nombre.
+    """
+    register_media(
+        name, articulo_id, sha256=blob_sha256(name) or file_sha256(name, storage),
+        tamano=storage.size(name),
+        content_type=content_type or mimetypes.guess_type(name)[0] or '')
+
+
+def can_encode(variant_format):
+    Image.init()
+    return VARIANT_FORMATS.get(variant_format) in Image.SAVE
+
+
+def get_cover_widths():
+    return sorted(getattr(settings, 'POST_COVER_WIDTHS', (320, 640, 960, 1280)))
+
+
+def get_cover_formats():
+    """Formatos de POST_COVER_FORMATS que esta instalación de Pillow sabe escribir."""
+    return [variant_format
+            for variant_format in getattr(settings, 'POST_COVER_FORMATS', ('avif', 'webp'))
+            if can_encode(variant_format)]
+
+
+def cover_variant_name(original, width, variant_format):
+    """Ruta determinista de una variante: la misma portada da las mismas rutas."""
+    stem = os.path.splitext(os.path.basename(original))[0]
+    digest = hashlib.sha1(original.encode()).hexdigest()[:12]
+    return f'{COVER_VARIANTS_DIR}/{digest}/{stem}-{width}w.{variant_format}'
+
+
+def render_cover_variants(name, widths=None, formats=None, quality=None):
+    """
+    Genera las variantes de la portada `name` en cada ancho y formato y las
+    guarda junto a ella. Devuelve {formato: {ancho: ruta}} y la lista de
+    archivos guardados [(ruta, sha256, tamaño, content_type)]. No amplía la
+    imagen: los anchos mayores que el original se sustituyen por el ancho
+    original. Solo usa el almacenamiento y Pillow, así que se puede
+    ejecutar en un pool de procesos.
+    """
+    widths = widths or get_cover_widths()
+    formats = formats if formats is not None else get_cover_formats()
+    quality = quality or getattr(settings, 'POST_COVER_QUALITY', 80)
+
+    with default_storage.open(name, 'rb') as original:
+        image = Image.open(original)
+        image.load()
+    image = ImageOps.exif_transpose(image)
+    if image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA' if 'A' in image.getbands() else 'RGB')
+
+    targets = sorted({width for width in widths if width < image.width}
+                     | {min(image.width, max(widths))})
+    variants = {variant_format: {} for variant_format in formats}
+    files = []
+    # De mayor a menor, reduciendo cada vez desde la anterior
+    source = image
+    for width in reversed(targets):
+        height = max(1, round(image.height * width / image.width))
+        if source.size != (width, height):
+            source = source.resize((width, height), Image.Resampling.LANCZOS,
+                                   reducing_gap=3.0)
+        for variant_format in formats:
+            frame = source
+            if variant_format == 'jpeg' and frame.mode == 'RGBA':
+                frame = frame.convert('RGB')
+            output = BytesIO()
+            frame.save(output, VARIANT_FORMATS[variant_format], quality=quality)
+            path = cover_variant_name(name, width, variant_format)
+            if default_storage.exists(path):
+                default_storage.delete(path)
+            data = output.getvalue()
+            path = default_storage.save(path, ContentFile(data))
+            variants[variant_format][str(width)] = path
+            files.append((path, hashlib.sha256(data).hexdigest(), len(data),
+                          Image.MIME.get(VARIANT_FORMATS[variant_format], f'image/{variant_format}')))
+    return variants, files
+
+
+def get_srcset(variants, build_url):
+    """{formato: 'url 320w, url 640w'} a partir de Post.portada_variantes."""
+    return {
+        variant_format: ', '.join(
+            f'{build_url(default_storage.url(path))} {width}w'
+            for width, path in sorted(by_width.items(), key=lambda item: int(item[0])))
+        for variant_format, by_width in variants.items()
+    }
@@ -1 +1,7 @@
-from ..models import *
+from .categoria import Categoria
+from .post import Post
+from .contenido_multimedia import ContenidoMultimedia
+from .search import PostSearchTerm
+from .subida import SubidaMultimedia
+from .archivo_media import ArchivoMedia
+from .blob_media import BlobMedia
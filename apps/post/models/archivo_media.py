@@ -0,0 +1,30 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+from .post import Post
+
+
+class ArchivoMedia(models.Model):
+    """
+    Archivo del almacenamiento de medios y artículo al que pertenece: la
+    vista de medios (apps.post.views.media_view) lo usa para aplicar la
+    visibilidad del artículo y como ETag fuerte (sha256 del contenido).
+    """
+    nombre = models.CharField(max_length=255)
+    articulo = models.ForeignKey(
+        Post, on_delete=models.CASCADE, related_name='archivos')
+    # Vacíos hasta que el trabajo de procesamiento lee el archivo
+    sha256 = models.CharField(max_length=64, blank=True, default='')
+    tamano = models.PositiveBigIntegerField(null=True, blank=True)
+    content_type = models.CharField(max_length=100, blank=True, default='')
+    created_date = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = _('Archivo de medios')
+        verbose_name_plural = _('Archivos de medios')
+        constraints = [
+            models.UniqueConstraint(fields=['nombre', 'articulo'],
+                                    name='post_archivo_media_unico'),
+        ]
+
+    def __str__(self):
+        return self.nombre
@@ -0,0 +1,29 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+class BlobMedia(models.Model):
+    """
+    Contenido único del almacenamiento direccionado por contenido
+    (apps.post.storage) y cuántos ContenidoMultimedia.archivo y
+    Post.imagen_portada lo usan. Los que quedan sin referencias los borra
+    `manage.py collect_blobs` pasado un margen.
+    """
+    nombre = models.CharField(max_length=255, unique=True)
+    sha256 = models.CharField(max_length=64, db_index=True)
+    tamano = models.PositiveBigIntegerField(null=True, blank=True)
+    referencias = models.PositiveIntegerField(default=0)
+    created_date = models.DateTimeField(auto_now_add=True)
+    # Último cambio de referencias: el margen de collect_blobs cuenta desde aquí
+    updated_date = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = _('Blob de medios')
+        verbose_name_plural = _('Blobs de medios')
+        indexes = [
+            models.Index(fields=['updated_date'], condition=models.Q(referencias=0),
+                         name='post_blob_huerfano_idx'),
+        ]
+
+    def __str__(self):
+        return self.nombre
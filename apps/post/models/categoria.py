@@ -1,10 +1,10 @@
 from django.db import models
-from apps.core.models import AuditableMixins
+from apps.core.models import AuditableMixins, ManagedFieldsMixin
 from django.utils.translation import gettext_lazy as _
 from django.core.exceptions import ValidationError
 
 
-class Categoria(AuditableMixins, models.Model):
+class Categoria(ManagedFieldsMixin, AuditableMixins, models.Model):
     name = models.CharField(
         verbose_name=_('Category name'),
         max_length=100,
@@ -13,6 +13,11 @@ class Categoria(AuditableMixins, models.Model):
         null=False
     )
     is_active = models.BooleanField(default=True)
+    # Artículos publicados y activos, mantenidos por apps.post.counters
+    num_publicados = models.PositiveIntegerField(default=0, editable=False)
+    ultima_publicacion = models.DateTimeField(null=True, blank=True, editable=False)
+
+    managed_fields = ('num_publicados', 'ultima_publicacion')
 
     class Meta:
         verbose_name = _('Category')
@@ -1,23 +1,82 @@
 from django.utils.translation import gettext_lazy as _
 from django.db import models
+from apps.core.models import AuditableMixins
+from apps.post.storage import get_blob_storage
 from .post import Post
 
 
-class ContenidoMultimedia(models.Model):
+class ContenidoMultimedia(AuditableMixins, models.Model):
     TIPO_CONTENIDO = (
         ('imagen', 'Imagen'),
         ('video', 'Video')
     )
+    # Estado del procesamiento en segundo plano del archivo (apps.post.tasks)
+    ESTADOS_PROCESAMIENTO = (
+        ('pendiente', _('Pendiente')),
+        ('procesando', _('Procesando')),
+        ('listo', _('Listo')),
+        ('error', _('Error')),
+    )
 
     articulo = models.ForeignKey(
         Post,
         on_delete=models.CASCADE,
         related_name='multimedia'
     )
-    archivo = models.FileField(upload_to='articulos/media/%Y/%m/%d/')
+    # Direccionado por contenido: el mismo archivo se guarda una sola vez
+    archivo = models.FileField(upload_to='articulos/media/%Y/%m/%d/',
+                               storage=get_blob_storage)
     tipo = models.CharField(max_length=20, choices=[
                             ('imagen', 'Imagen'), ('video', 'Video')])
     descripcion = models.CharField(max_length=200, blank=True)
+    estado_procesamiento = models.CharField(
+        max_length=10,
+        choices=ESTADOS_PROCESAMIENTO,
+        default='pendiente',
+        editable=False
+    )
+    error_procesamiento = models.CharField(
+        max_length=255, blank=True, default='', editable=False)
+    # Tipo MIME detectado por el contenido, no por la extensión
+    mime_type = models.CharField(
+        max_length=100, blank=True, default='', editable=False)
+    # Imagen: ancho, alto, formato. Video: duración, ancho, alto, códec...
+    metadatos = models.JSONField(default=dict, blank=True, editable=False)
+    miniatura = models.ImageField(
+        upload_to='articulos/media/miniaturas/%Y/%m/%d/',
+        blank=True,
+        null=True,
+        editable=False
+    )
 
     class Meta:
         verbose_name = _('Contenido Multimedia')
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    def archivo_changed(self):
+        loaded = getattr(self, '_loaded_values', {})
+        return self._state.adding or loaded.get('archivo') != self.archivo.name
+
+    def articulo_changed(self):
+        loaded = getattr(self, '_loaded_values', {})
+        return not self._state.adding and loaded.get('articulo_id', self.articulo_id) != self.articulo_id
+
+    def save(self, *args, **kwargs):
+        # Un archivo nuevo se vuelve a procesar y uno movido de artículo
+        # cambia de visibilidad (señales post_save)
+        self._needs_processing = self.archivo_changed()
+        self._articulo_changed = self.articulo_changed()
+        if self._needs_processing:
+            self.estado_procesamiento = 'pendiente'
+            self.error_procesamiento = ''
+            self.mime_type = ''
+            self.metadatos = {}
+            self.miniatura = None
+        super().save(*args, **kwargs)
+        self._loaded_values = {'archivo': self.archivo.name, 'articulo_id': self.articulo_id,
+                               'miniatura': self.miniatura.name}
@@ -1,14 +1,46 @@
-from django.db import models
+from django.db import models, router, transaction
+from django.db.models.fields.files import FieldFile
+from django.db.models import F, Q
+from django.db.models.functions import TruncDate
 from datetime import timezone
 from django.utils.text import slugify
 from django.utils.translation import gettext_lazy as _
 from django.core.validators import FileExtensionValidator
 from django.core.exceptions import ValidationError
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
+from apps.core.db import is_postgresql
 from apps.core.models import AuditableMixins
+from apps.core.text import normalize_text
+from apps.post.storage import get_blob_storage
+from apps.post.rendering import (
+    content_hash, get_markdown_config, get_renderer_version, render_markdown
+)
 from apps.users.models import User
 from .categoria import Categoria
 
 
+# Orden de los listados: más recientes primero, sin fecha al final e id para
+# desempatar (el mismo que usa KeysetPagination)
+POST_ORDERING = (F('fecha_publicacion').desc(nulls_last=True), F('id').desc())
+PUBLICADOS = Q(estado='publicado', is_active=True)
+
+
+def listing_index(*prefix, name, condition=None):
+    """
+    Índice con las columnas `prefix` seguidas del orden de los listados, para
+    que filtro + ORDER BY + LIMIT se resuelvan recorriendo el índice.
+    """
+    if is_postgresql():
+        order = POST_ORDERING
+    else:
+        # CREATE INDEX no admite NULLS LAST fuera de PostgreSQL; en SQLite
+        # los nulos ya quedan al final en orden descendente
+        order = (F('fecha_publicacion').desc(), F('id').desc())
+    return models.Index(*[F(field) for field in prefix], *order,
+                        name=name, condition=condition)
+
+
 class Post(AuditableMixins, models.Model):
     ESTADOS = (
         ('borrador', _('Borrador')),
@@ -40,8 +72,18 @@ class Post(AuditableMixins, models.Model):
         verbose_name=_('Contenido'),
         help_text=_('Formato Markdown recomendado')
     )
+    # HTML renderizado de `contenido` y hash (contenido + versión del
+    # renderizador) con el que se generó
+    contenido_html = models.TextField(blank=True, default='', editable=False)
+    contenido_html_hash = models.CharField(
+        max_length=64,
+        blank=True,
+        default='',
+        editable=False
+    )
     imagen_portada = models.ImageField(
         upload_to='articulos/portadas/%Y/%m/%d/',
+        storage=get_blob_storage,
         blank=True,
         null=True,
         validators=[
@@ -49,6 +91,10 @@ class Post(AuditableMixins, models.Model):
                                    'jpg', 'jpeg', 'png', 'webp']),
         ]
     )
+    # Variantes redimensionadas de la portada: formato -> ancho -> ruta
+    # (apps.post.media.render_cover_variants, en segundo plano)
+    portada_variantes = models.JSONField(
+        default=dict, blank=True, editable=False)
     estado = models.CharField(
         max_length=10,
         choices=ESTADOS,
@@ -56,8 +102,7 @@ class Post(AuditableMixins, models.Model):
     )
     fecha_publicacion = models.DateTimeField(
         null=True,
-        blank=True,
-        db_index=True
+        blank=True
     )
     palabras_clave = models.CharField(
         max_length=250,
@@ -65,11 +110,44 @@ class Post(AuditableMixins, models.Model):
         help_text=_('Palabras separadas por comas')
     )
     is_active = models.BooleanField(default=True)
+    # Nombre del autor normalizado (minúsculas, sin acentos) para filtrar
+    # sin join con users_user
+    autor_nombre = models.CharField(
+        max_length=511,
+        blank=True,
+        default='',
+        editable=False
+    )
+    # Índice de búsqueda de texto completo (PostgreSQL), mantenido al guardar
+    search_vector = SearchVectorField(null=True, editable=False)
 
     class Meta:
         verbose_name = _('Artículo')
         verbose_name_plural = _('Artículos')
-        ordering = ['-fecha_publicacion']
+        ordering = POST_ORDERING
+        indexes = [
+            # Lectores: publicados y activos, con o sin filtro de categoría
+            listing_index(name='post_publicado_fecha_idx', condition=PUBLICADOS),
+            listing_index('category', name='post_publicado_categoria_idx',
+                          condition=PUBLICADOS),
+            # Escritores: sus artículos activos
+            listing_index('autor', name='post_autor_activo_fecha_idx',
+                          condition=Q(is_active=True)),
+            # Staff: todos los artículos (sustituye al db_index de la fecha)
+            listing_index(name='post_fecha_idx'),
+        ] + ([
+            # Filtro ?fecha_publicacion=YYYY-MM-DD (fecha_publicacion__date)
+            models.Index(TruncDate('fecha_publicacion'), name='post_fecha_dia_idx'),
+            GinIndex(fields=['search_vector'], name='post_search_vector_gin'),
+            # Búsqueda por subcadena (LIKE '%x%') y por prefijo (LIKE 'x%')
+            GinIndex(fields=['autor_nombre'], opclasses=['gin_trgm_ops'],
+                     name='post_autor_nombre_trgm'),
+            models.Index(fields=['autor_nombre'], opclasses=['varchar_pattern_ops'],
+                         name='post_autor_nombre_prefix'),
+        ] if is_postgresql() else [
+            models.Index(fields=['autor_nombre'],
+                         name='post_autor_nombre_prefix'),
+        ])
         permissions = [
             ('can_publish', 'Puede publicar artículos'),
             ('can_edit_all', 'Puede editar cualquier artículo'),
@@ -78,6 +156,13 @@ class Post(AuditableMixins, models.Model):
     def __str__(self):
         return self.titulo
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Valores leídos de la BD, para detectar cambios al guardar
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
     def clean(self):
         super().clean()
 
@@ -95,7 +180,55 @@ class Post(AuditableMixins, models.Model):
                     'imagen_portada': _('La imagen no puede superar los 2MB')
                 })
 
-    def save(self, *args, **kwargs):
+    def sync_autor_nombre(self):
+        loaded = getattr(self, '_loaded_values', {})
+        if not self.autor_nombre or loaded.get('autor_id') != self.autor_id:
+            self.autor_nombre = normalize_text(
+                f'{self.autor.first_name} {self.autor.last_name}')
+
+    def render_contenido(self):
+        config = get_markdown_config()
+        digest = content_hash(self.contenido, get_renderer_version(config))
+        if digest != self.contenido_html_hash:
+            self.contenido_html = render_markdown(self.contenido, config)
+            self.contenido_html_hash = digest
+
+    def prepare_save(self):
+        """
+        Calcula los campos derivados antes de escribir. Lo llama save() y
+        también las operaciones masivas (bulk_create/bulk_update), que no
+        pasan por save().
+        """
         if not self.slug:
             self.slug = slugify(self.titulo, allow_unicode=True)
-        super().save(*args, **kwargs)
+        self.sync_autor_nombre()
+        self.render_contenido()
+
+    def imagen_portada_changed(self):
+        loaded = getattr(self, '_loaded_values', {})
+        if self._state.adding:
+            return True
+        if 'imagen_portada' not in loaded:  # leída con only()/defer()
+            return False
+        previous = loaded['imagen_portada']
+        return (getattr(previous, 'name', previous) or '') != (self.imagen_portada.name or '')
+
+    def save(self, *args, **kwargs):
+        self.prepare_save()
+        # Una portada nueva invalida sus variantes (señal post_save)
+        self._portada_changed = self.imagen_portada_changed()
+        if self._portada_changed:
+            self.portada_variantes = {}
+        # Las señales post_save (contadores de categoría y autor) se
+        # escriben en la misma transacción que el artículo
+        using = kwargs.get('using') or router.db_for_write(Post, instance=self)
+        with transaction.atomic(using=using):
+            super().save(*args, **kwargs)
+        self._loaded_values = {
+            field.attname: getattr(self, field.attname)
+            for field in self._meta.concrete_fields
+            if field.attname in self.__dict__
+        }
+        # Los archivos por nombre: el FieldFile se modifica al guardar otro
+        if isinstance(self._loaded_values.get('imagen_portada'), FieldFile):
+            self._loaded_values['imagen_portada'] = self.imagen_portada.name
@@ -0,0 +1,25 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+from .post import Post
+
+
+class PostSearchTerm(models.Model):
+    """
+    Índice invertido término -> artículo, usado cuando la base de datos no es
+    PostgreSQL (p. ej. SQLite en tests). El peso acumula la ponderación del
+    campo donde aparece el término (titulo > summary > contenido > palabras_clave).
+    """
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='search_terms'
+    )
+    term = models.CharField(max_length=64)
+    weight = models.FloatField(default=0)
+
+    class Meta:
+        verbose_name = _('Término de búsqueda')
+        unique_together = [('post', 'term')]
+        indexes = [
+            models.Index(fields=['term', 'post'], name='post_search_term_idx'),
+        ]
@@ -0,0 +1,41 @@
+import uuid
+
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+from apps.users.models import User
+from .contenido_multimedia import ContenidoMultimedia
+from .post import Post
+
+
+class SubidaMultimedia(models.Model):
+    """
+    Subida por partes, reanudable, de un ContenidoMultimedia (videos
+    grandes). Cada parte se guarda como un objeto del almacenamiento;
+    al completar se concatenan en el archivo final y se verifica el sha256.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    usuario = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name='subidas')
+    articulo = models.ForeignKey(
+        Post, on_delete=models.CASCADE, related_name='subidas')
+    tipo = models.CharField(
+        max_length=20, choices=ContenidoMultimedia.TIPO_CONTENIDO)
+    descripcion = models.CharField(max_length=200, blank=True)
+    nombre = models.CharField(max_length=255)
+    tamano = models.PositiveBigIntegerField()
+    sha256 = models.CharField(max_length=64)
+    # Bytes recibidos: el cliente reanuda desde aquí
+    offset = models.PositiveBigIntegerField(default=0)
+    # [[offset, tamaño, nombre en el almacenamiento], ...] en orden
+    partes = models.JSONField(default=list, blank=True)
+    created_date = models.DateTimeField(auto_now_add=True)
+    updated_date = models.DateTimeField(auto_now=True)
+    expira = models.DateTimeField()
+
+    class Meta:
+        verbose_name = _('Subida de multimedia')
+        verbose_name_plural = _('Subidas de multimedia')
+        indexes = [models.Index(fields=['expira'], name='post_subida_expira_idx')]
+
+    def __str__(self):
+        return f'{self.nombre} ({self.offset}/{self.tamano})'
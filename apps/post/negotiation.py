@@ -0,0 +1,15 @@
+from rest_framework.negotiation import DefaultContentNegotiation
+
+from apps.post.rendering import CONTENT_FORMATS
+
+
+class ContentFormatNegotiation(DefaultContentNegotiation):
+    """
+    En los artículos `?format=html|markdown` indica el formato de `contenido`,
+    no el renderer de la respuesta, que se negocia con la cabecera Accept.
+    """
+
+    def filter_renderers(self, renderers, format):
+        if format in CONTENT_FORMATS:
+            return renderers
+        return super().filter_renderers(renderers, format)
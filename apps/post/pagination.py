@@ -1,5 +1,17 @@
-from rest_framework.pagination import PageNumberPagination
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.paginator import InvalidPage
+from django.db import connections
+from django.db.models import F, Q
+from django.utils.dateparse import parse_datetime
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
 from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
 
 
 class StandardResultsSetPagination(PageNumberPagination):
@@ -7,6 +19,22 @@ class StandardResultsSetPagination(PageNumberPagination):
     page_size_query_param = 'page_size'  # Permite cambiar el tamaño desde la URL
     max_page_size = 100  # Máximo permitido
 
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """paginate_queryset con el ORM async (COUNT y lectura sin hilos)."""
+        self.request = request
+        paginator = self.django_paginator_class(
+            queryset, self.get_page_size(request))
+        # cached_property: se rellena antes de que Paginator lo calcule
+        paginator.count = await queryset.acount()
+        page_number = self.get_page_number(request, paginator)
+        try:
+            self.page = paginator.page(page_number)
+        except InvalidPage as exc:
+            raise NotFound(self.invalid_page_message.format(
+                page_number=page_number, message=str(exc)))
+        self.page.object_list = [obj async for obj in self.page.object_list]
+        return list(self.page)
+
     def get_paginated_response(self, data):
         return Response({
             'next': self.get_next_link(),
@@ -17,3 +45,210 @@ class StandardResultsSetPagination(PageNumberPagination):
             'current_page': self.page.number,
             'total_pages': self.page.paginator.num_pages,
         })
+
+
+class KeysetPagination(BasePagination):
+    """
+    Paginación por cursor (keyset) sobre (fecha_publicacion, id).
+
+    Cada página filtra a partir de la última fila vista en lugar de usar
+    OFFSET, por lo que el coste es constante a cualquier profundidad. El
+    conteo total es opcional: 'none', 'approx' (estimación del planner en
+    PostgreSQL) o 'exact'.
+    """
+    page_size = 10
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    count_query_param = 'count'
+    count_modes = ('none', 'approx', 'exact')
+    date_field = 'fecha_publicacion'
+    invalid_cursor_message = _('Cursor inválido')
+
+    def paginate_queryset(self, queryset, request, view=None):
+        page = self.get_page_queryset(queryset, request)
+        self.count = self.get_count(queryset, request)
+        return self.set_page(list(page))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """paginate_queryset con el ORM async."""
+        page = self.get_page_queryset(queryset, request)
+        self.count = await self.aget_count(queryset, request)
+        return self.set_page([obj async for obj in page])
+
+    def get_page_queryset(self, queryset, request):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        self.cursor = self.decode_cursor(request)
+
+        if self.cursor is not None:
+            queryset = queryset.filter(self.get_position_filter(self.cursor))
+        queryset = queryset.order_by(*self.get_ordering(self.is_reverse()))
+        # Se pide una fila extra para saber si hay más resultados
+        return queryset[:self.page_size + 1]
+
+    def is_reverse(self):
+        return bool(self.cursor and self.cursor['r'])
+
+    def set_page(self, results):
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+
+        if self.is_reverse():
+            results.reverse()
+            self.has_previous = has_more
+            self.has_next = True
+        else:
+            self.has_next = has_more
+            self.has_previous = self.cursor is not None
+
+        self.page = results
+        return results
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'count': self.count,
+            'results': data,
+            'page_size': self.page_size,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'count': {'type': 'integer', 'nullable': True},
+                'results': schema,
+                'page_size': {'type': 'integer'},
+            },
+        }
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_ordering(self, reverse=False):
+        date = F(self.date_field)
+        if reverse:
+            return [date.asc(nulls_first=True), 'id']
+        return [date.desc(nulls_last=True), '-id']
+
+    def get_position_filter(self, cursor):
+        date, pk = cursor['d'], cursor['i']
+        is_null = Q(**{f'{self.date_field}__isnull': True})
+
+        if cursor['r']:
+            # Filas anteriores al cursor en el orden descendente
+            if date is None:
+                return ~is_null | (is_null & Q(id__gt=pk))
+            return (Q(**{f'{self.date_field}__gt': date}) |
+                    Q(**{self.date_field: date, 'id__gt': pk}))
+
+        # Filas posteriores al cursor (las fechas nulas van al final)
+        if date is None:
+            return is_null & Q(id__lt=pk)
+        return (Q(**{f'{self.date_field}__lt': date}) |
+                Q(**{self.date_field: date, 'id__lt': pk}) |
+                is_null)
+
+    def get_count_mode(self, queryset, request):
+        mode = request.query_params.get(
+            self.count_query_param,
+            getattr(settings, 'POST_PAGINATION_COUNT', 'none'))
+        if mode not in self.count_modes or mode == 'none':
+            return None
+        if mode == 'approx' and connections[queryset.db].vendor != 'postgresql':
+            return 'exact'
+        return mode
+
+    def get_count(self, queryset, request):
+        mode = self.get_count_mode(queryset, request)
+        if mode == 'approx':
+            return self.get_approximate_count(queryset)
+        return queryset.count() if mode == 'exact' else None
+
+    async def aget_count(self, queryset, request):
+        mode = self.get_count_mode(queryset, request)
+        if mode == 'approx':
+            # EXPLAIN no tiene variante async
+            return await sync_to_async(self.get_approximate_count)(queryset)
+        return await queryset.acount() if mode == 'exact' else None
+
+    def get_approximate_count(self, queryset):
+        # Estimación de filas del planner, sin recorrer la tabla
+        plan = json.loads(queryset.order_by().explain(format='json'))
+        return int(plan[0]['Plan']['Plan Rows'])
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            padding = '=' * (-len(encoded) % 4)
+            data = json.loads(urlsafe_b64decode(encoded + padding))
+            cursor = {'d': data['d'], 'i': int(data['i']),
+                      'r': bool(data.get('r'))}
+            if cursor['d'] is not None:
+                cursor['d'] = parse_datetime(cursor['d'])
+                if cursor['d'] is None:
+                    raise ValueError
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+        return cursor
+
+    def encode_cursor(self, instance, reverse):
+        date = getattr(instance, self.date_field)
+        data = {
+            'd': date.isoformat() if date is not None else None,
+            'i': instance.pk,
+        }
+        if reverse:
+            data['r'] = 1
+        encoded = urlsafe_b64encode(
+            json.dumps(data, separators=(',', ':')).encode()).decode().rstrip('=')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+
+PAGINATION_CLASSES = {
+    'page': StandardResultsSetPagination,
+    'cursor': KeysetPagination,
+}
+
+
+def get_post_pagination_class(request):
+    """
+    Selecciona la paginación de artículos: `?pagination=page|cursor` en la
+    petición, o `POST_PAGINATION_MODE` en settings. Un `?cursor=` presente
+    implica el modo cursor para que los enlaces next/previous sigan funcionando.
+    """
+    default = getattr(settings, 'POST_PAGINATION_MODE', 'page')
+    if request is None:
+        return PAGINATION_CLASSES.get(default, StandardResultsSetPagination)
+
+    params = request.query_params
+    mode = params.get('pagination')
+    if mode not in PAGINATION_CLASSES:
+        mode = 'cursor' if params.get(KeysetPagination.cursor_query_param) else default
+    return PAGINATION_CLASSES.get(mode, StandardResultsSetPagination)
@@ -1,6 +1,24 @@
 from rest_framework import permissions
+from apps.post.models.post import Post
 
 
 class IsWriter(permissions.BasePermission):
     def has_permission(self, request, view):
         return request.user and request.user.is_authenticated and request.user.is_writer
+
+
+def get_visible_posts(user):
+    """Artículos que puede ver `user` (compartido por las vistas sync y async)."""
+    if not user.is_authenticated:
+        return Post.objects.none()
+
+    # Admin puede ver todo
+    if user.is_superuser or user.is_staff:
+        return Post.objects.all()
+
+    # Escritor solo ve sus artículos
+    if user.is_writer:
+        return Post.objects.filter(autor=user, is_active=True)
+
+    # Usuario común solo ve artículos publicados
+    return Post.objects.filter(estado='publicado', is_active=True)
@@ -0,0 +1,63 @@
+import hashlib
+import json
+
+import markdown
+from django.conf import settings
+from markdownx.settings import (
+    MARKDOWNX_MARKDOWN_EXTENSION_CONFIGS,
+    MARKDOWNX_MARKDOWN_EXTENSIONS,
+)
+
+# Formatos de `contenido` que acepta el detalle de artículo (?format=)
+CONTENT_FORMATS = ('markdown', 'html')
+
+
+def get_markdown_config():
+    # Misma configuración que la vista previa del editor de markdownx
+    return {
+        'extensions': list(MARKDOWNX_MARKDOWN_EXTENSIONS),
+        'extension_configs': dict(MARKDOWNX_MARKDOWN_EXTENSION_CONFIGS),
+    }
+
+
+def get_renderer_version(config=None):
+    """
+    Identifica la configuración del renderizador. Cambia al modificar
+    POST_MARKDOWN_RENDERER_VERSION, las extensiones o la versión de Markdown,
+    lo que invalida todos los HTML guardados.
+    """
+    raw = json.dumps({
+        'version': getattr(settings, 'POST_MARKDOWN_RENDERER_VERSION', 1),
+        'markdown': markdown.__version__,
+        'config': config or get_markdown_config(),
+    }, sort_keys=True, default=str)
+    return hashlib.sha1(raw.encode()).hexdigest()[:12]
+
+
+def content_hash(contenido, renderer_version):
+    raw = f'{renderer_version}\n{contenido or ""}'
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def render_markdown(contenido, config):
+    return markdown.markdown(contenido or '', **config)
+
+
+def render_batch(items, config, renderer_version):
+    """
+    Renderiza [(pk, contenido), ...] -> [(pk, html, hash), ...]. No usa Django,
+    para poder ejecutarse en un pool de procesos.
+    """
+    return [
+        (pk, render_markdown(contenido, config),
+         content_hash(contenido, renderer_version))
+        for pk, contenido in items
+    ]
+
+
+def get_contenido_html(post):
+    """HTML guardado del artículo, o renderizado al vuelo si está desfasado."""
+    config = get_markdown_config()
+    if post.contenido_html_hash == content_hash(post.contenido, get_renderer_version(config)):
+        return post.contenido_html
+    return render_markdown(post.contenido, config)
@@ -0,0 +1,126 @@
+import math
+from collections import defaultdict
+
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import router, transaction
+from django.db.models import Count, F, Sum
+
+from apps.core.db import is_postgresql
+from apps.core.text import tokenize
+from apps.post.models.post import Post
+from apps.post.models.search import PostSearchTerm
+
+# Campo -> peso de PostgreSQL (A > B > C > D)
+SEARCH_FIELDS = (
+    ('titulo', 'A'),
+    ('summary', 'B'),
+    ('contenido', 'C'),
+    ('palabras_clave', 'D'),
+)
+# Mismos pesos que usa ts_rank por defecto
+WEIGHTS = {'A': 1.0, 'B': 0.4, 'C': 0.2, 'D': 0.1}
+
+STOPWORDS = frozenset((
+    'a', 'al', 'con', 'de', 'del', 'el', 'en', 'es', 'la', 'las', 'lo',
+    'los', 'o', 'para', 'por', 'que', 'se', 'su', 'un', 'una', 'y',
+    'the', 'and', 'of', 'to', 'in', 'is',
+))
+MAX_TERM_LENGTH = PostSearchTerm._meta.get_field('term').max_length
+
+
+def get_search_config():
+    return getattr(settings, 'POST_SEARCH_CONFIG', 'spanish')
+
+
+def uses_search_vector(using=None):
+    return is_postgresql(using or router.db_for_write(Post))
+
+
+def build_search_vector():
+    config = get_search_config()
+    vector = None
+    for field, weight in SEARCH_FIELDS:
+        part = SearchVector(field, weight=weight, config=config)
+        vector = part if vector is None else vector + part
+    return vector
+
+
+def search_terms(value):
+    return [
+        term[:MAX_TERM_LENGTH] for term in tokenize(value)
+        if len(term) > 1 and term not in STOPWORDS
+    ]
+
+
+def extract_terms(values):
+    """
+    Pesos de cada término para un artículo. `values` es un dict con los
+    campos de SEARCH_FIELDS. Las repeticiones suman de forma logarítmica.
+    """
+    counts = defaultdict(lambda: defaultdict(int))
+    for field, weight in SEARCH_FIELDS:
+        for term in search_terms(values.get(field)):
+            counts[term][weight] += 1
+    return {
+        term: sum(WEIGHTS[weight] * (1 + math.log(count))
+                  for weight, count in by_weight.items())
+        for term, by_weight in counts.items()
+    }
+
+
+def index_posts(post_ids, using=None):
+    """Recalcula el índice de búsqueda de los artículos indicados."""
+    post_ids = list(post_ids)
+    if not post_ids:
+        return
+    using = using or router.db_for_write(Post)
+
+    if uses_search_vector(using):
+        Post.objects.using(using).filter(pk__in=post_ids).update(
+            search_vector=build_search_vector())
+        return
+
+    fields = [field for field, _ in SEARCH_FIELDS]
+    rows = Post.objects.using(using).filter(
+        pk__in=post_ids).values('pk', *fields)
+    terms = [
+        PostSearchTerm(post_id=row['pk'], term=term, weight=weight)
+        for row in rows
+        for term, weight in extract_terms(row).items()
+    ]
+    with transaction.atomic(using=using):
+        PostSearchTerm.objects.using(using).filter(post_id__in=post_ids).delete()
+        PostSearchTerm.objects.using(using).bulk_create(terms, batch_size=1000)
+
+
+def search_changed(instance):
+    """Indica si un guardado modificó algún campo indexado."""
+    loaded = getattr(instance, '_loaded_values', None)
+    if loaded is None:
+        return True
+    return any(
+        field not in loaded or loaded[field] != getattr(instance, field)
+        for field, _ in SEARCH_FIELDS
+    )
+
+
+def search_posts(queryset, query):
+    """
+    Filtra `queryset` por los artículos que contienen todos los términos de
+    `query` y los ordena por relevancia (anotación `rank`).
+    """
+    if uses_search_vector(queryset.db):
+        search_query = SearchQuery(
+            query, config=get_search_config(), search_type='websearch')
+        return queryset.filter(search_vector=search_query).annotate(
+            rank=SearchRank(F('search_vector'), search_query)
+        ).order_by('-rank', '-id')
+
+    terms = set(search_terms(query))
+    if not terms:
+        return queryset.none()
+    return queryset.filter(search_terms__term__in=terms).annotate(
+        rank=Sum('search_terms__weight'),
+        matched_terms=Count('search_terms__term', distinct=True),
+    ).filter(matched_terms=len(terms)).order_by('-rank', '-id')
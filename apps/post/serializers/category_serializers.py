@@ -1,12 +1,14 @@
 from rest_framework import serializers
 from apps.core.serializers.base_serializer import AuditableSerializerMixin
+from apps.post.catalog import get_catalog
 from apps.post.models.categoria import Categoria
 
 
 class CategoriaListSerializer(AuditableSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Categoria
-        fields = ['id', 'name', 'created_date', 'created_by']
+        fields = ['id', 'name', 'created_date', 'created_by',
+                  'num_publicados', 'ultima_publicacion']
         read_only_fields = fields
 
 
@@ -19,3 +21,49 @@ class CategoriaCreateUpdateSerializer(CategoriaListSerializer):
             raise serializers.ValidationError(
                 "El nombre no puede estar vacío.")
         return value.title()
+
+
+class CategoriaNombreField(serializers.ReadOnlyField):
+    """
+    Nombre de la categoría del artículo leído del catálogo en memoria: solo
+    necesita category_id, sin join. El catálogo se lee una vez por
+    serialización (en context['categorias'] si la vista ya lo trae).
+    """
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault('source', 'category_id')
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        categorias = self.context.get('categorias')
+        if categorias is None:
+            categorias = self.context['categorias'] = get_catalog().get_all()
+        categoria = categorias.get(value)
+        if categoria is None:
+            # Creada en otro proceso con sellos no compartidos
+            return Categoria.objects.filter(pk=value).values_list('name', flat=True).first()
+        return categoria.name
+
+
+class CategoriaCatalogField(serializers.PrimaryKeyRelatedField):
+    """
+    PrimaryKeyRelatedField de Categoria que valida contra el catálogo en
+    memoria. Solo consulta la base de datos si el id no está en él.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault('queryset', Categoria.objects.all())
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        if isinstance(data, bool):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        try:
+            categoria = get_catalog().get(int(data))
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        if categoria is None:
+            return super().to_internal_value(data)
+        instance = Categoria(**categoria._asdict())
+        instance._state.adding = False
+        return instance
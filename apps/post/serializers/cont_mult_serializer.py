@@ -6,8 +6,9 @@ from apps.core.serializers.base_serializer import AuditableSerializerMixin
 class MultimediaListSerializer(AuditableSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = ContenidoMultimedia
-        fields = ['id', 'tipo', 'archivo',
-                  'descripcion', 'created_by', 'created_date']
+        fields = ['id', 'tipo', 'archivo', 'descripcion',
+                  'estado_procesamiento', 'error_procesamiento', 'mime_type',
+                  'metadatos', 'miniatura', 'created_by', 'created_date']
         read_only_fields = fields
 
 
@@ -23,6 +24,7 @@ class MultimediaCreateUpdateSerializer(MultimediaListSerializer):
             'archivo',
             'tipo',
             'descripcion',
+            'estado_procesamiento',
             'created_by',
             'created_date',
         ]
@@ -1,9 +1,13 @@
 from rest_framework import serializers
 from apps.post.models.post import Post
 from apps.post.models.contenido_multimedia import ContenidoMultimedia
-from apps.post.models.categoria import Categoria
 from apps.users.models import User
 from apps.post.serializers.cont_mult_serializer import MultimediaListSerializer
+from apps.post.serializers.category_serializers import CategoriaCatalogField, CategoriaNombreField
+from apps.post.media import get_srcset
+from apps.post.rendering import get_contenido_html
+from apps.core.serializers.bulk_serializer import BulkListSerializer
+from apps.post.bulk import get_max_items
 
 
 class AutorInfoSerializer(serializers.ModelSerializer):
@@ -13,7 +17,7 @@ class AutorInfoSerializer(serializers.ModelSerializer):
 
 
 class PostListSerializer(serializers.ModelSerializer):
-    category = serializers.StringRelatedField()
+    category = CategoriaNombreField()
     autor = AutorInfoSerializer(read_only=True)
 
     class Meta:
@@ -30,10 +34,7 @@ class PostListSerializer(serializers.ModelSerializer):
 
 
 class PostCreateUpdateSerializer(serializers.ModelSerializer):
-    category = serializers.PrimaryKeyRelatedField(
-        queryset=Categoria.objects.all(),
-        # source='category'
-    )
+    category = CategoriaCatalogField()
 
     class Meta:
         model = Post
@@ -62,9 +63,61 @@ class PostCreateUpdateSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
+class PostBulkListSerializer(BulkListSerializer):
+    def validate_batch(self, items):
+        # Unicidad del título en una sola consulta para todo el lote
+        titulos = {}
+        errors = {}
+        for index, data in items:
+            titulo = data.get('titulo')
+            if titulo is None:
+                continue
+            if titulo in titulos:
+                errors[index] = {'titulo': ['Título repetido en la petición.']}
+            else:
+                titulos[titulo] = index
+
+        existing = dict(Post.objects.filter(
+            titulo__in=titulos).values_list('titulo', 'pk'))
+        for titulo, index in titulos.items():
+            instance = getattr(self, 'item_instances', {}).get(index)
+            if titulo in existing and (instance is None or existing[titulo] != instance.pk):
+                errors[index] = {'titulo': ['Ya existe un artículo con este título.']}
+        return errors
+
+
+class PostBulkSerializer(PostCreateUpdateSerializer):
+    """
+    Elemento de las operaciones masivas. La unicidad del título la comprueba
+    PostBulkListSerializer para todo el lote.
+    """
+    id = serializers.IntegerField(required=False)
+
+    class Meta(PostCreateUpdateSerializer.Meta):
+        fields = ['id'] + PostCreateUpdateSerializer.Meta.fields
+        list_serializer_class = PostBulkListSerializer
+        extra_kwargs = {'titulo': {'validators': []}}
+
+    def validate(self, attrs):
+        attrs.pop('id', None)
+        return super().validate(attrs)
+
+
+class PostBulkIdsSerializer(serializers.Serializer):
+    ids = serializers.ListField(child=serializers.IntegerField(), allow_empty=False)
+
+    def validate_ids(self, value):
+        max_items = get_max_items()
+        if len(value) > max_items:
+            raise serializers.ValidationError(
+                f'Se admiten como máximo {max_items} artículos por petición.')
+        return value
+
+
 class PostDetailSerializer(PostListSerializer):
     multimedia = MultimediaListSerializer(many=True, read_only=True)
     imagen_portada_url = serializers.SerializerMethodField()
+    imagen_portada_srcset = serializers.SerializerMethodField()
 
     class Meta(PostListSerializer.Meta):
         fields = PostListSerializer.Meta.fields + [
@@ -73,15 +126,36 @@ class PostDetailSerializer(PostListSerializer):
             'palabras_clave',
             'imagen_portada',
             'imagen_portada_url',
+            'imagen_portada_srcset',
             'multimedia',
             'slug',
             'created_date',
             'created_by',
             'updated_date',
         ]
+        # Columnas que usan los campos calculados (ver SparseFieldsetMixin)
+        projection_sources = {
+            'imagen_portada_url': ['imagen_portada'],
+            'imagen_portada_srcset': ['portada_variantes'],
+            'contenido': ['contenido', 'contenido_html', 'contenido_html_hash'],
+        }
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        # ?format=html devuelve el contenido ya renderizado
+        request = self.context.get('request')
+        if request and 'contenido' in data and request.query_params.get('format') == 'html':
+            data['contenido'] = get_contenido_html(instance)
+        return data
 
     def get_imagen_portada_url(self, obj):
         request = self.context.get('request')
         if obj.imagen_portada and hasattr(obj.imagen_portada, 'url'):
             return request.build_absolute_uri(obj.imagen_portada.url)
         return None
+
+    def get_imagen_portada_srcset(self, obj):
+        # {"webp": "https://.../portada-320w.webp 320w, ..."}; vacío
+        # mientras se generan las variantes
+        request = self.context.get('request')
+        return get_srcset(obj.portada_variantes or {}, request.build_absolute_uri)
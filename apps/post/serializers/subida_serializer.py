@@ -0,0 +1,35 @@
+import re
+
+from rest_framework import serializers
+from apps.post.models.subida import SubidaMultimedia
+from apps.post.uploads import get_chunk_size, get_max_size
+
+
+class SubidaSerializer(serializers.ModelSerializer):
+    chunk_size = serializers.SerializerMethodField()
+
+    class Meta:
+        model = SubidaMultimedia
+        fields = ['id', 'articulo', 'tipo', 'descripcion', 'nombre', 'tamano',
+                  'sha256', 'offset', 'chunk_size', 'expira']
+        read_only_fields = fields
+
+    def get_chunk_size(self, obj):
+        return get_chunk_size()
+
+
+class SubidaCreateSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = SubidaMultimedia
+        fields = ['articulo', 'tipo', 'descripcion', 'nombre', 'tamano', 'sha256']
+
+    def validate_tamano(self, value):
+        if value <= 0 or value > get_max_size():
+            raise serializers.ValidationError(
+                f'El tamaño debe estar entre 1 y {get_max_size()} bytes.')
+        return value
+
+    def validate_sha256(self, value):
+        if not re.fullmatch(r'[0-9a-fA-F]{64}', value):
+            raise serializers.ValidationError('Se esperaba un sha256 en hexadecimal.')
+        return value.lower()
@@ -0,0 +1,149 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.core.text import normalize_text
+from apps.post.blobs import release_blob, update_references
+from apps.post.cache import invalidate_authors, invalidate_categories, invalidate_posts
+from apps.post.counters import CounterChanges, loaded_snapshot, snapshot
+from apps.post.media import cover_files, move_media, register_media, unregister_media
+from apps.post.models.categoria import Categoria
+from apps.post.models.contenido_multimedia import ContenidoMultimedia
+from apps.post.models.post import Post
+from apps.post.search import index_posts, search_changed
+from apps.post.tasks import procesar_multimedia, procesar_portada
+from apps.users.models import User
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def post_changed(sender, instance, **kwargs):
+    loaded = getattr(instance, '_loaded_values', {})
+    invalidate_posts(
+        post_ids=[instance.pk],
+        category_ids=[instance.category_id, loaded.get('category_id')],
+    )
+
+
+@receiver(post_save, sender=Post)
+def post_counters(sender, instance, created, using, raw=False, **kwargs):
+    if raw:
+        return
+    changes = CounterChanges()
+    previous = None if created else loaded_snapshot(instance)
+    if previous is None and not created:
+        changes.add_unknown(snapshot(instance))
+    else:
+        changes.add(previous, snapshot(instance))
+    changes.apply(using=using)
+
+
+@receiver(post_delete, sender=Post)
+def post_deleted_counters(sender, instance, using, **kwargs):
+    changes = CounterChanges()
+    changes.add(loaded_snapshot(instance) or snapshot(instance), None)
+    changes.apply(using=using)
+
+
+@receiver(post_save, sender=Post)
+def post_search_index(sender, instance, using, raw=False, **kwargs):
+    if not raw and search_changed(instance):
+        index_posts([instance.pk], using=using)
+
+
+@receiver(post_save, sender=Post)
+def post_cover_variants(sender, instance, raw=False, **kwargs):
+    if not raw and getattr(instance, '_portada_changed', False) and instance.imagen_portada:
+        register_media(instance.imagen_portada.name, instance.pk)
+        procesar_portada.enqueue(post_id=instance.pk, imagen=instance.imagen_portada.name)
+
+
+@receiver(post_save, sender=Post)
+def post_cover_replaced(sender, instance, created, raw=False, **kwargs):
+    # La portada anterior y sus variantes dejan de servirse con el artículo
+    if raw or created or not getattr(instance, '_portada_changed', False):
+        return
+    loaded = getattr(instance, '_loaded_values', {})
+    previous = loaded.get('imagen_portada')
+    unregister_media([getattr(previous, 'name', previous),
+                      *cover_files(loaded.get('portada_variantes'))], instance.pk)
+
+
+@receiver(post_save, sender=Post)
+def post_cover_blob(sender, instance, **kwargs):
+    if getattr(instance, '_portada_changed', False):
+        loaded = getattr(instance, '_loaded_values', {})
+        update_references(loaded.get('imagen_portada'), instance.imagen_portada.name)
+
+
+@receiver(post_delete, sender=Post)
+def post_deleted_blob(sender, instance, **kwargs):
+    release_blob(instance.imagen_portada.name)
+
+
+@receiver(post_save, sender=Categoria)
+@receiver(post_delete, sender=Categoria)
+def categoria_changed(sender, instance, **kwargs):
+    invalidate_categories()
+
+
+@receiver(post_save, sender=ContenidoMultimedia)
+@receiver(post_delete, sender=ContenidoMultimedia)
+def multimedia_changed(sender, instance, **kwargs):
+    loaded = getattr(instance, '_loaded_values', {})
+    invalidate_posts(post_ids=[instance.articulo_id, loaded.get('articulo_id')], lists=False)
+
+
+@receiver(post_save, sender=ContenidoMultimedia)
+def multimedia_process(sender, instance, raw=False, **kwargs):
+    # Miniatura, tipo MIME y metadatos fuera de la petición
+    if not raw and getattr(instance, '_needs_processing', False):
+        # Se puede servir ya; el hash lo añade el procesamiento
+        register_media(instance.archivo.name, instance.articulo_id)
+        procesar_multimedia.enqueue(
+            multimedia_id=instance.pk, archivo=instance.archivo.name)
+
+
+@receiver(post_save, sender=ContenidoMultimedia)
+def multimedia_media(sender, instance, created, raw=False, **kwargs):
+    # Los archivos reemplazados dejan de servirse y los movidos siguen la
+    # visibilidad del nuevo artículo
+    if raw or created:
+        return
+    loaded = getattr(instance, '_loaded_values', {})
+    previous_id = loaded.get('articulo_id', instance.articulo_id)
+    if getattr(instance, '_needs_processing', False):
+        unregister_media([loaded.get('archivo'), loaded.get('miniatura')], previous_id)
+    elif getattr(instance, '_articulo_changed', False):
+        move_media([instance.archivo.name, instance.miniatura.name],
+                   previous_id, instance.articulo_id)
+
+
+@receiver(post_save, sender=ContenidoMultimedia)
+def multimedia_blob(sender, instance, **kwargs):
+    if getattr(instance, '_needs_processing', False):
+        loaded = getattr(instance, '_loaded_values', {})
+        update_references(loaded.get('archivo'), instance.archivo.name)
+
+
+@receiver(post_delete, sender=ContenidoMultimedia)
+def multimedia_deleted(sender, instance, **kwargs):
+    release_blob(instance.archivo.name)
+    # Los archivos siguen en el almacenamiento, pero dejan de servirse
+    unregister_media([instance.archivo.name, instance.miniatura.name], instance.articulo_id)
+
+
+@receiver(post_save, sender=User)
+def user_changed(sender, instance, update_fields=None, **kwargs):
+    # Los nombres de autor se muestran y filtran en los artículos. El
+    # perfil se guarda siempre con update_fields explícitos que incluyen
+    # los nombres (ManagedFieldsMixin): solo cuenta un cambio real
+    if update_fields is not None and not {'first_name', 'last_name'} & set(update_fields):
+        return
+    if not getattr(instance, '_name_changed', False):
+        return
+    autor_nombre = normalize_text(
+        f'{instance.first_name} {instance.last_name}')
+    Post.objects.filter(autor=instance).exclude(
+        autor_nombre=autor_nombre).update(autor_nombre=autor_nombre)
+    # Aunque el nombre normalizado no cambie ('ana' -> 'Ana'), sí el mostrado
+    invalidate_authors()
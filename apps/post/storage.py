@@ -0,0 +1,84 @@
+import hashlib
+import os
+import posixpath
+import re
+import tempfile
+
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage, storages
+
+BLOBS_DIR = 'blobs'
+BLOB_NAME_RE = re.compile(r'^%s/[0-9a-f]{2}/[0-9a-f]{2}/([0-9a-f]{64})(\.[\w]+)?$' % BLOBS_DIR)
+
+
+def blob_name(sha256, extension=''):
+    """Ruta del contenido con ese sha256: blobs/ab/cd/abcd...<extensión>."""
+    return f'{BLOBS_DIR}/{sha256[:2]}/{sha256[2:4]}/{sha256}{extension.lower()}'
+
+
+def blob_sha256(name):
+    """sha256 contenido en el nombre de un blob, None si no lo es."""
+    match = BLOB_NAME_RE.match(name or '')
+    return match.group(1) if match else None
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    Almacenamiento direccionado por contenido: cada archivo se guarda con
+    el sha256 de su contenido como nombre, calculado mientras se escribe, y
+    un contenido ya guardado no se vuelve a escribir. El nombre propuesto
+    solo aporta la extensión.
+
+    Un blob puede estar en uso por varios registros, así que delete() no
+    borra nada: los blobs sin referencias (BlobMedia) los elimina
+    `manage.py collect_blobs`. Por defecto usa MEDIA_ROOT y MEDIA_URL, de
+    modo que default_storage también los lee.
+    """
+
+    def get_available_name(self, name, max_length=None):
+        # El nombre final lo decide _save a partir del contenido
+        return name
+
+    def _save(self, name, content):
+        extension = os.path.splitext(name)[1]
+        tmp_dir = self.path(posixpath.join(BLOBS_DIR, 'tmp'))
+        os.makedirs(tmp_dir, exist_ok=True)
+        digest = hashlib.sha256()
+        fd, tmp_path = tempfile.mkstemp(dir=tmp_dir)
+        try:
+            with os.fdopen(fd, 'wb') as output:
+                if hasattr(content, 'seek'):
+                    content.seek(0)
+                for chunk in content.chunks():
+                    digest.update(chunk)
+                    output.write(chunk)
+            name = blob_name(digest.hexdigest(), extension)
+            full_path = self.path(name)
+            os.makedirs(os.path.dirname(full_path), exist_ok=True)
+            if os.path.exists(full_path):
+                # Mismo contenido: se reutiliza, marcándolo como recién usado
+                # para que collect_blobs no lo borre mientras se asigna
+                os.remove(tmp_path)
+                os.utime(full_path)
+            else:
+                # Renombrado atómico: nunca hay un blob a medio escribir
+                os.replace(tmp_path, full_path)
+                if self.file_permissions_mode is not None:
+                    os.chmod(full_path, self.file_permissions_mode)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return name
+
+    def delete(self, name):
+        pass
+
+    def purge(self, name):
+        """Borra de verdad el blob (solo para collect_blobs)."""
+        super().delete(name)
+
+
+def get_blob_storage():
+    """Almacenamiento de los archivos de multimedia y portadas (STORAGES['media'])."""
+    return storages['media'] if 'media' in settings.STORAGES else storages['default']
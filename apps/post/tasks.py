@@ -0,0 +1,90 @@
+import hashlib
+
+from django.db import transaction
+
+from apps.core.jobs import task
+from apps.post.cache import invalidate_posts
+from apps.post.media import (
+    image_metadata, make_thumbnail, register_media, register_media_file,
+    render_cover_variants, sniff_mime, video_metadata
+)
+from apps.post.models.contenido_multimedia import ContenidoMultimedia
+from apps.post.models.post import Post
+
+RESULT_FIELDS = ['estado_procesamiento', 'error_procesamiento', 'mime_type',
+                 'metadatos', 'miniatura']
+
+
+@task(name='post.procesar_multimedia', queue='media')
+def procesar_multimedia(multimedia_id, archivo):
+    """
+    Detecta el tipo MIME real del archivo subido y extrae sus metadatos;
+    las imágenes reciben además una miniatura. `archivo` es el nombre
+    encolado: si el archivo ha cambiado desde entonces, otro trabajo se
+    encarga del nuevo.
+    """
+    multimedia = ContenidoMultimedia.objects.filter(
+        pk=multimedia_id, archivo=archivo).first()
+    if multimedia is None:
+        return
+    ContenidoMultimedia.objects.filter(pk=multimedia_id).update(
+        estado_procesamiento='procesando')
+
+    mime_type = sniff_mime(multimedia.archivo)
+    multimedia.mime_type = mime_type
+    register_media_file(archivo, multimedia.articulo_id, mime_type)
+    if not mime_type.startswith('image/' if multimedia.tipo == 'imagen' else 'video/'):
+        multimedia.estado_procesamiento = 'error'
+        multimedia.error_procesamiento = (
+            f'El contenido del archivo ({mime_type}) no corresponde al tipo {multimedia.tipo}')
+        save_result(multimedia, archivo)
+        return
+
+    if multimedia.tipo == 'imagen':
+        multimedia.metadatos = image_metadata(multimedia.archivo)
+        thumbnail = make_thumbnail(multimedia.archivo)
+        digest = hashlib.sha256(thumbnail.read()).hexdigest()
+        multimedia.miniatura.save(thumbnail.name, thumbnail, save=False)
+        register_media(multimedia.miniatura.name, multimedia.articulo_id,
+                       sha256=digest, tamano=thumbnail.size, content_type='image/webp')
+    else:
+        multimedia.metadatos = video_metadata(multimedia.archivo)
+    multimedia.estado_procesamiento = 'listo'
+    save_result(multimedia, archivo)
+
+
+def save_result(multimedia, archivo):
+    # El archivo pudo reemplazarse mientras se procesaba
+    with transaction.atomic():
+        if ContenidoMultimedia.objects.select_for_update().filter(
+                pk=multimedia.pk, archivo=archivo).exists():
+            multimedia.save(update_fields=RESULT_FIELDS)
+
+
+@procesar_multimedia.failure
+def procesar_multimedia_failed(error, multimedia_id, archivo):
+    updated = ContenidoMultimedia.objects.filter(pk=multimedia_id, archivo=archivo).update(
+        estado_procesamiento='error', error_procesamiento=str(error)[:255])
+    if updated:
+        articulo_id = ContenidoMultimedia.objects.values_list(
+            'articulo_id', flat=True).get(pk=multimedia_id)
+        invalidate_posts(post_ids=[articulo_id], lists=False)
+
+
+@task(name='post.procesar_portada', queue='media')
+def procesar_portada(post_id, imagen):
+    """Variantes responsive de la portada `imagen` del artículo."""
+    if not Post.objects.filter(pk=post_id, imagen_portada=imagen).exists():
+        return
+    register_media_file(imagen, post_id)
+    save_cover_variants(post_id, imagen, *render_cover_variants(imagen))
+
+
+def save_cover_variants(post_id, imagen, variants, files):
+    # update(): sin pasar por save() (render, índice de búsqueda...)
+    if Post.objects.filter(pk=post_id, imagen_portada=imagen).update(
+            portada_variantes=variants):
+        for name, sha256, size, content_type in files:
+            register_media(name, post_id, sha256=sha256, tamano=size,
+                           content_type=content_type)
+        invalidate_posts(post_ids=[post_id], lists=False)
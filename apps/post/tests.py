@@ -1,3 +1,689 @@
-from django.test import TestCase
+import hashlib
+import os
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import caches
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import DatabaseError
+from django.test import Client, TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.authentication import authentication
+from apps.authentication.models import AuthToken
+from apps.core.query_budget import assert_max_queries
+from apps.post.catalog import get_catalog
+from apps.post.models.archivo_media import ArchivoMedia
+from apps.post.models.blob_media import BlobMedia
+from apps.post.models.categoria import Categoria
+from apps.post.models.contenido_multimedia import ContenidoMultimedia
+from apps.post.models.post import Post
+from apps.post.models.subida import SubidaMultimedia
+from apps.post.storage import get_blob_storage
+from apps.post.uploads import PARTS_DIR, UploadError, complete_upload
+from apps.post.views.post_viewset import PostViewSet
+from apps.users.models import User
+
+
+class PostApiTestCase(TestCase):
+
+    def setUp(self):
+        for cache in caches.all():
+            cache.clear()
+        authentication._token_cache = None
+        get_catalog().clear()
+        self.writer = User.objects.create(
+            username='writer', email='writer@example.com', first_name='Ana',
+            last_name='Autora', is_writer=True)
+        self.reader = User.objects.create(
+            username='reader', email='reader@example.com', first_name='Luis',
+            last_name='Lector')
+        self.categoria = Categoria.objects.create(name='Tech')
+        self.post = self.create_post('Título original')
+        self.client = APIClient()
+        self.client.force_authenticate(self.reader)
+
+    def create_post(self, titulo):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Post.objects.create(
+                autor=self.writer, category=self.categoria, titulo=titulo,
+                description='d', contenido='texto', estado='publicado',
+                fecha_publicacion=timezone.now())
+
+    def edit_post(self, **values):
+        with self.captureOnCommitCallbacks(execute=True):
+            for field, value in values.items():
+                setattr(self.post, field, value)
+            self.post.save()
+
+
+class PostResponseCacheTests(PostApiTestCase):
+
+    def test_retrieve_is_invalidated_after_edit(self):
+        url = f'/api/post/posts/{self.post.pk}/'
+        self.assertEqual(self.client.get(url)['X-Cache'], 'MISS')
+        self.assertEqual(self.client.get(url)['X-Cache'], 'HIT')
+
+        self.edit_post(titulo='Título editado')
+        response = self.client.get(url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['titulo'], 'Título editado')
+
+    def test_non_canonical_post_id_is_never_stale(self):
+        url = f'/api/post/posts/0{self.post.pk}/'
+        self.assertEqual(self.client.get(url).data['titulo'], 'Título original')
+
+        self.edit_post(titulo='Título editado')
+        response = self.client.get(url)
+        self.assertNotIn('X-Cache', response)
+        self.assertEqual(response.data['titulo'], 'Título editado')
+
+        self.edit_post(is_active=False)
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_non_canonical_category_filter_is_never_stale(self):
+        url = f'/api/post/posts/?categoria=0{self.categoria.pk}'
+        self.assertEqual(len(self.client.get(url).data['results']), 1)
+
+        self.create_post('Segundo artículo')
+        response = self.client.get(url)
+        self.assertNotIn('X-Cache', response)
+        self.assertEqual(len(response.data['results']), 2)
+
+    @mock.patch('apps.core.views.base_viewset.get_replicas', return_value=['replica'])
+    @mock.patch('apps.core.replicas.get_replicas', return_value=['replica'])
+    def test_cached_responses_are_built_on_primary(self, *mocks):
+        # 'replica' no existe: cualquier lectura enviada a ella fallaría
+        response = self.client.get(f'/api/post/posts/{self.post.pk}/')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['titulo'], 'Título original')
+
+
+@override_settings(QUERY_BUDGET_MODE='raise')
+class PostQueryBudgetTests(PostApiTestCase):
+    """
+    Presupuestos de PostViewSet.query_budgets en frío (caché de tokens y
+    catálogo de categorías vacíos) y en caliente. Con QUERY_BUDGET_MODE
+    'raise' el middleware falla si se superan.
+    """
+
+    def setUp(self):
+        super().setUp()
+        for n in range(3):
+            self.create_post(f'Artículo sobre python {n}')
+        # Escritor: sin caché de respuestas, cada petición llega a la BD
+        _, key = AuthToken.objects.create_token(self.writer)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {key}')
+
+    def urls(self):
+        return {
+            'list': '/api/post/posts/',
+            'retrieve': f'/api/post/posts/{self.post.pk}/',
+            'search': '/api/post/posts/search/?q=python',
+        }
+
+    def test_cold_requests_within_budget(self):
+        for action, url in self.urls().items():
+            with self.subTest(action=action):
+                authentication._token_cache = None
+                get_catalog().clear()
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+                self.assertLessEqual(
+                    int(response['X-Query-Count']), PostViewSet.query_budgets[action])
+
+    def test_warm_requests_within_budget(self):
+        for action, url in self.urls().items():
+            with self.subTest(action=action):
+                self.client.get(url)
+                with assert_max_queries(PostViewSet.query_budgets[action], action):
+                    response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+
+
+class PostBulkTests(PostApiTestCase):
+
+    def setUp(self):
+        super().setUp()
+        User.objects.filter(pk=self.writer.pk).update(is_staff=True)
+        self.writer.refresh_from_db()
+        self.client = APIClient()
+        self.client.force_authenticate(self.writer)
+
+    def item(self, titulo, **values):
+        return dict({'titulo': titulo, 'category': self.categoria.pk,
+                     'description': 'd', 'contenido': 'texto'}, **values)
+
+    def bulk(self, method, items):
+        with self.captureOnCommitCallbacks(execute=True):
+            return getattr(self.client, method)('/api/post/posts/bulk/', items, format='json')
+
+    def test_create_all_valid(self):
+        response = self.bulk('post', [self.item('Artículo masivo uno'),
+                                      self.item('Artículo masivo dos')])
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual([item['status'] for item in response.data['results']],
+                         ['created', 'created'])
+        self.assertEqual(Post.objects.count(), 3)
+
+    def test_create_partially_valid(self):
+        response = self.bulk('post', [self.item('Artículo masivo uno'), self.item('Corto')])
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual(response.data['errors'], 1)
+        self.assertIn('titulo', response.data['results'][1]['errors'])
+
+    def test_create_all_invalid(self):
+        response = self.bulk('post', [self.item('Corto'), self.item(self.post.titulo)])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(Post.objects.count(), 1)
+
+    @override_settings(POST_BULK_MAX_ITEMS=2)
+    def test_too_many_items_are_rejected(self):
+        items = [self.item(f'Artículo masivo {n}') for n in range(3)]
+        for method in ('post', 'patch'):
+            with self.subTest(method=method):
+                self.assertEqual(self.bulk(method, items).status_code, 400)
+        response = self.client.post('/api/post/posts/bulk-archive/',
+                                    {'ids': [1, 2, 3]}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(Post.objects.count(), 1)
+
+    def test_update_of_other_authors_posts_is_denied(self):
+        other = User.objects.create(
+            username='other', email='other@example.com', first_name='Otro',
+            last_name='Autor', is_writer=True, is_staff=True)
+        self.client.force_authenticate(other)
+        with self.captureOnCommitCallbacks(execute=True):
+            propio = Post.objects.create(
+                autor=other, category=self.categoria, titulo='Artículo del otro',
+                description='d', contenido='texto')
+
+        response = self.bulk('patch', [{'id': self.post.pk, 'titulo': 'Título ajeno editado'},
+                                       {'id': propio.pk, 'titulo': 'Artículo propio editado'}])
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual(response.data['results'][0]['errors'],
+                         {'detail': 'No puedes editar artículos que no son tuyos.'})
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.titulo, 'Título original')
+
+    @override_settings(POST_BULK_CHUNK_SIZE=1)
+    def test_failed_chunk_is_reported_per_item(self):
+        with mock.patch('apps.post.bulk.after_bulk_write',
+                        side_effect=[None, DatabaseError('bloqueo')]), \
+                self.assertLogs('apps.post.bulk', 'ERROR'):
+            response = self.bulk('post', [self.item('Artículo masivo uno'),
+                                          self.item('Artículo masivo dos')])
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual([item['status'] for item in response.data['results']],
+                         ['created', 'error'])
+        self.assertEqual(list(Post.objects.filter(titulo__startswith='Artículo masivo')
+                              .values_list('titulo', flat=True)), ['Artículo masivo uno'])
+
+
+class PostFilterTests(PostApiTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.otro = User.objects.create(
+            username='otro', email='otro@example.com', first_name='José',
+            last_name='Álvarez Núñez', is_writer=True)
+        self.deportes = Categoria.objects.create(name='Deportes')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.ajeno = Post.objects.create(
+                autor=self.otro, category=self.deportes, titulo='Artículo de José',
+                description='d', contenido='texto', estado='publicado',
+                fecha_publicacion=timezone.now() - timedelta(days=3))
+
+    def titles(self, query):
+        response = self.client.get(f'/api/post/posts/?{query}')
+        self.assertEqual(response.status_code, 200)
+        return sorted(post['titulo'] for post in response.data['results'])
+
+    def test_author_prefix_matches_name_and_surname_starts(self):
+        self.assertEqual(self.titles('autor_prefijo=Alv'), ['Artículo de José'])
+        self.assertEqual(self.titles('autor_prefijo=nún'), ['Artículo de José'])
+        self.assertEqual(self.titles('autor_prefijo=ana'), ['Título original'])
+        self.assertEqual(self.titles('autor_prefijo=varez'), [])
+
+    def test_author_name_matches_any_substring(self):
+        self.assertEqual(self.titles('autor_nombre=VAREZ'), ['Artículo de José'])
+        self.assertEqual(self.titles('autor_nombre=a'),
+                         ['Artículo de José', 'Título original'])
+
+    def test_category_and_day(self):
+        self.assertEqual(self.titles(f'categoria={self.deportes.pk}'), ['Artículo de José'])
+        day = timezone.localdate(self.ajeno.fecha_publicacion).isoformat()
+        self.assertEqual(self.titles(f'fecha_publicacion={day}'), ['Artículo de José'])
+
+
+class KeysetPaginationTests(PostApiTestCase):
+    """?pagination=cursor recorre todos los artículos una sola vez, en orden."""
+
+    def setUp(self):
+        super().setUp()
+        fecha = timezone.now() - timedelta(days=1)
+        with self.captureOnCommitCallbacks(execute=True):
+            # Empates de fecha (desempata el id) y borradores sin fecha
+            for n in range(4):
+                self.add_post(f'Empate en la fecha {n}', 'publicado', fecha)
+            for n in range(2):
+                self.add_post(f'Artículo anterior {n}', 'publicado', fecha - timedelta(days=1))
+            for n in range(3):
+                self.add_post(f'Borrador sin fecha {n}', 'borrador', None)
+
+    def add_post(self, titulo, estado, fecha):
+        return Post.objects.create(
+            autor=self.writer, category=self.categoria, titulo=titulo, description='d',
+            contenido='texto', estado=estado, fecha_publicacion=fecha)
+
+    def expected(self, **filters):
+        posts = sorted(Post.objects.filter(**filters), key=lambda post: post.pk, reverse=True)
+        dated = sorted((post for post in posts if post.fecha_publicacion),
+                       key=lambda post: post.fecha_publicacion, reverse=True)
+        return [post.pk for post in dated + [post for post in posts if not post.fecha_publicacion]]
+
+    def walk(self, url, link='next'):
+        pages = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            pages.append(response.data)
+            url = response.data[link]
+        return pages
+
+    def ids(self, pages):
+        return [post['id'] for page in pages for post in page['results']]
+
+    def test_writer_pages_include_ties_and_null_dates_once(self):
+        self.client.force_authenticate(self.writer)
+        pages = self.walk('/api/post/posts/?pagination=cursor&page_size=3')
+        self.assertEqual(self.ids(pages), self.expected())
+        self.assertEqual(len(pages), 4)
+        self.assertIsNone(pages[0]['previous'])
+
+    def test_reader_pages_skip_drafts(self):
+        pages = self.walk('/api/post/posts/?pagination=cursor&page_size=2')
+        self.assertEqual(self.ids(pages), self.expected(estado='publicado'))
+
+    def test_previous_links_walk_back_to_the_first_page(self):
+        self.client.force_authenticate(self.writer)
+        forward = self.walk('/api/post/posts/?pagination=cursor&page_size=3')
+        backward = self.walk(forward[-1]['previous'], link='previous')
+        self.assertEqual([page['results'] for page in reversed(backward)],
+                         [page['results'] for page in forward[:-1]])
+        self.assertIsNotNone(backward[0]['next'])
+
+    def test_invalid_cursor_is_not_found(self):
+        for cursor in ('no-es-un-cursor', 'eyJkIjoieCIsImkiOjF9'):  # {"d":"x","i":1}
+            with self.subTest(cursor=cursor):
+                response = self.client.get(f'/api/post/posts/?cursor={cursor}')
+                self.assertEqual(response.status_code, 404)
+
+    def test_count_modes(self):
+        total = len(self.expected(estado='publicado'))
+        for mode, count in (('none', None), ('exact', total), ('approx', total),
+                            ('otro', None)):
+            with self.subTest(mode=mode):
+                response = self.client.get(f'/api/post/posts/?pagination=cursor&count={mode}')
+                self.assertEqual(response.data['count'], count)
+
+
+class CategoryCatalogTests(PostApiTestCase):
+
+    @override_settings(CATEGORY_CATALOG_CACHE=False)
+    def test_without_shared_cache_changes_from_other_processes_apply(self):
+        self.assertEqual(get_catalog().get(self.categoria.pk).name, 'Tech')
+        # Cambio sin sello visible, como el de otro worker sin REDIS_URL
+        Categoria.objects.filter(pk=self.categoria.pk).update(name='Ciencia')
+        self.assertEqual(get_catalog().get(self.categoria.pk).name, 'Ciencia')
+
+    def test_stamp_invalidates_cached_catalogue(self):
+        self.assertEqual(get_catalog().get(self.categoria.pk).name, 'Tech')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.categoria.name = 'Ciencia'
+            self.categoria.save()
+        with self.assertNumQueries(1):
+            self.assertEqual(get_catalog().get(self.categoria.pk).name, 'Ciencia')
+        with self.assertNumQueries(0):
+            get_catalog().get(self.categoria.pk)
+
+
+class AsyncPostViewTests(PostApiTestCase):
+    """Las vistas de /api/async/ aplican la visibilidad y ?fields= de las síncronas."""
+
+    def setUp(self):
+        super().setUp()
+        _, key = AuthToken.objects.create_token(self.reader)
+        self.headers = {'Authorization': f'Token {key}'}
+
+    async def get(self, url):
+        return await self.async_client.get(url, headers=self.headers)
+
+    async def test_list_applies_sparse_fieldset(self):
+        response = await self.get('/api/async/posts/?fields=titulo')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['results'], [{'titulo': 'Título original'}])
+
+        response = await self.get('/api/async/posts/?exclude=autor,description')
+        item = response.json()['results'][0]
+        self.assertEqual(item['category'], 'Tech')
+        self.assertNotIn('autor', item)
+        self.assertNotIn('description', item)
+
+    async def test_unknown_field_is_rejected(self):
+        response = await self.get('/api/async/posts/?fields=titulo,password')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('fields', response.json())
+
+    async def test_detail(self):
+        response = await self.get(f'/api/async/posts/{self.post.pk}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['multimedia'], [])
+        self.assertEqual(response.json()['autor']['first_name'], 'Ana')
+
+        response = await self.get(f'/api/async/posts/{self.post.pk}/?fields=titulo,multimedia')
+        self.assertEqual(response.json(), {'titulo': 'Título original', 'multimedia': []})
+
+    async def test_detail_hides_drafts(self):
+        await Post.objects.filter(pk=self.post.pk).aupdate(estado='borrador')
+        response = await self.get(f'/api/async/posts/{self.post.pk}/')
+        self.assertEqual(response.status_code, 404)
+
+    async def test_categorias(self):
+        response = await self.get('/api/async/categorias/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([c['name'] for c in response.json()], ['Tech'])
+
+    async def test_requires_authentication(self):
+        response = await self.async_client.get('/api/async/posts/')
+        self.assertEqual(response.status_code, 401)
+
+
+class MediaTestCase(PostApiTestCase):
+    """Con MEDIA_ROOT en un directorio temporal y un usuario staff."""
+
+    def setUp(self):
+        super().setUp()
+        self.media_root = self.enterContext(tempfile.TemporaryDirectory())
+        self.enterContext(override_settings(MEDIA_ROOT=self.media_root))
+        self.admin = User.objects.create(
+            username='admin', email='admin@example.com', first_name='Eva',
+            last_name='Admin', is_staff=True)
+
+
+class MediaVisibilityTests(MediaTestCase):
+    """/media/<ruta> aplica la visibilidad del artículo que usa el archivo."""
+
+    def setUp(self):
+        super().setUp()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.borrador = Post.objects.create(
+                autor=self.writer, category=self.categoria, titulo='Borrador privado',
+                description='d', contenido='texto')
+
+    def add_media(self, articulo, content=b'imagen'):
+        with self.captureOnCommitCallbacks(execute=True):
+            return ContenidoMultimedia.objects.create(
+                articulo=articulo, tipo='imagen',
+                archivo=SimpleUploadedFile('foto.jpg', content))
+
+    def get_media(self, name, user=None):
+        client = Client()
+        if user is not None:
+            _, key = AuthToken.objects.create_token(user)
+            client.defaults['HTTP_AUTHORIZATION'] = f'Token {key}'
+        return client.get(f'/media/{name}')
+
+    def test_published_media_is_public_and_drafts_only_for_their_author(self):
+        publico = self.add_media(self.post, b'publico').archivo.name
+        privado = self.add_media(self.borrador, b'privado').archivo.name
+
+        self.assertEqual(self.get_media(publico).status_code, 200)
+        self.assertEqual(self.get_media(privado).status_code, 404)
+        self.assertEqual(self.get_media(privado, self.reader).status_code, 404)
+        response = self.get_media(privado, self.writer)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('private', response['Cache-Control'])
+        self.assertEqual(self.get_media('sin/registrar.jpg').status_code, 404)
+
+    def test_moved_multimedia_follows_new_post(self):
+        multimedia = self.add_media(self.post)
+        name = multimedia.archivo.name
+        self.assertEqual(self.get_media(name).status_code, 200)
+
+        client = APIClient()
+        client.force_authenticate(self.admin)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = client.patch(f'/api/post/multimedia/{multimedia.pk}/',
+                                    {'articulo': self.borrador.pk})
+        self.assertEqual(response.status_code, 200)
+
+        self.assertEqual(list(ArchivoMedia.objects.filter(nombre=name).values_list(
+            'articulo_id', flat=True)), [self.borrador.pk])
+        self.assertEqual(self.get_media(name).status_code, 404)
+        self.assertEqual(self.get_media(name, self.writer).status_code, 200)
+
+    def test_replaced_cover_is_no_longer_served(self):
+        self.edit_post(imagen_portada=SimpleUploadedFile('portada.jpg', b'primera'))
+        anterior = self.post.imagen_portada.name
+        self.assertEqual(self.get_media(anterior).status_code, 200)
+
+        self.edit_post(imagen_portada=SimpleUploadedFile('portada.jpg', b'segunda'))
+        self.assertEqual(self.get_media(anterior).status_code, 404)
+        self.assertEqual(self.get_media(self.post.imagen_portada.name).status_code, 200)
+
+    def test_shared_blob_is_served_while_any_content_uses_it(self):
+        first = self.add_media(self.post, b'compartido')
+        second = self.add_media(self.post, b'compartido')
+        self.assertEqual(first.archivo.name, second.archivo.name)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            first.delete()
+        self.assertEqual(self.get_media(second.archivo.name).status_code, 200)
+        with self.captureOnCommitCallbacks(execute=True):
+            second.delete()
+        self.assertEqual(self.get_media(second.archivo.name).status_code, 404)
+
+
+@override_settings(MEDIA_UPLOAD_CHUNK_SIZE=4)
+class UploadTests(MediaTestCase):
+    """Subidas por partes: /api/post/subidas/."""
+    CONTENT = b'0123456789'
+
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def start(self, sha256=None):
+        response = self.client.post('/api/post/subidas/', {
+            'articulo': self.post.pk, 'tipo': 'video', 'nombre': 'video.mp4',
+            'tamano': len(self.CONTENT),
+            'sha256': sha256 or hashlib.sha256(self.CONTENT).hexdigest()}, format='json')
+        self.assertEqual(response.status_code, 201)
+        return response.data['id']
+
+    def send(self, pk, offset, data=None, **headers):
+        data = self.CONTENT[offset:offset + 4] if data is None else data
+        return self.client.generic(
+            'PATCH', f'/api/post/subidas/{pk}/', data,
+            content_type='application/offset+octet-stream',
+            HTTP_UPLOAD_OFFSET=str(offset), **headers)
+
+    def send_all(self, pk):
+        for offset in range(0, len(self.CONTENT), 4):
+            self.assertEqual(self.send(pk, offset).status_code, 200)
+
+    def complete(self, pk):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(f'/api/post/subidas/{pk}/completar/')
+
+    def stored_parts(self, pk):
+        parts_dir = os.path.join(self.media_root, PARTS_DIR, str(pk))
+        return sorted(os.listdir(parts_dir)) if os.path.isdir(parts_dir) else []
+
+    def test_parts_are_joined_on_completion(self):
+        pk = self.start()
+        self.send_all(pk)
+        self.assertEqual(self.client.get(f'/api/post/subidas/{pk}/').data['offset'], 10)
+
+        response = self.complete(pk)
+        self.assertEqual(response.status_code, 201)
+        multimedia = ContenidoMultimedia.objects.get(articulo=self.post)
+        with multimedia.archivo.open('rb') as archivo:
+            self.assertEqual(archivo.read(), self.CONTENT)
+        self.assertEqual(self.stored_parts(pk), [])
+        self.assertFalse(SubidaMultimedia.objects.filter(pk=pk).exists())
+
+    def test_offset_conflict(self):
+        pk = self.start()
+        self.assertEqual(self.send(pk, 0).status_code, 200)
+        response = self.send(pk, 0)
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.data['offset'], 4)
+        self.assertEqual(len(self.stored_parts(pk)), 1)
+
+    def test_part_checksum_mismatch(self):
+        pk = self.start()
+        response = self.send(pk, 0, HTTP_UPLOAD_CHECKSUM=hashlib.sha256(b'otra').hexdigest())
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(SubidaMultimedia.objects.get(pk=pk).offset, 0)
+        self.assertEqual(self.stored_parts(pk), [])
+
+        checksum = hashlib.sha256(self.CONTENT[:4]).hexdigest()
+        self.assertEqual(self.send(pk, 0, HTTP_UPLOAD_CHECKSUM=checksum).status_code, 200)
+
+    def test_sha256_mismatch_discards_the_upload(self):
+        pk = self.start(sha256=hashlib.sha256(b'otro contenido').hexdigest())
+        self.send_all(pk)
+
+        response = self.complete(pk)
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(ContenidoMultimedia.objects.exists())
+        self.assertFalse(SubidaMultimedia.objects.filter(pk=pk).exists())
+        self.assertEqual(self.stored_parts(pk), [])
+
+    def test_incomplete_upload_cannot_be_completed(self):
+        pk = self.start()
+        self.send(pk, 0)
+        self.assertEqual(self.complete(pk).status_code, 400)
+        self.assertTrue(SubidaMultimedia.objects.filter(pk=pk).exists())
+
+    def test_double_completion(self):
+        pk = self.start()
+        self.send_all(pk)
+        stale = SubidaMultimedia.objects.get(pk=pk)
+        self.assertEqual(self.complete(pk).status_code, 201)
+
+        self.assertEqual(self.complete(pk).status_code, 404)
+        # La otra petición ya tenía la subida cargada
+        with self.assertRaisesMessage(UploadError, 'ya se ha completado'):
+            complete_upload(stale, {})
+        self.assertEqual(ContenidoMultimedia.objects.count(), 1)
+
+    def test_purge_uploads_deletes_only_expired(self):
+        expired, current = self.start(), self.start()
+        self.send(expired, 0)
+        SubidaMultimedia.objects.filter(pk=expired).update(
+            expira=timezone.now() - timedelta(minutes=1))
+
+        out = StringIO()
+        call_command('purge_uploads', stdout=out)
+        self.assertIn('1 subidas caducadas borradas', out.getvalue())
+        self.assertEqual([str(pk) for pk in SubidaMultimedia.objects.values_list('pk', flat=True)],
+                         [str(current)])
+        self.assertEqual(self.stored_parts(expired), [])
+
+
+class BlobTests(MediaTestCase):
+    """Referencias de los blobs compartidos y collect_blobs."""
+
+    def add_media(self, content, articulo=None):
+        with self.captureOnCommitCallbacks(execute=True):
+            return ContenidoMultimedia.objects.create(
+                articulo=articulo or self.post, tipo='imagen',
+                archivo=SimpleUploadedFile('foto.jpg', content))
+
+    def references(self, name):
+        return BlobMedia.objects.get(nombre=name).referencias
+
+    def age(self, name, **blob_values):
+        """Antigüedad por encima del margen, en el registro y en el archivo."""
+        old = timezone.now() - timedelta(days=2)
+        BlobMedia.objects.filter(nombre=name).update(updated_date=old, **blob_values)
+        os.utime(get_blob_storage().path(name), (old.timestamp(), old.timestamp()))
+
+    def collect(self, *args):
+        out = StringIO()
+        call_command('collect_blobs', *args, stdout=out)
+        return out.getvalue()
+
+    def exists(self, name):
+        return get_blob_storage().exists(name)
+
+    def test_shared_blob_counts_every_use(self):
+        first = self.add_media(b'compartido')
+        second = self.add_media(b'compartido', self.create_post('Otro artículo compartido'))
+        self.edit_post(imagen_portada=SimpleUploadedFile('portada.jpg', b'compartido'))
+        name = first.archivo.name
+        self.assertEqual({second.archivo.name, self.post.imagen_portada.name}, {name})
+        self.assertEqual(self.references(name), 3)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            first.archivo = SimpleUploadedFile('foto.jpg', b'nuevo')
+            first.save()
+            second.delete()
+        self.assertEqual(self.references(name), 1)
+        self.assertEqual(self.references(first.archivo.name), 1)
+
+    def test_orphans_are_collected_after_the_grace_period(self):
+        multimedia = self.add_media(b'huerfano')
+        name = multimedia.archivo.name
+        with self.captureOnCommitCallbacks(execute=True):
+            multimedia.delete()
+        self.assertEqual(self.references(name), 0)
+
+        self.assertIn('0 blobs borrados', self.collect())
+        self.assertTrue(self.exists(name))
+
+        self.age(name)
+        # Reutilizado hace poco: el archivo se toca al guardarlo otra vez
+        os.utime(get_blob_storage().path(name))
+        self.assertIn('0 blobs borrados', self.collect())
+
+        self.age(name)
+        self.assertIn('1 blobs se borrarían', self.collect('--dry-run'))
+        self.assertTrue(self.exists(name))
+        self.assertIn('1 blobs borrados (1 sin referencias, 0 sin registrar)', self.collect())
+        self.assertFalse(self.exists(name))
+        self.assertFalse(BlobMedia.objects.filter(nombre=name).exists())
+
+    def test_untracked_blobs_are_collected_after_the_grace_period(self):
+        name = get_blob_storage().save('suelto.bin', ContentFile(b'sin registrar'))
+        self.assertIn('0 blobs borrados', self.collect())
+
+        old = (timezone.now() - timedelta(days=2)).timestamp()
+        os.utime(get_blob_storage().path(name), (old, old))
+        self.assertIn('(0 sin referencias, 1 sin registrar)', self.collect())
+        self.assertFalse(self.exists(name))
+
+    def test_reconcile_fixes_references_missed_by_update(self):
+        name = self.add_media(b'actualizado').archivo.name
+        # Sin señales: el contador sigue en 1 aunque ya nadie lo use
+        ContenidoMultimedia.objects.update(archivo='articulos/media/anterior.jpg')
+        self.age(name)
+
+        self.assertIn('0 blobs borrados', self.collect())
+        self.assertIn('1 blobs con referencias corregidas', self.collect('--reconcile'))
+        self.assertEqual(self.references(name), 0)
+        # La corrección cuenta como cambio: el margen empieza de nuevo
+        self.assertTrue(self.exists(name))
+        self.age(name)
+        self.assertIn('1 blobs borrados', self.collect('--reconcile'))
+        self.assertFalse(self.exists(name))
@@ -0,0 +1,178 @@
+import hashlib
+import posixpath
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.base import File
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils import timezone
+
+from apps.post.models.contenido_multimedia import ContenidoMultimedia
+from apps.post.models.subida import SubidaMultimedia
+
+PARTS_DIR = 'articulos/media/partes'
+
+
+def get_chunk_size():
+    return getattr(settings, 'MEDIA_UPLOAD_CHUNK_SIZE', 8 * 1024 * 1024)
+
+
+def get_max_size():
+    return getattr(settings, 'MEDIA_UPLOAD_MAX_SIZE', 2 * 1024 ** 3)
+
+
+def get_expiration():
+    return timezone.now() + timedelta(
+        seconds=getattr(settings, 'MEDIA_UPLOAD_EXPIRATION', 24 * 60 * 60))
+
+
+class UploadError(Exception):
+    pass
+
+
+class OffsetConflict(UploadError):
+    pass
+
+
+class HashingReader:
+    """
+    Lee de `stream` hasta `limit` bytes calculando el sha256 y contando lo
+    leído, sin guardar nada en memoria: el almacenamiento lo consume a trozos.
+    """
+
+    def __init__(self, stream, limit):
+        self.stream = stream
+        self.remaining = limit
+        self.hash = hashlib.sha256()
+        self.size = 0
+
+    def read(self, size=-1):
+        if self.remaining <= 0:
+            return b''
+        if size is None or size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.stream.read(size)
+        self.remaining -= len(data)
+        self.size += len(data)
+        self.hash.update(data)
+        return data
+
+
+class PartsReader:
+    """Lectura secuencial de las partes guardadas, abriéndolas de una en una."""
+
+    def __init__(self, names, storage=default_storage):
+        self.names = list(names)
+        self.storage = storage
+        self.current = None
+
+    def read(self, size=-1):
+        while self.names or self.current is not None:
+            if self.current is None:
+                self.current = self.storage.open(self.names.pop(0), 'rb')
+            data = self.current.read(size)
+            if data:
+                return data
+            self.current.close()
+            self.current = None
+        return b''
+
+    def close(self):
+        if self.current is not None:
+            self.current.close()
+            self.current = None
+
+
+def append_chunk(subida, offset, stream, length, checksum=None):
+    """
+    Guarda en el almacenamiento los `length` bytes de `stream` como parte
+    de la subida a partir de `offset`. La parte se escribe antes de tocar
+    la sesión; si otra petición ha avanzado el offset entretanto, se
+    descarta y se lanza OffsetConflict.
+    """
+    if offset != subida.offset:
+        raise OffsetConflict(subida.offset)
+    if length <= 0 or length > get_chunk_size():
+        raise UploadError(f'Cada parte debe tener entre 1 y {get_chunk_size()} bytes')
+    if offset + length > subida.tamano:
+        raise UploadError('La parte supera el tamaño declarado del archivo')
+
+    reader = HashingReader(stream, length)
+    content = File(reader, name='part')
+    content.size = length
+    name = default_storage.save(
+        posixpath.join(PARTS_DIR, str(subida.pk), f'{offset:015d}.part'), content)
+    try:
+        if reader.size != length:
+            raise UploadError('La parte recibida está incompleta')
+        if checksum and checksum.lower() != reader.hash.hexdigest():
+            raise UploadError('El sha256 de la parte no coincide')
+        with transaction.atomic():
+            locked = SubidaMultimedia.objects.select_for_update().get(pk=subida.pk)
+            if locked.offset != offset:
+                raise OffsetConflict(locked.offset)
+            locked.partes.append([offset, length, name])
+            locked.offset = offset + length
+            locked.expira = get_expiration()
+            locked.save(update_fields=['partes', 'offset', 'expira', 'updated_date'])
+    except UploadError:
+        default_storage.delete(name)
+        raise
+    return locked
+
+
+def complete_upload(subida, audit):
+    """
+    Concatena las partes en el archivo definitivo (en streaming), verifica el
+    sha256 y solo entonces crea el ContenidoMultimedia. Con un sha256
+    distinto la subida se descarta entera.
+    """
+    if subida.offset != subida.tamano:
+        raise UploadError(f'Faltan {subida.tamano - subida.offset} bytes por subir')
+
+    multimedia = ContenidoMultimedia(
+        articulo_id=subida.articulo_id, tipo=subida.tipo,
+        descripcion=subida.descripcion, **audit)
+    field = multimedia.archivo.field
+    reader = HashingReader(PartsReader(name for _, _, name in subida.partes), subida.tamano)
+    try:
+        content = File(reader, name=subida.nombre)
+        content.size = subida.tamano
+        name = field.storage.save(field.generate_filename(multimedia, subida.nombre),
+                                  content, max_length=field.max_length)
+    except FileNotFoundError:
+        # Otra petición la completó y ya borró las partes
+        if not SubidaMultimedia.objects.filter(pk=subida.pk).exists():
+            raise UploadError('La subida ya se ha completado')
+        raise
+    finally:
+        reader.stream.close()
+
+    if reader.hash.hexdigest() != subida.sha256.lower():
+        field.storage.delete(name)
+        discard_upload(subida)
+        raise UploadError('El sha256 del archivo no coincide: la subida se ha descartado')
+
+    multimedia.archivo.name = name
+    try:
+        with transaction.atomic():
+            # Dos peticiones de completar a la vez: solo una borra la sesión
+            if not SubidaMultimedia.objects.filter(pk=subida.pk).delete()[0]:
+                raise UploadError('La subida ya se ha completado')
+            multimedia.save()
+    except UploadError:
+        field.storage.delete(name)
+        raise
+    delete_parts(subida)
+    return multimedia
+
+
+def delete_parts(subida):
+    for _, _, name in subida.partes:
+        default_storage.delete(name)
+
+
+def discard_upload(subida):
+    delete_parts(subida)
+    SubidaMultimedia.objects.filter(pk=subida.pk).delete()
@@ -4,6 +4,7 @@ from rest_framework.routers import DefaultRouter
 from apps.post.views.post_viewset import PostViewSet
 from apps.post.views.category_viewset import CategoriaViewSet
 from apps.post.views.cont_mult_viewset import ContenidoMultimediaViewSet
+from apps.post.views.subida_viewset import SubidaMultimediaViewSet
 
 # Crear el router y registrar el ViewSet
 router = DefaultRouter()
@@ -11,6 +12,7 @@ router.register(r'posts', PostViewSet, basename='post')
 router.register(r'categorias', CategoriaViewSet, basename='categoria')
 router.register(r'multimedia', ContenidoMultimediaViewSet,
                 basename='multimedia')
+router.register(r'subidas', SubidaMultimediaViewSet, basename='subida')
 
 # Las URLs se generan automáticamente:
 # - GET      /api/posts/
@@ -20,6 +22,7 @@ router.register(r'multimedia', ContenidoMultimediaViewSet,
 # - PATCH    /api/posts/{id}/
 # - DELETE   /api/posts/{id}/
 # - POST     /api/posts/{id}/reactivate/
+# - POST     /api/subidas/  PATCH /api/subidas/{id}/  POST /api/subidas/{id}/completar/
 
 urlpatterns = [
     path('', include(router.urls)),
@@ -1,3 +1,4 @@
 from .post_viewset import *
 from .category_viewset import *
 from .cont_mult_viewset import *
+from .subida_viewset import *
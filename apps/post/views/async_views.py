@@ -0,0 +1,69 @@
+from django.db.models import Prefetch
+from rest_framework.exceptions import ValidationError
+
+from apps.core.views.async_api import async_api_view
+from apps.core.views.sparse_fieldsets import (
+    apply_sparse_fieldset,
+    parse_sparse_fieldset,
+    project_queryset,
+)
+from apps.post.filters import PostFilter
+from apps.post.catalog import get_catalog
+from apps.post.models.contenido_multimedia import ContenidoMultimedia
+from apps.post.pagination import get_post_pagination_class
+from apps.post.permissions import get_visible_posts
+from apps.post.serializers.category_serializers import CategoriaListSerializer
+from apps.post.serializers.post_serializer import PostDetailSerializer, PostListSerializer
+
+# Versiones async de las lecturas de PostViewSet y CategoriaViewSet: mismas
+# reglas de visibilidad, filtros, paginación, serializadores y `?fields=` /
+# `?exclude=` (con la misma proyección del queryset que SparseFieldsetMixin).
+
+
+def get_prefetch(lookup):
+    if lookup == 'multimedia':
+        return Prefetch('multimedia', queryset=ContenidoMultimedia.objects.order_by('id'))
+    return lookup
+
+
+def sparse_serializer(serializer, request):
+    return apply_sparse_fieldset(serializer, *parse_sparse_fieldset(request.query_params))
+
+
+def project(queryset, serializer_class, context):
+    # Si la proyección no se puede deducir queda el queryset con sus joins:
+    # en una vista async no puede haber cargas perezosas
+    projection = sparse_serializer(serializer_class(context=context), context['request'])
+    return project_queryset(queryset, projection, ('fecha_publicacion',), get_prefetch)
+
+
+@async_api_view()
+async def post_list(request):
+    queryset = get_visible_posts(request.user).select_related('autor')
+    filterset = PostFilter(request.query_params, queryset=queryset, request=request)
+    if not filterset.is_valid():
+        raise ValidationError(filterset.errors)
+
+    context = {'request': request, 'categorias': await get_catalog().aget_all()}
+    queryset = project(filterset.qs, PostListSerializer, context)
+    paginator = get_post_pagination_class(request)()
+    page = await paginator.apaginate_queryset(queryset, request)
+    serializer = sparse_serializer(PostListSerializer(page, many=True, context=context), request)
+    return paginator.get_paginated_response(serializer.data).data
+
+
+@async_api_view()
+async def post_detail(request, pk):
+    context = {'request': request, 'categorias': await get_catalog().aget_all()}
+    queryset = get_visible_posts(request.user).select_related('autor').prefetch_related(
+        get_prefetch('multimedia'))
+    queryset = project(queryset, PostDetailSerializer, context)
+    post = await queryset.aget(pk=pk)
+    return sparse_serializer(PostDetailSerializer(post, context=context), request).data
+
+
+@async_api_view()
+async def categoria_list(request):
+    catalog = get_catalog()
+    categorias = catalog.active(await catalog.aget_all())
+    return CategoriaListSerializer(categorias, many=True, context={'request': request}).data
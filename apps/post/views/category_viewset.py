@@ -1,17 +1,22 @@
+from django.http import Http404
 from rest_framework import status, viewsets
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 from apps.core.views.base_viewset import BaseModelViewSet
+from apps.core.views.sparse_fieldsets import SparseFieldsetMixin
+from apps.post.catalog import get_catalog
 from apps.post.models.categoria import Categoria
 from apps.post.serializers.category_serializers import CategoriaListSerializer, CategoriaCreateUpdateSerializer
 
 
-class CategoriaViewSet(BaseModelViewSet):
+class CategoriaViewSet(SparseFieldsetMixin, BaseModelViewSet):
     queryset = Categoria.objects.filter(is_active=True)
     serializer_class = CategoriaListSerializer
     permission_classes = [IsAuthenticated]
+    # Consultas máximas por acción (ver QueryBudgetMiddleware)
+    query_budgets = {'list': 3, 'retrieve': 3}
 
     def get_permissions(self):
         if self.action in ['create', 'update', 'partial_update', 'destroy']:
@@ -21,19 +26,34 @@ class CategoriaViewSet(BaseModelViewSet):
     def get_serializer_class(self):
         if self.action in ['create', 'update', 'partial_update']:
             return CategoriaCreateUpdateSerializer
+        return CategoriaListSerializer
 
     @swagger_auto_schema(
         operation_description="Lista todas las categorías",
+        manual_parameters=[
+            openapi.Parameter('fields', openapi.IN_QUERY,
+                              description="Campos a incluir, separados por comas", type=openapi.TYPE_STRING),
+            openapi.Parameter('exclude', openapi.IN_QUERY,
+                              description="Campos a excluir, separados por comas", type=openapi.TYPE_STRING),
+        ],
         responses={
             200: CategoriaListSerializer(many=True),
             403: "No tienes permiso para realizar esta acción"
         }
     )
     def list(self, request, *args, **kwargs):
-        return super().list(request, *args, **kwargs)
+        # Desde el catálogo en memoria, sin consultas
+        serializer = self.get_serializer(get_catalog().active(), many=True)
+        return Response(serializer.data)
 
     @swagger_auto_schema(
         operation_description="Obtiene detalles de una categoría específica",
+        manual_parameters=[
+            openapi.Parameter('fields', openapi.IN_QUERY,
+                              description="Campos a incluir, separados por comas", type=openapi.TYPE_STRING),
+            openapi.Parameter('exclude', openapi.IN_QUERY,
+                              description="Campos a excluir, separados por comas", type=openapi.TYPE_STRING),
+        ],
         responses={
             200: CategoriaListSerializer(),
             404: "Categoría no encontrada",
@@ -41,7 +61,13 @@ class CategoriaViewSet(BaseModelViewSet):
         }
     )
     def retrieve(self, request, *args, **kwargs):
-        return super().retrieve(request, *args, **kwargs)
+        try:
+            categoria = get_catalog().get(int(kwargs[self.lookup_field]))
+        except ValueError:
+            categoria = None
+        if categoria is None or not categoria.is_active:
+            raise Http404
+        return Response(self.get_serializer(categoria).data)
 
     @swagger_auto_schema(
         operation_description="Crea una nueva categoría",
@@ -21,6 +21,7 @@ class ContenidoMultimediaViewSet(viewsets.ModelViewSet):
     def get_serializer_class(self):
         if self.action in ['create', 'update', 'partial_update']:
             return MultimediaCreateUpdateSerializer
+        return super().get_serializer_class()
 
     @swagger_auto_schema(
         operation_description="Lista todos los contenidos multimedia",
@@ -44,7 +45,10 @@ class ContenidoMultimediaViewSet(viewsets.ModelViewSet):
         return super().retrieve(request, *args, **kwargs)
 
     @swagger_auto_schema(
-        operation_description="Crea un nuevo contenido multimedia",
+        operation_description=(
+            "Crea un nuevo contenido multimedia. El archivo se procesa en "
+            "segundo plano (miniatura, tipo MIME, metadatos): la respuesta "
+            "devuelve estado_procesamiento='pendiente'"),
         request_body=MultimediaCreateUpdateSerializer,
         responses={
             201: "Contenido creado exitosamente",
@@ -0,0 +1,187 @@
+import mimetypes
+import posixpath
+import re
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.http import FileResponse, Http404, HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
+from django.views.decorators.http import require_safe
+from rest_framework import exceptions
+
+from apps.authentication.authentication import CachedTokenAuthentication
+from apps.post.models.archivo_media import ArchivoMedia
+from apps.post.permissions import get_visible_posts
+from apps.post.storage import blob_sha256
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+# Tipos que el navegador puede mostrar en línea sin riesgo (sin HTML/SVG)
+INLINE_TYPES = ('image/jpeg', 'image/png', 'image/gif', 'image/webp', 'image/avif', 'video/')
+
+
+def get_user(request):
+    """Usuario de la sesión o del token (las etiquetas <img> no envían token)."""
+    if request.user.is_authenticated:
+        return request.user
+    try:
+        result = CachedTokenAuthentication().authenticate(request)
+    except exceptions.AuthenticationFailed:
+        return request.user
+    return result[0] if result else request.user
+
+
+def resolve_access(request, path):
+    """
+    Devuelve (registro, público) del archivo, o lanza Http404 si el usuario
+    no puede ver ninguno de los artículos que lo usan: mismas reglas que
+    PostViewSet, pero los medios de artículos publicados son públicos.
+    """
+    if path.startswith(tuple(getattr(settings, 'MEDIA_PUBLIC_PREFIXES', ()))):
+        return None, True
+    records = list(ArchivoMedia.objects.filter(nombre=path).values(
+        'articulo_id', 'sha256', 'tamano', 'content_type',
+        'articulo__estado', 'articulo__is_active'))
+    if not records:
+        raise Http404
+    for record in records:
+        if record['articulo__estado'] == 'publicado' and record['articulo__is_active']:
+            return record, True
+    visible = get_visible_posts(get_user(request)).filter(
+        pk__in=[record['articulo_id'] for record in records])
+    if not visible.exists():
+        raise Http404
+    return records[0], False
+
+
+def parse_range(header, size):
+    """(inicio, fin) del primer y único rango de bytes, None si no aplica."""
+    match = RANGE_RE.match(header or '')
+    if not match or size == 0:
+        return None
+    start, end = match.groups()
+    if start:
+        start = int(start)
+        end = min(int(end), size - 1) if end else size - 1
+    elif end:  # sufijo: los últimos N bytes
+        start, end = max(0, size - int(end)), size - 1
+    else:
+        return None
+    if start > end or start >= size:
+        raise ValueError
+    return start, end
+
+
+def range_iterator(stored, start, length, chunk_size=64 * 1024):
+    try:
+        stored.seek(start)
+        while length > 0:
+            data = stored.read(min(chunk_size, length))
+            if not data:
+                break
+            length -= len(data)
+            yield data
+    finally:
+        stored.close()
+
+
+def offload(path, storage):
+    """Respuesta vacía para que el servidor web envíe el archivo."""
+    backend = getattr(settings, 'MEDIA_SENDFILE', None)
+    response = HttpResponse()
+    if backend == 'x-accel-redirect':
+        prefix = getattr(settings, 'MEDIA_ACCEL_REDIRECT_PREFIX', '/protected-media/')
+        response['X-Accel-Redirect'] = posixpath.join(prefix, path)
+    else:
+        response['X-Sendfile'] = storage.path(path)
+    return response
+
+
+@require_safe
+def serve_media(request, path):
+    """
+    Sirve los archivos de MEDIA_ROOT comprobando la visibilidad de su
+    artículo. Admite rangos de bytes (un rango por petición), ETag fuerte
+    (sha256 guardado), peticiones condicionales y la descarga del envío al
+    servidor web con MEDIA_SENDFILE ('x-accel-redirect' o 'x-sendfile').
+    """
+    path = posixpath.normpath(path).lstrip('/')
+    if path.startswith('..'):
+        raise Http404
+    record, public = resolve_access(request, path)
+
+    storage = default_storage
+    try:
+        size = record['tamano'] if record and record['tamano'] is not None else storage.size(path)
+        modified = storage.get_modified_time(path)
+    except (FileNotFoundError, NotImplementedError):
+        raise Http404
+    etag = quote_etag(record['sha256']) if record and record['sha256'] else None
+    last_modified = int(modified.timestamp())
+    content_type = (record and record['content_type']) or mimetypes.guess_type(path)[0] \
+        or 'application/octet-stream'
+
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        response = build_response(request, path, storage, size, etag, last_modified)
+    if etag:
+        response.headers.setdefault('ETag', etag)
+    response['Last-Modified'] = http_date(last_modified)
+    response['Accept-Ranges'] = 'bytes'
+    response['X-Content-Type-Options'] = 'nosniff'
+    if response.status_code in (200, 206):
+        response['Content-Type'] = content_type
+        if not content_type.startswith(INLINE_TYPES):
+            response['Content-Disposition'] = 'attachment'
+    max_age = getattr(settings, 'MEDIA_CACHE_MAX_AGE', 60 * 60)
+    if not public:
+        response['Cache-Control'] = 'private, max-age=0, must-revalidate'
+    elif blob_sha256(path):
+        # Un blob nunca cambia de contenido: sin revalidar mientras dure
+        response['Cache-Control'] = f'public, max-age={max_age}, immutable'
+    else:
+        response['Cache-Control'] = f'public, max-age={max_age}'
+    return response
+
+
+def build_response(request, path, storage, size, etag, last_modified):
+    if getattr(settings, 'MEDIA_SENDFILE', None):
+        # nginx/Apache resuelven también Range sobre el archivo
+        return offload(path, storage)
+
+    byte_range = None
+    if 'Range' in request.headers and if_range_matches(request, etag, last_modified):
+        try:
+            byte_range = parse_range(request.headers['Range'], size)
+        except ValueError:
+            response = HttpResponse(status=416)
+            response['Content-Range'] = f'bytes */{size}'
+            return response
+
+    if byte_range is None:
+        if request.method == 'HEAD':
+            response = HttpResponse()
+            response['Content-Length'] = size
+            return response
+        return FileResponse(storage.open(path, 'rb'))
+
+    start, end = byte_range
+    length = end - start + 1
+    if request.method == 'HEAD':
+        response = HttpResponse(status=206)
+    else:
+        response = StreamingHttpResponse(
+            range_iterator(storage.open(path, 'rb'), start, length), status=206)
+    response['Content-Length'] = length
+    response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    return response
+
+
+def if_range_matches(request, etag, last_modified):
+    """Sin If-Range, o con el ETag o la fecha actuales: se aplica el rango."""
+    if_range = request.headers.get('If-Range')
+    if not if_range:
+        return True
+    if if_range.startswith('"') or if_range.startswith('W/'):
+        return etag is not None and if_range == etag
+    return parse_http_date_safe(if_range) == last_modified
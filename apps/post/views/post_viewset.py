@@ -6,46 +6,105 @@ from rest_framework.exceptions import PermissionDenied
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 from django_filters.rest_framework import DjangoFilterBackend
+from django.db.models import Prefetch
 from apps.core.views.base_viewset import BaseModelViewSet
+from apps.core.views.sparse_fieldsets import SparseFieldsetMixin
+from apps.core.views.export import ExportMixin
 from apps.post.models.post import Post
+from apps.post.models.contenido_multimedia import ContenidoMultimedia
 from apps.post.serializers.post_serializer import (
     PostListSerializer,
     PostDetailSerializer,
-    PostCreateUpdateSerializer
+    PostCreateUpdateSerializer,
+    PostBulkSerializer,
+    PostBulkIdsSerializer
 )
+from apps.post.bulk import bulk_create_posts, bulk_update_posts, bulk_set_state, get_max_items
 from apps.post.filters import PostFilter
-from apps.post.pagination import StandardResultsSetPagination
-from apps.post.permissions import IsWriter
+from apps.post.cache import PostResponseCacheMixin
+from apps.post.search import search_posts
+from apps.post.negotiation import ContentFormatNegotiation
+from apps.post.pagination import StandardResultsSetPagination, get_post_pagination_class
+from apps.post.permissions import IsWriter, get_visible_posts
 
 
-class PostViewSet(BaseModelViewSet):
+class PostViewSet(PostResponseCacheMixin, SparseFieldsetMixin, ExportMixin, BaseModelViewSet):
     serializer_class = PostListSerializer
     permission_classes = [IsAuthenticated]
     pagination_class = StandardResultsSetPagination
     filter_backends = [DjangoFilterBackend]
     filterset_class = PostFilter
+    content_negotiation_class = ContentFormatNegotiation
+    projection_actions = ('list', 'retrieve', 'search')
+    # Necesario para los cursores de la paginación keyset
+    projection_extra_fields = ('fecha_publicacion',)
+    # Consultas máximas por acción (ver QueryBudgetMiddleware): token sin
+    # cachear (2), las de la acción (2) y la recarga del catálogo de
+    # categorías, que cualquier publicación o archivado invalida
+    query_budgets = {'list': 5, 'retrieve': 5, 'search': 5}
+    export_filename = 'articulos'
+    export_fields = {
+        'id': 'id',
+        'titulo': 'titulo',
+        'slug': 'slug',
+        'categoria_id': 'category_id',
+        'categoria': 'category__name',
+        'autor_id': 'autor_id',
+        'autor_usuario': 'autor__username',
+        'summary': 'summary',
+        'description': 'description',
+        'estado': 'estado',
+        'fecha_publicacion': 'fecha_publicacion',
+        'palabras_clave': 'palabras_clave',
+        'created_date': 'created_date',
+        'updated_date': 'updated_date',
+    }
 
-    def get_queryset(self):
-        user = self.request.user
+    @property
+    def paginator(self):
+        # La clase de paginación depende de la petición (page o cursor)
+        if not hasattr(self, '_paginator'):
+            if getattr(self, 'action', None) == 'search':
+                # Los resultados se ordenan por relevancia, no por fecha
+                self._paginator = StandardResultsSetPagination()
+            else:
+                self._paginator = get_post_pagination_class(
+                    getattr(self, 'request', None))()
+        return self._paginator
 
-        if not user.is_authenticated:
-            return Post.objects.none()
+    def get_visible_queryset(self):
+        return get_visible_posts(self.request.user)
 
-        # Admin puede ver todo
-        if user.is_superuser or user.is_staff:
-            return Post.objects.all().select_related('autor', 'category')
+    def get_queryset(self):
+        # El nombre de la categoría sale del catálogo en memoria (CategoriaNombreField)
+        queryset = self.get_visible_queryset().select_related('autor')
 
-        # Escritor solo ve sus artículos
-        if user.is_writer:
-            return Post.objects.filter(autor=user, is_active=True).select_related('autor', 'category')
+        # El detalle incluye la multimedia: se trae en una sola consulta
+        if self.action == 'retrieve':
+            queryset = queryset.prefetch_related(self.get_prefetch('multimedia'))
+        return queryset
 
-        # Usuario común solo ve artículos publicados
-        return Post.objects.filter(estado='publicado', is_active=True).select_related('autor', 'category')
+    def get_prefetch(self, lookup):
+        if lookup == 'multimedia':
+            return Prefetch('multimedia', queryset=ContenidoMultimedia.objects.order_by('id'))
+        return super().get_prefetch(lookup)
+
+    def get_serializer_class(self):
+        if self.action in ['create', 'update', 'partial_update']:
+            return PostCreateUpdateSerializer
+        if self.action == 'bulk':
+            return PostBulkSerializer
+        if self.action in ['bulk_archive', 'bulk_reactivate']:
+            return PostBulkIdsSerializer
+        if self.action == 'retrieve':
+            return PostDetailSerializer
+        return PostListSerializer
 
     def get_permissions(self):
-        if self.action in ['create', 'update', 'partial_update', 'destroy']:
+        if self.action in ['create', 'update', 'partial_update', 'destroy',
+                           'bulk', 'bulk_archive', 'bulk_reactivate']:
             self.permission_classes = [IsWriter, IsAdminUser]
-        elif self.action in ['list', 'retrieve']:
+        elif self.action in ['list', 'retrieve', 'export']:
             self.permission_classes = [IsAuthenticated]
         return super().get_permissions()
 
@@ -64,7 +123,9 @@ class PostViewSet(BaseModelViewSet):
         operation_description="Lista todos los artículos con opciones de filtrado",
         manual_parameters=[
             openapi.Parameter('autor_nombre', openapi.IN_QUERY,
-                              description="Buscar por nombre o apellido del autor", type=openapi.TYPE_STRING),
+                              description="Buscar por nombre o apellido del autor (sin distinguir acentos)", type=openapi.TYPE_STRING),
+            openapi.Parameter('autor_prefijo', openapi.IN_QUERY,
+                              description="Buscar autores cuyo nombre o apellido empieza por el texto", type=openapi.TYPE_STRING),
             openapi.Parameter('fecha_publicacion', openapi.IN_QUERY,
                               description="Buscar por fecha de publicación (YYYY-MM-DD)", type=openapi.TYPE_STRING),
             openapi.Parameter('categoria', openapi.IN_QUERY,
@@ -73,6 +134,18 @@ class PostViewSet(BaseModelViewSet):
                               description="Número de página", type=openapi.TYPE_INTEGER),
             openapi.Parameter('page_size', openapi.IN_QUERY,
                               description="Tamaño de página", type=openapi.TYPE_INTEGER),
+            openapi.Parameter('pagination', openapi.IN_QUERY,
+                              description="Modo de paginación: 'page' o 'cursor'", type=openapi.TYPE_STRING,
+                              enum=['page', 'cursor']),
+            openapi.Parameter('cursor', openapi.IN_QUERY,
+                              description="Cursor opaco devuelto en next/previous (modo cursor)", type=openapi.TYPE_STRING),
+            openapi.Parameter('count', openapi.IN_QUERY,
+                              description="Conteo total en modo cursor: 'none', 'approx' o 'exact'", type=openapi.TYPE_STRING,
+                              enum=['none', 'approx', 'exact']),
+            openapi.Parameter('fields', openapi.IN_QUERY,
+                              description="Campos a incluir, separados por comas", type=openapi.TYPE_STRING),
+            openapi.Parameter('exclude', openapi.IN_QUERY,
+                              description="Campos a excluir, separados por comas", type=openapi.TYPE_STRING),
         ],
         responses={
             200: openapi.Response("Respuesta paginada", PostListSerializer(many=True)),
@@ -80,10 +153,20 @@ class PostViewSet(BaseModelViewSet):
         }
     )
     def list(self, request, *args, **kwargs):
-        return super().list(request, *args, **kwargs)
+        return self.cached_response(
+            request, lambda: super(PostViewSet, self).list(request, *args, **kwargs))
 
     @swagger_auto_schema(
         operation_description="Obtiene detalles de un artículo específico",
+        manual_parameters=[
+            openapi.Parameter('format', openapi.IN_QUERY,
+                              description="Formato del contenido: 'markdown' (por defecto) o 'html' ya renderizado",
+                              type=openapi.TYPE_STRING, enum=['markdown', 'html']),
+            openapi.Parameter('fields', openapi.IN_QUERY,
+                              description="Campos a incluir, separados por comas", type=openapi.TYPE_STRING),
+            openapi.Parameter('exclude', openapi.IN_QUERY,
+                              description="Campos a excluir, separados por comas", type=openapi.TYPE_STRING),
+        ],
         responses={
             200: PostDetailSerializer(),
             404: "Artículo no encontrado",
@@ -91,7 +174,8 @@ class PostViewSet(BaseModelViewSet):
         }
     )
     def retrieve(self, request, *args, **kwargs):
-        return super().retrieve(request, *args, **kwargs)
+        return self.cached_response(
+            request, lambda: super(PostViewSet, self).retrieve(request, *args, **kwargs))
 
     @swagger_auto_schema(
         operation_description="Crea un nuevo artículo asignando automáticamente al autor actual",
@@ -178,9 +262,230 @@ class PostViewSet(BaseModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         post.estado = 'publicado'
+        post.is_active = True
+        post.deleted_by = None
+        post.deleted_date = None
         post.save()
         serializer = self.get_serializer(post)
         return Response(
             {"message": "Artículo reactivado exitosamente", "data": serializer.data},
             status=status.HTTP_200_OK
         )
+
+    @swagger_auto_schema(
+        operation_description="Búsqueda de texto completo en título, resumen, contenido y palabras clave, ordenada por relevancia",
+        manual_parameters=[
+            openapi.Parameter('q', openapi.IN_QUERY,
+                              description="Texto a buscar", type=openapi.TYPE_STRING, required=True),
+            openapi.Parameter('page', openapi.IN_QUERY,
+                              description="Número de página", type=openapi.TYPE_INTEGER),
+            openapi.Parameter('page_size', openapi.IN_QUERY,
+                              description="Tamaño de página", type=openapi.TYPE_INTEGER),
+            openapi.Parameter('fields', openapi.IN_QUERY,
+                              description="Campos a incluir, separados por comas", type=openapi.TYPE_STRING),
+            openapi.Parameter('exclude', openapi.IN_QUERY,
+                              description="Campos a excluir, separados por comas", type=openapi.TYPE_STRING),
+        ],
+        responses={
+            200: openapi.Response("Respuesta paginada", PostListSerializer(many=True)),
+            400: "Falta el parámetro q"
+        }
+    )
+    @action(detail=False, methods=['get'])
+    def search(self, request):
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response(
+                {"message": "Debe indicar el texto a buscar en el parámetro q"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        queryset = search_posts(
+            self.filter_queryset(self.get_queryset()), query)
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    @swagger_auto_schema(
+        operation_description="Exporta todos los artículos visibles (con los mismos filtros que el listado) en NDJSON o CSV, sin paginar",
+        manual_parameters=[
+            openapi.Parameter('formato', openapi.IN_QUERY,
+                              description="Formato de salida: 'ndjson' (por defecto) o 'csv'", type=openapi.TYPE_STRING,
+                              enum=['ndjson', 'csv']),
+            openapi.Parameter('fields', openapi.IN_QUERY,
+                              description="Columnas a exportar, separadas por comas", type=openapi.TYPE_STRING),
+            openapi.Parameter('autor_nombre', openapi.IN_QUERY,
+                              description="Buscar por nombre o apellido del autor (sin distinguir acentos)", type=openapi.TYPE_STRING),
+            openapi.Parameter('autor_prefijo', openapi.IN_QUERY,
+                              description="Buscar autores cuyo nombre o apellido empieza por el texto", type=openapi.TYPE_STRING),
+            openapi.Parameter('fecha_publicacion', openapi.IN_QUERY,
+                              description="Buscar por fecha de publicación (YYYY-MM-DD)", type=openapi.TYPE_STRING),
+            openapi.Parameter('categoria', openapi.IN_QUERY,
+                              description="Buscar por ID de categoría", type=openapi.TYPE_INTEGER),
+        ],
+        responses={
+            200: "Fichero NDJSON o CSV enviado por streaming",
+            400: "Formato o campos no válidos",
+            403: "No tienes permiso para realizar esta acción"
+        }
+    )
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        return self.export_response(self.filter_queryset(self.get_queryset()))
+
+    def can_edit(self, post):
+        user = self.request.user
+        return user.is_superuser or post.autor_id == user.id
+
+    def get_bulk_instances(self, ids):
+        return self.get_visible_queryset().select_related('autor').in_bulk(ids)
+
+    def bulk_response(self, message, results):
+        errors = sum(1 for item in results if item['status'] == 'error')
+        if not errors:
+            code = status.HTTP_201_CREATED if self.request.method == 'POST' and \
+                self.action == 'bulk' else status.HTTP_200_OK
+        elif errors == len(results):
+            code = status.HTTP_400_BAD_REQUEST
+        else:
+            code = status.HTTP_207_MULTI_STATUS
+        return Response(
+            {"message": message, "total": len(results), "errors": errors,
+             "results": results},
+            status=code
+        )
+
+    @swagger_auto_schema(
+        method='post',
+        operation_description="Crea varios artículos. Cada elemento se valida por separado y la respuesta indica el resultado de cada uno",
+        request_body=PostBulkSerializer(many=True),
+        responses={
+            201: "Todos los artículos creados",
+            207: "Algunos artículos no se crearon (ver results)",
+            400: "Ningún artículo es válido o el lote supera POST_BULK_MAX_ITEMS",
+            403: "No tienes permiso para realizar esta acción"
+        }
+    )
+    @swagger_auto_schema(
+        method='patch',
+        operation_description="Actualiza parcialmente varios artículos; cada elemento debe incluir su id",
+        request_body=PostBulkSerializer(many=True),
+        responses={
+            200: "Todos los artículos actualizados",
+            207: "Algunos artículos no se actualizaron (ver results)",
+            400: "Ningún artículo es válido o el lote supera POST_BULK_MAX_ITEMS",
+            403: "No tienes permiso para realizar esta acción"
+        }
+    )
+    @action(detail=False, methods=['post', 'patch'])
+    def bulk(self, request):
+        if not isinstance(request.data, list):
+            return Response(
+                {"message": "Se esperaba una lista de artículos"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        max_items = get_max_items()
+        if len(request.data) > max_items:
+            # Antes de validar o cargar nada
+            return Response(
+                {"message": f"Se admiten como máximo {max_items} artículos por petición"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        if request.method == 'POST':
+            serializer = self.get_serializer(data=request.data, many=True, max_length=max_items)
+            serializer.is_valid()
+            done, failed = bulk_create_posts(
+                serializer.validated_data, request.user,
+                self.get_audit_values('created'))
+            ok_status, message = 'created', "Creación masiva de artículos"
+        else:
+            ids = [str(item.get('id')) for item in request.data if isinstance(item, dict)]
+            instances = self.get_bulk_instances(
+                [int(pk) for pk in ids if pk.isdigit()])
+            serializer = self.get_serializer(
+                instances, data=request.data, many=True, partial=True, max_length=max_items)
+            serializer.is_valid()
+            items = []
+            for index, data in serializer.validated_data:
+                if self.can_edit(serializer.item_instances[index]):
+                    items.append((index, data))
+                else:
+                    serializer.item_errors[index] = {
+                        'detail': "No puedes editar artículos que no son tuyos."}
+            done, failed = bulk_update_posts(
+                items, serializer.item_instances, self.get_audit_values('updated'))
+            ok_status, message = 'updated', "Actualización masiva de artículos"
+
+        serializer.item_errors.update(failed)
+        results = []
+        for index in range(len(request.data)):
+            if index in done:
+                results.append({'index': index, 'id': done[index].pk, 'status': ok_status})
+            else:
+                results.append({'index': index, 'status': 'error',
+                                'errors': serializer.item_errors.get(index)})
+        return self.bulk_response(message, results)
+
+    def bulk_state_change(self, request, allowed, values, ok_status, message):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = list(dict.fromkeys(serializer.validated_data['ids']))
+        instances = self.get_bulk_instances(ids)
+
+        results, posts = [], []
+        for pk in ids:
+            post = instances.get(pk)
+            if post is None:
+                error = "Artículo no encontrado"
+            elif not self.can_edit(post):
+                error = "No puedes modificar artículos que no son tuyos."
+            elif post.estado not in allowed:
+                error = "El artículo no está en un estado válido para esta operación"
+            else:
+                posts.append(post)
+                results.append({'id': pk, 'status': ok_status})
+                continue
+            results.append({'id': pk, 'status': 'error', 'errors': {'detail': error}})
+
+        failed = bulk_set_state(posts, values)
+        for result in results:
+            if result['id'] in failed:
+                result.update(status='error', errors=failed[result['id']])
+        return self.bulk_response(message, results)
+
+    @swagger_auto_schema(
+        operation_description="Archiva varios artículos (eliminación lógica)",
+        request_body=PostBulkIdsSerializer,
+        responses={
+            200: "Todos los artículos archivados",
+            207: "Algunos artículos no se archivaron (ver results)",
+            400: "Ningún artículo se pudo archivar o el lote supera POST_BULK_MAX_ITEMS",
+            403: "No tienes permiso para realizar esta acción"
+        }
+    )
+    @action(detail=False, methods=['post'], url_path='bulk-archive')
+    def bulk_archive(self, request):
+        audit = self.get_audit_values('deleted')
+        values = dict(audit, estado='archivado', is_active=False,
+                      updated_date=audit['deleted_date'])
+        return self.bulk_state_change(
+            request, ('borrador', 'publicado'), values, 'archived',
+            "Archivado masivo de artículos")
+
+    @swagger_auto_schema(
+        operation_description="Reactiva varios artículos archivados",
+        request_body=PostBulkIdsSerializer,
+        responses={
+            200: "Todos los artículos reactivados",
+            207: "Algunos artículos no se reactivaron (ver results)",
+            400: "Ningún artículo se pudo reactivar o el lote supera POST_BULK_MAX_ITEMS",
+            403: "No tienes permiso para realizar esta acción"
+        }
+    )
+    @action(detail=False, methods=['post'], url_path='bulk-reactivate')
+    def bulk_reactivate(self, request):
+        values = dict(self.get_audit_values('updated'), estado='publicado',
+                      is_active=True, deleted_by=None, deleted_date=None)
+        return self.bulk_state_change(
+            request, ('archivado',), values, 'reactivated',
+            "Reactivación masiva de artículos")
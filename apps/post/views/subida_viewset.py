@@ -0,0 +1,137 @@
+from rest_framework import mixins, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from drf_yasg.utils import swagger_auto_schema
+from drf_yasg import openapi
+
+from apps.core.views.base_viewset import get_user_fullname
+from apps.post.models.subida import SubidaMultimedia
+from apps.post.serializers.cont_mult_serializer import MultimediaListSerializer
+from apps.post.serializers.subida_serializer import SubidaCreateSerializer, SubidaSerializer
+from apps.post.uploads import (
+    OffsetConflict, UploadError, append_chunk, complete_upload, discard_upload, get_expiration
+)
+from django.utils import timezone
+
+
+class SubidaMultimediaViewSet(mixins.RetrieveModelMixin, viewsets.GenericViewSet):
+    """
+    Subidas reanudables de archivos grandes para ContenidoMultimedia:
+
+    1. POST /subidas/ declara el archivo (nombre, tamaño, sha256).
+    2. PATCH /subidas/{id}/ envía cada parte en el cuerpo, en bruto, con la
+       cabecera Upload-Offset; tras un corte, GET /subidas/{id}/ devuelve el
+       offset desde el que continuar.
+    3. POST /subidas/{id}/completar/ verifica el sha256 y crea el contenido.
+    """
+    serializer_class = SubidaSerializer
+    permission_classes = [IsAdminUser]
+
+    def get_queryset(self):
+        if getattr(self, 'swagger_fake_view', False):  # generación del esquema (anónima)
+            return SubidaMultimedia.objects.none()
+        return SubidaMultimedia.objects.filter(
+            usuario=self.request.user, expira__gt=timezone.now())
+
+    @swagger_auto_schema(
+        operation_description="Inicia una subida por partes",
+        request_body=SubidaCreateSerializer,
+        responses={
+            201: SubidaSerializer(),
+            400: "Datos inválidos",
+            403: "No tienes permiso para realizar esta acción"
+        }
+    )
+    def create(self, request, *args, **kwargs):
+        serializer = SubidaCreateSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(
+                {"message": "Error al iniciar la subida", "errors": serializer.errors},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        subida = serializer.save(usuario=request.user, expira=get_expiration())
+        return Response(SubidaSerializer(subida).data, status=status.HTTP_201_CREATED)
+
+    @swagger_auto_schema(
+        operation_description="Estado de la subida: offset desde el que continuar",
+        responses={200: SubidaSerializer(), 404: "Subida no encontrada o caducada"}
+    )
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
+    @swagger_auto_schema(
+        operation_description=(
+            "Añade una parte. El cuerpo es el contenido en bruto "
+            "(application/offset+octet-stream) y se escribe directamente en el "
+            "almacenamiento"),
+        manual_parameters=[
+            openapi.Parameter('Upload-Offset', openapi.IN_HEADER, required=True,
+                              description="Posición de la parte en el archivo", type=openapi.TYPE_INTEGER),
+            openapi.Parameter('Upload-Checksum', openapi.IN_HEADER,
+                              description="sha256 en hexadecimal de la parte (opcional)", type=openapi.TYPE_STRING),
+        ],
+        request_body=openapi.Schema(type=openapi.TYPE_STRING, format=openapi.FORMAT_BINARY),
+        responses={
+            200: SubidaSerializer(),
+            400: "Parte inválida",
+            404: "Subida no encontrada o caducada",
+            409: "El offset no coincide con lo ya recibido"
+        }
+    )
+    def partial_update(self, request, *args, **kwargs):
+        subida = self.get_object()
+        try:
+            offset = int(request.headers['Upload-Offset'])
+            length = int(request.headers['Content-Length'])
+        except (KeyError, ValueError):
+            return Response(
+                {"message": "Se requieren las cabeceras Upload-Offset y Content-Length"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            # request.stream: el cuerpo sin pasar por los parsers de DRF
+            subida = append_chunk(subida, offset, request.stream, length,
+                                  request.headers.get('Upload-Checksum'))
+        except OffsetConflict as exc:
+            return Response(
+                {"message": "El offset no coincide con lo ya recibido", "offset": exc.args[0]},
+                status=status.HTTP_409_CONFLICT
+            )
+        except UploadError as exc:
+            return Response({"message": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(SubidaSerializer(subida).data)
+
+    @swagger_auto_schema(
+        operation_description="Cancela la subida y borra las partes recibidas",
+        responses={204: "Subida cancelada", 404: "Subida no encontrada o caducada"}
+    )
+    def destroy(self, request, *args, **kwargs):
+        discard_upload(self.get_object())
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    @swagger_auto_schema(
+        method='post',
+        operation_description=(
+            "Une las partes, verifica el sha256 declarado y crea el contenido "
+            "multimedia (que se procesa en segundo plano)"),
+        request_body=openapi.Schema(type=openapi.TYPE_OBJECT, properties={}),
+        responses={
+            201: MultimediaListSerializer(),
+            400: "Subida incompleta o sha256 distinto",
+            404: "Subida no encontrada o caducada"
+        }
+    )
+    @action(detail=True, methods=['post'])
+    def completar(self, request, pk=None):
+        subida = self.get_object()
+        audit = {'created_by': get_user_fullname(request.user)}
+        try:
+            multimedia = complete_upload(subida, audit)
+        except UploadError as exc:
+            return Response({"message": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(
+            {"message": "Contenido multimedia creado exitosamente",
+                "data": MultimediaListSerializer(multimedia, context={'request': request}).data},
+            status=status.HTTP_201_CREATED
+        )
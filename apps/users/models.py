@@ -1,18 +1,23 @@
 from django.db import models
 from django.contrib.auth.models import AbstractUser
-from apps.core.models import AuditableMixins
+from apps.core.models import AuditableMixins, ManagedFieldsMixin
 from .validators import *
 
 # Create your models here.
 
 
-class User(AuditableMixins, AbstractUser):
+class User(ManagedFieldsMixin, AuditableMixins, AbstractUser):
     email = models.EmailField(max_length=255, unique=True)
     username = models.CharField(max_length=255, unique=True)
     first_name = models.CharField(max_length=255)
     last_name = models.CharField(max_length=255)
     is_active = models.BooleanField(default=True)
     is_writer = models.BooleanField(default=False)
+    # Artículos publicados y activos, mantenidos por apps.post.counters
+    num_publicados = models.PositiveIntegerField(default=0, editable=False)
+    ultima_publicacion = models.DateTimeField(null=True, blank=True, editable=False)
+
+    managed_fields = ('num_publicados', 'ultima_publicacion')
 
     class Meta:
         verbose_name = 'Usuario'
@@ -24,6 +29,28 @@ class User(AuditableMixins, AbstractUser):
     def __str__(self):
         return f'{self.first_name} {self.last_name}'
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Valores leídos de la BD, para detectar cambios de nombre al guardar
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    def name_changed(self):
+        if self._state.adding:
+            return False
+        loaded = getattr(self, '_loaded_values', {})
+        if 'first_name' not in loaded or 'last_name' not in loaded:
+            return True  # leído sin los nombres: no se sabe
+        return (loaded['first_name'], loaded['last_name']) != (self.first_name, self.last_name)
+
+    def save(self, *args, **kwargs):
+        # Los artículos guardan el nombre del autor (señal post_save)
+        self._name_changed = self.name_changed()
+        super().save(*args, **kwargs)
+        self._loaded_values = dict(getattr(self, '_loaded_values', {}),
+                                   first_name=self.first_name, last_name=self.last_name)
+
     def clean(self):
         super().clean()
         # Validar formato del email
@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from django.contrib.auth.hashers import make_password, check_password
+from apps.authentication.hashing import check_password, make_password
 from apps.users.models import User
 from apps.core.serializers.base_serializer import AuditableSerializerMixin
 from ..validators import validate_email_address, validate_password_strength
@@ -88,8 +88,10 @@ class UserUpdateSerializer(UserCreateSerializer):
         instance.is_writer = validated_data.get(
             'is_writer', instance.is_writer)
 
+        update_fields = ['first_name', 'last_name', 'is_writer', 'updated_date']
         if 'new_password' in validated_data:
-            instance.set_password(validated_data['new_password'])
+            instance.password = make_password(validated_data['new_password'])
+            update_fields.append('password')
 
-        instance.save()
+        instance.save(update_fields=update_fields)
         return instance
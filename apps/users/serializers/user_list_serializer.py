@@ -13,6 +13,8 @@ class UserListSerializer(AuditableSerializerMixin, serializers.ModelSerializer):
             'first_name',
             'last_name',
             'is_writer',
+            'num_publicados',
+            'ultima_publicacion',
             'created_date',
             'created_by',
             'updated_date',
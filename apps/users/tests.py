@@ -1,3 +1,132 @@
+from unittest import mock
+
+from django.core.cache import caches
 from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.authentication import authentication
+from apps.authentication.models import AuthToken
+from apps.post.catalog import get_catalog
+from apps.post.models.categoria import Categoria
+from apps.post.models.post import Post
+from apps.users.models import User
+
+
+class UserApiTestCase(TestCase):
+
+    def setUp(self):
+        for cache in caches.all():
+            cache.clear()
+        authentication._token_cache = None
+        get_catalog().clear()
+        self.writer = User.objects.create(
+            username='writer', email='writer@example.com', first_name='Ana',
+            last_name='Autora', is_writer=True)
+        self.categoria = Categoria.objects.create(name='Tech')
+        _, key = AuthToken.objects.create_token(self.writer)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {key}')
+
+    def publish(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Post.objects.create(
+                autor=self.writer, category=self.categoria, titulo='Artículo publicado',
+                description='d', contenido='texto', estado='publicado',
+                fecha_publicacion=timezone.now())
+
+
+class PerfilCountersTests(UserApiTestCase):
+    """Los contadores de publicados no se pisan al guardar el perfil."""
+
+    def test_profile_update_keeps_counters(self):
+        # Cachea el usuario del token antes de publicar
+        self.assertEqual(self.client.get('/api/users/perfil/').status_code, 200)
+        self.publish()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.put('/api/users/perfil/update/', {
+                'first_name': 'Ana María', 'last_name': 'Autora'}, format='json')
+        self.assertEqual(response.status_code, 200)
+
+        self.writer.refresh_from_db()
+        self.assertEqual(self.writer.first_name, 'Ana María')
+        self.assertEqual(self.writer.num_publicados, 1)
+        self.assertIsNotNone(self.writer.ultima_publicacion)
+
+    def test_password_change_keeps_counters(self):
+        self.writer.set_password('Anterior-123!')
+        self.writer.save(update_fields=['password'])
+        self.assertEqual(self.client.get('/api/users/perfil/').status_code, 200)
+        self.publish()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/users/perfil/change-password/', {
+                'old_password': 'Anterior-123!', 'new_password': 'Nueva-Clave-456!'},
+                format='json')
+        self.assertEqual(response.status_code, 200)
+
+        self.writer.refresh_from_db()
+        self.assertTrue(self.writer.check_password('Nueva-Clave-456!'))
+        self.assertEqual(self.writer.num_publicados, 1)
+
+    def test_save_without_update_fields_skips_counters(self):
+        stale = User.objects.get(pk=self.writer.pk)
+        self.publish()
+        stale.first_name = 'Otra'
+        stale.save()
+
+        self.writer.refresh_from_db()
+        self.assertEqual(self.writer.first_name, 'Otra')
+        self.assertEqual(self.writer.num_publicados, 1)
+
+
+class AuthorNameTests(UserApiTestCase):
+    """Post.autor_nombre y el sello 'autores' solo cambian con los nombres."""
+
+    def setUp(self):
+        super().setUp()
+        self.publish()
+
+    def update_perfil(self, **values):
+        data = dict({'first_name': 'Ana', 'last_name': 'Autora'}, **values)
+        with mock.patch('apps.post.signals.invalidate_authors') as invalidate, \
+                self.captureOnCommitCallbacks(execute=True):
+            response = self.client.put('/api/users/perfil/update/', data, format='json')
+        self.assertEqual(response.status_code, 200)
+        return invalidate
+
+    def autor_nombre(self):
+        return Post.objects.get(autor=self.writer).autor_nombre
+
+    def test_save_without_name_change_leaves_posts(self):
+        self.assertFalse(self.update_perfil().called)
+        with mock.patch('apps.post.signals.invalidate_authors') as invalidate:
+            writer = User.objects.get(pk=self.writer.pk)
+            writer.is_writer = True
+            writer.save()
+        self.assertFalse(invalidate.called)
+
+    def test_name_change_updates_posts(self):
+        self.assertTrue(self.update_perfil(last_name='Álvarez').called)
+        self.assertEqual(self.autor_nombre(), 'ana alvarez')
+
+    def test_display_only_change_invalidates_authors(self):
+        self.assertTrue(self.update_perfil(first_name='ANA').called)
+        self.assertEqual(self.autor_nombre(), 'ana autora')
+
+
+
+class AsyncPerfilTests(UserApiTestCase):
+
+    async def test_perfil(self):
+        _, key = await AuthToken.objects.acreate_token(self.writer)
+        response = await self.async_client.get(
+            '/api/async/perfil/', headers={'Authorization': f'Token {key}'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['username'], 'writer')
+        self.assertEqual(response.json()['first_name'], 'Ana')
 
-# Create your tests here.
+    async def test_requires_authentication(self):
+        response = await self.async_client.get('/api/async/perfil/')
+        self.assertEqual(response.status_code, 401)
@@ -24,6 +24,7 @@ router.register(r'users', UserViewSet, basename='user')
 # - PATCH    /api/users/{id}/
 # - DELETE   /api/users/{id}/
 # - POST     /api/users/{id}/activate/
+# - GET      /api/users/export/
 
 
 urlpatterns = [
@@ -0,0 +1,8 @@
+from apps.core.views.async_api import async_api_view
+from apps.users.serializers.perfil_serializer import PerfilSerializer
+
+
+# Versión async de PerfilView: el usuario ya viene de la autenticación
+@async_api_view()
+async def perfil(request):
+    return PerfilSerializer(request.user).data
@@ -12,6 +12,8 @@ from apps.users.models import User
 from apps.users.serializers.perfil_serializer import PerfilSerializer
 from apps.users.serializers.user_create_update_serializer import UserUpdateSerializer
 from apps.users.validators import validate_password_strength
+from apps.authentication.hashing import check_password, make_password
+from apps.authentication.models import AuthToken
 
 
 # ===== Vista para obtener el perfil =====
@@ -103,10 +105,10 @@ class CambiarPasswordView(APIView):
 
         usuario = request.user
 
-        if not usuario.check_password(old_password):
+        if not check_password(old_password, usuario.password):
             raise PermissionDenied("La contraseña actual es incorrecta.")
 
-        if usuario.check_password(new_password):
+        if check_password(new_password, usuario.password):
             raise ValidationError(
                 "La nueva contraseña debe ser diferente a la anterior")
 
@@ -115,8 +117,14 @@ class CambiarPasswordView(APIView):
         except ValidationError as e:
             raise ValidationError({"password": e.detail}) from e
 
-        usuario.set_password(new_password)
-        usuario.save()
+        usuario.password = make_password(new_password)
+        usuario.save(update_fields=['password', 'updated_date'])
+
+        # Se revocan las demás sesiones; la actual sigue siendo válida
+        tokens = AuthToken.objects.filter(user=usuario)
+        if isinstance(request.auth, AuthToken):
+            tokens = tokens.exclude(digest=request.auth.digest)
+        tokens.delete()
 
         return Response(
             {"message": "Contraseña actualizada exitosamente"},
@@ -12,11 +12,29 @@ from apps.users.serializers.user_list_serializer import UserListSerializer
 
 # Desde core
 from apps.core.views.base_viewset import BaseModelViewSet
+from apps.core.views.sparse_fieldsets import SparseFieldsetMixin
+from apps.core.views.export import ExportMixin
 
 
-class UserViewSet(BaseModelViewSet):
+class UserViewSet(SparseFieldsetMixin, ExportMixin, BaseModelViewSet):
     queryset = User.objects.filter(is_active=True)
     permission_classes = [IsAuthenticated]
+    # Consultas máximas por acción (ver QueryBudgetMiddleware)
+    query_budgets = {'list': 3, 'retrieve': 3}
+    export_filename = 'usuarios'
+    export_fields = {
+        'id': 'id',
+        'username': 'username',
+        'email': 'email',
+        'first_name': 'first_name',
+        'last_name': 'last_name',
+        'is_writer': 'is_writer',
+        'is_staff': 'is_staff',
+        'date_joined': 'date_joined',
+        'last_login': 'last_login',
+        'created_date': 'created_date',
+        'updated_date': 'updated_date',
+    }
 
     def get_serializer_class(self):
         if self.action == 'create':
@@ -32,6 +50,12 @@ class UserViewSet(BaseModelViewSet):
 
     @swagger_auto_schema(
         operation_description="Lista todos los usuarios activos",
+        manual_parameters=[
+            openapi.Parameter('fields', openapi.IN_QUERY,
+                              description="Campos a incluir, separados por comas", type=openapi.TYPE_STRING),
+            openapi.Parameter('exclude', openapi.IN_QUERY,
+                              description="Campos a excluir, separados por comas", type=openapi.TYPE_STRING),
+        ],
         responses={
             200: UserListSerializer(many=True),
             403: "No tienes permiso para realizar esta acción"
@@ -42,6 +66,12 @@ class UserViewSet(BaseModelViewSet):
 
     @swagger_auto_schema(
         operation_description="Obtiene detalles de un usuario específico",
+        manual_parameters=[
+            openapi.Parameter('fields', openapi.IN_QUERY,
+                              description="Campos a incluir, separados por comas", type=openapi.TYPE_STRING),
+            openapi.Parameter('exclude', openapi.IN_QUERY,
+                              description="Campos a excluir, separados por comas", type=openapi.TYPE_STRING),
+        ],
         responses={
             200: UserListSerializer(),
             404: "Usuario no encontrado",
@@ -137,3 +167,22 @@ class UserViewSet(BaseModelViewSet):
                 "data": UserListSerializer(user).data},
             status=status.HTTP_200_OK
         )
+
+    @swagger_auto_schema(
+        operation_description="Exporta todos los usuarios activos en NDJSON o CSV, sin paginar",
+        manual_parameters=[
+            openapi.Parameter('formato', openapi.IN_QUERY,
+                              description="Formato de salida: 'ndjson' (por defecto) o 'csv'", type=openapi.TYPE_STRING,
+                              enum=['ndjson', 'csv']),
+            openapi.Parameter('fields', openapi.IN_QUERY,
+                              description="Columnas a exportar, separadas por comas", type=openapi.TYPE_STRING),
+        ],
+        responses={
+            200: "Fichero NDJSON o CSV enviado por streaming",
+            400: "Formato o campos no válidos",
+            403: "No tienes permiso para realizar esta acción"
+        }
+    )
+    @action(detail=False, methods=['get'], permission_classes=[IsAdminUser])
+    def export(self, request):
+        return self.export_response(self.filter_queryset(self.get_queryset()))
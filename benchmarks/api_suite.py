@@ -0,0 +1,369 @@
+"""
+Suite de rendimiento de la API con datos sembrados y comparación con una línea base.
+
+Siembra (una vez) usuarios, escritores, categorías, artículos con contenido
+Markdown y filas de multimedia, marcados con created_by='benchmark', y mide
+los endpoints reales:
+
+- cliente: cada escenario con el cliente de pruebas de Django, en el mismo
+  proceso y sin la caché de respuestas de artículos: req/s en serie,
+  p50/p95/p99 y consultas SQL por petición.
+- http (--http): los escenarios GET contra gunicorn con el generador de
+  carga de async_load.py (N conexiones keep-alive concurrentes).
+
+Compara cada escenario con benchmarks/baselines/api_suite_<motor>.json y
+termina con código 1 si hay una regresión: más consultas que la línea base,
+p95 por encima o req/s por debajo de la tolerancia, o respuestas con error.
+Los tiempos dependen de la máquina: la línea base se guarda (--save-baseline)
+en la misma máquina que la compara; con --queries-only solo se comparan las
+consultas, que no dependen de ella: esa línea base (--save-baseline
+--queries-only) está versionada y, si falta, el script termina con código 1.
+Usar una base de datos de pruebas.
+
+    python benchmarks/api_suite.py --posts 2000 --iterations 50
+    python benchmarks/api_suite.py --http --concurrency 16 --duration 5
+    python benchmarks/api_suite.py --save-baseline
+    python benchmarks/api_suite.py --queries-only   # en CI
+    python benchmarks/api_suite.py --queries-only --save-baseline
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import sys
+import time
+from datetime import timedelta
+from pathlib import Path
+
+from async_load import measure, percentile, start_server, wait_until_ready
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+BASELINES_DIR = Path(__file__).resolve().parent / 'baselines'
+SEED_MARK = 'benchmark'
+# Diferencias de p95 menores que esto son ruido en respuestas de pocos ms
+MIN_DELTA_MS = 2.0
+PASSWORD = 'Benchmark-2024!'
+
+# nombre, rol, método, ruta, cuerpo, fracción de las iteraciones
+SCENARIOS = [
+    ('posts_lista', 'lector', 'GET', '/api/post/posts/', None, 1),
+    ('posts_categoria', 'lector', 'GET', '/api/post/posts/?categoria={categoria}', None, 1),
+    ('posts_autor', 'lector', 'GET', '/api/post/posts/?autor_prefijo=autor', None, 1),
+    ('posts_busqueda', 'lector', 'GET', '/api/post/posts/search/?q=python', None, 1),
+    ('posts_staff', 'staff', 'GET', '/api/post/posts/', None, 1),
+    ('post_detalle', 'lector', 'GET', '/api/post/posts/{post}/', None, 1),
+    ('post_detalle_html', 'lector', 'GET', '/api/post/posts/{post}/?format=html', None, 1),
+    ('categorias', 'lector', 'GET', '/api/post/categorias/', None, 1),
+    ('usuarios', 'staff', 'GET', '/api/users/users/', None, 1),
+    ('perfil', 'lector', 'GET', '/api/users/perfil/', None, 1),
+    # El hash de la contraseña domina: menos repeticiones
+    ('login', 'anonimo', 'POST', '/api/auth/login/',
+     {'username': 'benchmark-lector-0', 'password': PASSWORD}, 0.2),
+]
+
+MARKDOWN = '''# Artículo {n}
+
+Texto de prueba con **negrita**, *cursiva* y `código` sobre python y django.
+
+## Sección
+
+- Elemento uno del artículo {n}
+- Elemento dos con [enlace](https://example.com/{n})
+
+```python
+def articulo_{n}():
+    return {n}
+```
+
+> Cita del artículo {n}.
+'''
+
+
+def setup_django():
+    sys.path.insert(0, str(BASE_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+    import django
+    django.setup()
+
+
+def seed_users(readers, writers):
+    from django.contrib.auth.hashers import make_password
+    from apps.users.models import User
+
+    unusable = make_password(None)
+    users = [User(username=f'benchmark-lector-{n}', email=f'benchmark-lector-{n}@example.com',
+                  first_name=f'Lector{n}', last_name='Benchmark', password=unusable,
+                  created_by=SEED_MARK)
+             for n in range(readers)]
+    users += [User(username=f'benchmark-autor-{n}', email=f'benchmark-autor-{n}@example.com',
+                   first_name=f'Autor{n}', last_name='Benchmark', password=unusable,
+                   is_writer=True, created_by=SEED_MARK)
+              for n in range(writers)]
+    users.append(User(username='benchmark-staff', email='benchmark-staff@example.com',
+                      first_name='Staff', last_name='Benchmark', password=unusable,
+                      is_staff=True, created_by=SEED_MARK))
+    User.objects.bulk_create(users, batch_size=1000)
+    # Solo el usuario del escenario de login con contraseña real
+    login = User.objects.get(username='benchmark-lector-0')
+    login.set_password(PASSWORD)
+    login.save(update_fields=['password'])
+
+
+def seed_posts(posts, media, categories, batch_size=500):
+    from django.utils import timezone
+    from apps.post.bulk import after_bulk_write
+    from apps.post.models.contenido_multimedia import ContenidoMultimedia
+    from apps.post.models.post import Post
+    from apps.users.models import User
+
+    authors = list(User.objects.filter(created_by=SEED_MARK, is_writer=True))
+    now = timezone.now()
+    for start in range(0, posts, batch_size):
+        batch = []
+        for n in range(start + 1, min(posts, start + batch_size) + 1):
+            kind = n % 10
+            estado = 'publicado' if kind < 7 else 'borrador' if kind < 9 else 'archivado'
+            post = Post(
+                autor=authors[n % len(authors)], category=categories[(n // 7) % len(categories)],
+                titulo=f'Benchmark {n}', description=f'Artículo de benchmark {n}',
+                contenido=MARKDOWN.format(n=n), estado=estado, palabras_clave='python, django',
+                fecha_publicacion=None if estado == 'borrador' else
+                now - timedelta(days=n % 1095, seconds=n % 86400),
+                is_active=estado != 'archivado', created_by=SEED_MARK)
+            post.prepare_save()
+            batch.append(post)
+        Post.objects.bulk_create(batch)
+        ids = list(Post.objects.filter(
+            titulo__in=[post.titulo for post in batch]).values_list('pk', flat=True))
+        ContenidoMultimedia.objects.bulk_create([
+            ContenidoMultimedia(articulo_id=post_id, tipo='imagen',
+                                archivo=f'benchmark/{post_id}-{index}.jpg',
+                                descripcion=f'Imagen {index}', estado_procesamiento='listo',
+                                mime_type='image/jpeg', created_by=SEED_MARK)
+            for post_id in ids for index in range(media)
+        ])
+        after_bulk_write(ids, [category.pk for category in categories])
+
+
+def seed(args):
+    from apps.post.counters import reconcile_counters
+    from apps.post.models.categoria import Categoria
+    from apps.post.models.post import Post
+    from apps.users.models import User
+
+    existing = Post.objects.filter(created_by=SEED_MARK).count()
+    if existing == args.posts and not args.reseed:
+        print(f'Ya hay {existing} artículos sembrados')
+        return
+    start = time.perf_counter()
+    Post.objects.filter(created_by=SEED_MARK).delete()
+    User.objects.filter(created_by=SEED_MARK).delete()
+    Categoria.objects.filter(created_by=SEED_MARK).delete()
+
+    seed_users(args.users, args.writers)
+    categories = [Categoria.objects.create(name=f'Benchmark {n}', created_by=SEED_MARK)
+                  for n in range(args.categories)]
+    seed_posts(args.posts, args.media, categories)
+    reconcile_counters()
+    print(f'Sembrados {args.users} lectores, {args.writers} escritores, '
+          f'{args.categories} categorías y {args.posts} artículos '
+          f'en {time.perf_counter() - start:.1f}s')
+
+
+def get_context():
+    """Valores de las rutas: un artículo publicado y su categoría."""
+    from apps.post.models.post import Post
+
+    post = Post.objects.filter(created_by=SEED_MARK, estado='publicado', is_active=True) \
+        .order_by('pk').first()
+    return {'post': post.pk, 'categoria': post.category_id}
+
+
+def create_tokens():
+    from apps.authentication.models import AuthToken
+    from apps.users.models import User
+
+    return {
+        'lector': AuthToken.objects.create_token(User.objects.get(username='benchmark-lector-0'))[1],
+        'staff': AuthToken.objects.create_token(User.objects.get(username='benchmark-staff'))[1],
+    }
+
+
+def run_client(iterations, tokens, context):
+    from django.conf import settings
+    from django.test import Client
+    from apps.core.query_budget import QueryCounter
+
+    # Sin caché de respuestas: con ella caliente, los escenarios de artículos
+    # de los lectores no consultan la BD y las consultas no medirían nada
+    settings.POST_RESPONSE_CACHE_ALIAS = None
+
+    results = {}
+    for name, role, method, path, body, share in SCENARIOS:
+        headers = {'Authorization': f'Token {tokens[role]}'} if role in tokens else {}
+        client = Client(headers=headers, SERVER_NAME='localhost')
+        url = path.format(**context)
+
+        def send():
+            if method == 'POST':
+                return client.post(url, body, content_type='application/json')
+            return client.get(url)
+
+        for _ in range(3):  # calentamiento: importaciones, cachés
+            send()
+        runs = max(3, int(iterations * share))
+        latencies, queries, errors = [], [], 0
+        start = time.perf_counter()
+        for _ in range(runs):
+            with QueryCounter() as counter:
+                begin = time.perf_counter()
+                response = send()
+                latencies.append(time.perf_counter() - begin)
+            queries.append(counter.count)
+            if response.status_code >= 400:
+                errors += 1
+        elapsed = time.perf_counter() - start
+        results[name] = {
+            'requests': runs,
+            'errors': errors,
+            'rps': round(runs / elapsed, 1),
+            'p50_ms': round(percentile(latencies, 0.5) * 1000, 2),
+            'p95_ms': round(percentile(latencies, 0.95) * 1000, 2),
+            'p99_ms': round(percentile(latencies, 0.99) * 1000, 2),
+            'queries': max(queries),
+        }
+    return results
+
+
+def run_http(args, tokens, context):
+    server = start_server('wsgi', args.port, args.workers)
+    results = {}
+    try:
+        asyncio.run(wait_until_ready('127.0.0.1', args.port))
+        for name, role, method, path, body, share in SCENARIOS:
+            if method != 'GET' or role not in tokens:
+                continue
+            url = f'http://127.0.0.1:{args.port}{path.format(**context)}'
+            results[name] = asyncio.run(
+                measure(url, tokens[role], args.concurrency, args.duration))
+    finally:
+        server.terminate()
+        server.wait()
+    return results
+
+
+def compare(results, baseline, tolerance, queries_only):
+    """Lista de regresiones (fase, escenario, motivo)."""
+    regressions = []
+    for phase, scenarios in results.items():
+        for name, current in scenarios.items():
+            if current['errors']:
+                regressions.append((phase, name, f"{current['errors']} respuestas con error"))
+            previous = baseline.get(phase, {}).get(name)
+            if previous is None:
+                if queries_only and 'queries' in current:
+                    regressions.append((phase, name, 'sin línea base'))
+                continue
+            if 'queries' in current and current['queries'] > previous['queries']:
+                regressions.append((phase, name, f"consultas {previous['queries']} -> {current['queries']}"))
+            # Las líneas base de solo consultas no tienen tiempos
+            if queries_only or 'p95_ms' not in previous:
+                continue
+            if current['p95_ms'] > max(previous['p95_ms'] * (1 + tolerance),
+                                       previous['p95_ms'] + MIN_DELTA_MS):
+                regressions.append((phase, name, f"p95 {previous['p95_ms']} -> {current['p95_ms']} ms"))
+            if current['rps'] < previous['rps'] * (1 - tolerance):
+                regressions.append((phase, name, f"req/s {previous['rps']} -> {current['rps']}"))
+    return regressions
+
+
+def print_results(results, baseline):
+    for phase, scenarios in results.items():
+        print(f"\n== {phase}")
+        print(f"{'escenario':<20}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+              f"{'consultas':>11}{'base p95':>10}{'errores':>9}")
+        for name, result in scenarios.items():
+            previous = baseline.get(phase, {}).get(name, {})
+            print(f"{name:<20}{result['rps']:>10}{result['p50_ms']:>10}{result['p95_ms']:>10}"
+                  f"{result['p99_ms']:>10}{result.get('queries', '-'):>11}"
+                  f"{previous.get('p95_ms', '-'):>10}{result['errors']:>9}")
+
+
+def run(args):
+    from django.db import connection
+    from apps.authentication.models import AuthToken
+
+    if not args.skip_seed:
+        seed(args)
+    context = get_context()
+    tokens = create_tokens()
+    try:
+        results = {'cliente': run_client(args.iterations, tokens, context)}
+        if args.http:
+            results['http'] = run_http(args, tokens, context)
+    finally:
+        AuthToken.objects.filter(user__created_by=SEED_MARK).delete()
+
+    baseline_path = Path(args.baseline or BASELINES_DIR / f'api_suite_{connection.vendor}.json')
+    baseline = json.loads(baseline_path.read_text()) if baseline_path.exists() else {}
+    print_results(results, baseline)
+
+    if args.save_baseline:
+        meta = {'vendor': connection.vendor, 'posts': args.posts}
+        if args.queries_only:
+            # Independiente de la máquina: se puede versionar
+            saved = {phase: {name: {'queries': result['queries']}
+                             for name, result in scenarios.items() if 'queries' in result}
+                     for phase, scenarios in results.items()}
+        else:
+            meta.update(python=platform.python_version(), cpus=os.cpu_count(),
+                        iterations=args.iterations)
+            saved = results
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline_path.write_text(json.dumps({'meta': meta, **saved}, indent=2) + '\n')
+        print(f'\nLínea base guardada en {baseline_path}')
+        return 0
+
+    if not baseline:
+        print(f'\nSin línea base en {baseline_path}: se crea con --save-baseline')
+        # En CI (--queries-only) falta la referencia: no se puede dar por bueno
+        return 1 if args.queries_only else 0
+    regressions = compare(results, baseline, args.tolerance, args.queries_only)
+    if regressions:
+        print('\nREGRESIONES:')
+        for phase, name, reason in regressions:
+            print(f'  {phase}/{name}: {reason}')
+        return 1
+    print(f'\nSin regresiones respecto a {baseline_path}')
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--users', type=int, default=200, help='Lectores')
+    parser.add_argument('--writers', type=int, default=20)
+    parser.add_argument('--categories', type=int, default=10)
+    parser.add_argument('--posts', type=int, default=2000)
+    parser.add_argument('--media', type=int, default=2, help='Filas de multimedia por artículo')
+    parser.add_argument('--skip-seed', action='store_true')
+    parser.add_argument('--reseed', action='store_true', help='Vuelve a sembrar aunque ya haya datos')
+    parser.add_argument('--iterations', type=int, default=50, help='Peticiones por escenario (cliente)')
+    parser.add_argument('--http', action='store_true', help='Mide también contra gunicorn')
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=5)
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--port', type=int, default=8200)
+    parser.add_argument('--baseline', help='Archivo de línea base (por defecto, según el motor)')
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='Margen relativo para p95 y req/s (0.25 = 25 %%)')
+    parser.add_argument('--queries-only', action='store_true',
+                        help='Compara solo las consultas por petición')
+    args = parser.parse_args()
+    setup_django()
+    sys.exit(run(args))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,201 @@
+"""
+Carga sobre los listados de lectura: WSGI (gunicorn) frente a ASGI (uvicorn).
+
+Arranca gunicorn con config.wsgi (vistas DRF en /api/post/...) y uvicorn con
+config.asgi (vistas asíncronas en /api/async/...), con el mismo número de
+workers, y lanza contra cada uno N conexiones keep-alive concurrentes
+durante unos segundos desde un generador de carga asyncio. Con --wsgi-url /
+--asgi-url se miden servidores ya arrancados en lugar de lanzarlos.
+
+Requisitos: gunicorn y uvicorn instalados y la base de datos con las tablas
+creadas (las mismas settings que usarán los servidores).
+
+    python benchmarks/async_load.py --concurrency 64 --duration 15 --workers 4
+    python benchmarks/async_load.py --wsgi-url http://api:8000/api/post/posts/ \\
+        --asgi-url http://api:8001/api/async/posts/ --token ...
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from urllib.parse import urlsplit
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+TARGETS = {
+    'wsgi': ('/api/post/posts/', '/api/post/categorias/'),
+    'asgi': ('/api/async/posts/', '/api/async/categorias/'),
+}
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def setup_django():
+    sys.path.insert(0, str(BASE_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+    import django
+    django.setup()
+
+
+def create_token():
+    from apps.authentication.models import AuthToken
+    from apps.users.models import User
+
+    user, _ = User.objects.get_or_create(
+        username='benchmark', defaults={'email': 'benchmark@example.com'})
+    return user, AuthToken.objects.create_token(user)[1]
+
+
+def start_server(kind, port, workers):
+    if kind == 'wsgi':
+        command = [sys.executable, '-m', 'gunicorn', 'config.wsgi:application',
+                   '--bind', f'127.0.0.1:{port}', '--workers', str(workers),
+                   '--worker-class', 'gthread', '--threads', '4', '--log-level', 'warning']
+    else:
+        command = [sys.executable, '-m', 'uvicorn', 'config.asgi:application',
+                   '--host', '127.0.0.1', '--port', str(port), '--workers', str(workers),
+                   '--log-level', 'warning', '--no-access-log']
+    return subprocess.Popen(command, cwd=BASE_DIR, env=dict(os.environ))
+
+
+async def wait_until_ready(host, port, timeout=20):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            _, writer = await asyncio.open_connection(host, port)
+            writer.close()
+            return
+        except OSError:
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f'El servidor en {host}:{port} no responde')
+
+
+async def read_response(reader):
+    head = await reader.readuntil(b'\r\n\r\n')
+    lines = head.decode('latin-1').split('\r\n')
+    status = int(lines[0].split()[1])
+    headers = {}
+    for line in lines[1:]:
+        if ':' in line:
+            name, value = line.split(':', 1)
+            headers[name.strip().lower()] = value.strip()
+    if 'content-length' in headers:
+        await reader.readexactly(int(headers['content-length']))
+    elif headers.get('transfer-encoding') == 'chunked':
+        while True:
+            size = int((await reader.readuntil(b'\r\n')).split(b';')[0], 16)
+            await reader.readexactly(size + 2)
+            if size == 0:
+                break
+    return status, headers.get('connection', '').lower() != 'close'
+
+
+async def client(url, token, deadline, latencies, errors):
+    parts = urlsplit(url)
+    path = parts.path + (f'?{parts.query}' if parts.query else '')
+    request = (f'GET {path} HTTP/1.1\r\nHost: {parts.netloc}\r\n'
+               f'Authorization: Token {token}\r\nAccept: application/json\r\n\r\n').encode()
+    reader = writer = None
+    while time.perf_counter() < deadline:
+        try:
+            if writer is None:
+                reader, writer = await asyncio.open_connection(parts.hostname, parts.port or 80)
+            start = time.perf_counter()
+            writer.write(request)
+            status, keep_alive = await read_response(reader)
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                errors.append(status)
+            if not keep_alive:
+                writer.close()
+                writer = None
+        except (OSError, asyncio.IncompleteReadError):
+            errors.append('conexión')
+            writer = None
+    if writer is not None:
+        writer.close()
+
+
+async def measure(url, token, concurrency, duration):
+    # Calentamiento: carga el código de las vistas y la caché de tokens
+    await asyncio.gather(*(client(url, token, time.perf_counter() + 1, [], [])
+                           for _ in range(min(concurrency, 8))))
+    latencies, errors = [], []
+    start = time.perf_counter()
+    deadline = start + duration
+    await asyncio.gather(*(client(url, token, deadline, latencies, errors)
+                           for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    return {
+        'requests': len(latencies),
+        'errors': len(errors),
+        'rps': round(len(latencies) / elapsed, 1),
+        'p50_ms': round(percentile(latencies, 0.5) * 1000, 2),
+        'p95_ms': round(percentile(latencies, 0.95) * 1000, 2),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 2),
+    }
+
+
+def run(args):
+    user = None
+    token = args.token
+    if token is None:
+        setup_django()
+        user, token = create_token()
+
+    urls, servers = {}, []
+    for offset, kind in enumerate(('wsgi', 'asgi')):
+        given = getattr(args, f'{kind}_url')
+        if given:
+            urls[kind] = given
+            continue
+        port = args.port + offset
+        servers.append(start_server(kind, port, args.workers))
+        urls[kind] = f'http://127.0.0.1:{port}{TARGETS[kind][args.endpoint == "categorias"]}'
+
+    results = {}
+    try:
+        for kind, url in urls.items():
+            parts = urlsplit(url)
+            asyncio.run(wait_until_ready(parts.hostname, parts.port or 80))
+            results[kind] = asyncio.run(
+                measure(url, token, args.concurrency, args.duration))
+    finally:
+        for server in servers:
+            server.terminate()
+            server.wait()
+        if user is not None:
+            user.auth_tokens.all().delete()
+
+    print(f"{'servidor':<10}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}"
+          f"{'p99 ms':>10}{'errores':>10}")
+    for kind, result in results.items():
+        print(f"{kind:<10}{result['rps']:>10}{result['p50_ms']:>10}{result['p95_ms']:>10}"
+              f"{result['p99_ms']:>10}{result['errors']:>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--endpoint', choices=('posts', 'categorias'), default='posts')
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--port', type=int, default=8100,
+                        help='Puerto de gunicorn; uvicorn usa el siguiente')
+    parser.add_argument('--wsgi-url')
+    parser.add_argument('--asgi-url')
+    parser.add_argument('--token', help='Token existente (si no, se crea uno)')
+    args = parser.parse_args()
+    run(args)
+
+
+if __name__ == '__main__':
+    main()
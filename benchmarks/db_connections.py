@@ -0,0 +1,146 @@
+"""
+Peticiones por segundo según la estrategia de conexión a PostgreSQL.
+
+Cada perfil se ejecuta en un subproceso con config.settings_production y
+sus variables de entorno. Varios hilos (como los de un worker gthread de
+gunicorn) lanzan peticiones autenticadas con el cliente de pruebas de
+Django, que emite request_started/request_finished: con DB_CONN_MAX_AGE=0
+cada petición abre y cierra su conexión, igual que detrás de gunicorn.
+
+Requisitos: PostgreSQL local con las tablas creadas
+(`DJANGO_SETTINGS_MODULE=config.settings_production manage.py migrate`)
+y, para el perfil 'pool', psycopg 3 con psycopg_pool.
+
+    DJANGO_SECRET_KEY=bench DB_PASSWORD=postgres \\
+        python benchmarks/db_connections.py --requests 3000 --threads 8
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+PROFILES = {
+    # Situación anterior: una conexión nueva por petición
+    'none': {'DB_CONN_MAX_AGE': '0', 'DB_POOL': '0'},
+    'persistent': {'DB_CONN_MAX_AGE': '60', 'DB_POOL': '0', 'DB_CONN_HEALTH_CHECKS': '1'},
+    'pool': {'DB_CONN_MAX_AGE': '0', 'DB_POOL': '1'},
+}
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def run_child(args):
+    sys.path.insert(0, str(BASE_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings_production')
+    import django
+    django.setup()
+
+    from django.conf import settings
+    from django.db import connections
+    from django.test import Client
+    from apps.authentication.models import AuthToken
+    from apps.users.models import User
+
+    # Sin caché de respuestas: cada petición llega a la base de datos
+    settings.POST_RESPONSE_CACHE_ALIAS = None
+    user, _ = User.objects.get_or_create(
+        username='benchmark', defaults={'email': 'benchmark@example.com'})
+    _, key = AuthToken.objects.create_token(user)
+    connections.close_all()
+
+    per_thread = args.requests // args.threads
+    latencies, errors = [], []
+    lock = threading.Lock()
+
+    def worker():
+        client = Client(HTTP_AUTHORIZATION=f'Token {key}')
+        local, failed = [], 0
+        for _ in range(per_thread):
+            start = time.perf_counter()
+            response = client.get(args.path)
+            local.append(time.perf_counter() - start)
+            if response.status_code != 200:
+                failed += 1
+        connections.close_all()
+        with lock:
+            latencies.extend(local)
+            errors.append(failed)
+
+    # Calentamiento: importa vistas, llena la caché de tokens
+    warmup = Client(HTTP_AUTHORIZATION=f'Token {key}')
+    for _ in range(20):
+        warmup.get(args.path)
+
+    threads = [threading.Thread(target=worker) for _ in range(args.threads)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    AuthToken.objects.filter(user=user).delete()
+    print(json.dumps({
+        'requests': len(latencies),
+        'errors': sum(errors),
+        'seconds': round(elapsed, 3),
+        'rps': round(len(latencies) / elapsed, 1),
+        'p50_ms': round(percentile(latencies, 0.5) * 1000, 2),
+        'p95_ms': round(percentile(latencies, 0.95) * 1000, 2),
+    }))
+
+
+def run_profiles(args):
+    results = {}
+    for name in args.profiles.split(','):
+        env = dict(os.environ, **PROFILES[name])
+        env.setdefault('DJANGO_ALLOWED_HOSTS', 'testserver,localhost')
+        env['DJANGO_SETTINGS_MODULE'] = 'config.settings_production'
+        command = [sys.executable, __file__, '--child', '--path', args.path,
+                   '--requests', str(args.requests), '--threads', str(args.threads)]
+        output = subprocess.run(command, env=env, capture_output=True, text=True)
+        if output.returncode != 0:
+            print(f'{name}: error\n{output.stderr}', file=sys.stderr)
+            continue
+        results[name] = json.loads(output.stdout.strip().splitlines()[-1])
+
+    print(f"{'perfil':<12}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'errores':>10}")
+    for name, result in results.items():
+        print(f"{name:<12}{result['rps']:>10}{result['p50_ms']:>10}"
+              f"{result['p95_ms']:>10}{result['errors']:>10}")
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--profiles', default='none,persistent,pool',
+                        help='Perfiles separados por comas: %s' % ', '.join(PROFILES))
+    # Lectura que consulta la BD en cada petición (las categorías se sirven
+    # del catálogo en memoria)
+    parser.add_argument('--path', default='/api/post/posts/?pagination=cursor')
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--output', help='Guardar los resultados en JSON')
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args)
+    else:
+        run_profiles(args)
+
+
+if __name__ == '__main__':
+    main()
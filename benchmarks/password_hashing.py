@@ -0,0 +1,121 @@
+"""
+Inicios de sesión por segundo y por núcleo según el hasher de contraseñas.
+
+Para cada hasher de PASSWORD_HASHERS (los que no tienen su biblioteca
+instalada, p. ej. Argon2 sin argon2-cffi, se omiten) calcula un hash con
+los parámetros configurados y mide su verificación, que es lo que cuesta un
+inicio de sesión:
+
+- serie: ms por verificación en un solo hilo.
+- pool: verificaciones por segundo a través de apps.authentication.hashing
+  con --threads hilos lanzando inicios de sesión a la vez, y su reparto por
+  núcleo (os.cpu_count()).
+
+No usa la base de datos. Para el login completo (consulta, token y
+respuesta) está el escenario 'login' de api_suite.py.
+
+    python benchmarks/password_hashing.py --duration 5 --threads 8
+    python benchmarks/password_hashing.py --hasher scrypt --workers 2
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+PASSWORD = 'Benchmark-2024!'
+
+
+def setup_django():
+    sys.path.insert(0, str(BASE_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+    import django
+    django.setup()
+
+
+def available_hashers(names=None):
+    from django.contrib.auth.hashers import get_hashers
+
+    hashers = []
+    for hasher in get_hashers():
+        if names and hasher.algorithm not in names:
+            continue
+        try:
+            if hasher.library:
+                hasher._load_library()
+        except ValueError as exc:
+            print(f'{hasher.algorithm}: omitido ({exc})')
+            continue
+        hashers.append(hasher)
+    return hashers
+
+
+def measure_serial(encoded, iterations):
+    from django.contrib.auth.hashers import verify_password
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        verify_password(PASSWORD, encoded)
+    return (time.perf_counter() - start) / iterations * 1000
+
+
+def measure_pool(encoded, threads, duration):
+    from apps.authentication.hashing import HashingBusy, verify_password
+
+    done, busy = [0] * threads, [0] * threads
+    deadline = time.perf_counter() + duration
+
+    def worker(n):
+        while time.perf_counter() < deadline:
+            try:
+                verify_password(PASSWORD, encoded)
+                done[n] += 1
+            except HashingBusy:
+                busy[n] += 1
+
+    start = time.perf_counter()
+    workers = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    return sum(done) / elapsed, sum(busy)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--hasher', action='append',
+                        help='Algoritmo a medir (scrypt, argon2, pbkdf2_sha256...); repetible')
+    parser.add_argument('--iterations', type=int, default=10, help='Verificaciones en serie')
+    parser.add_argument('--threads', type=int, default=8, help='Inicios de sesión concurrentes')
+    parser.add_argument('--duration', type=float, default=5, help='Segundos por hasher (pool)')
+    parser.add_argument('--workers', type=int, help='PASSWORD_HASHING_WORKERS (por defecto, los núcleos)')
+    args = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+    from apps.authentication.hashing import get_pool
+
+    if args.workers:
+        settings.PASSWORD_HASHING_WORKERS = args.workers
+    # Todos los hilos caben en la cola: se mide el rendimiento, no los 503
+    settings.PASSWORD_HASHING_QUEUE = max(args.threads, getattr(settings, 'PASSWORD_HASHING_QUEUE', 0))
+    settings.PASSWORD_HASHING_TIMEOUT = None
+    pool = get_pool()
+    cores = os.cpu_count() or 1
+
+    print(f'núcleos={cores} workers={pool.executor._max_workers} hilos={args.threads}')
+    print(f'{"hasher":<22} {"ms/verif.":>10} {"serie/s":>9} {"pool/s":>9} {"por núcleo":>11} {"503":>5}')
+    for hasher in available_hashers(args.hasher):
+        encoded = hasher.encode(PASSWORD, hasher.salt())
+        ms = measure_serial(encoded, args.iterations)
+        rate, busy = measure_pool(encoded, args.threads, args.duration)
+        print(f'{hasher.algorithm:<22} {ms:>10.1f} {1000 / ms:>9.1f} {rate:>9.1f} '
+              f'{rate / cores:>11.1f} {busy:>5}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,227 @@
+"""
+Planes (EXPLAIN) y latencias de las consultas del listado de artículos.
+
+Siembra N artículos (1.000.000 por defecto) y ejecuta las mismas formas de
+consulta que PostViewSet y PostFilter: lectores (publicados y activos, con y
+sin categoría, página profunda por cursor), escritores (sus artículos
+activos), staff (todos), el filtro por día de publicación y los filtros
+por nombre de autor (subcadena, inicio del nombre e inicio de un apellido,
+este último un LIKE '% x%' que solo resuelve el índice trigram de
+PostgreSQL).
+
+En PostgreSQL la siembra usa generate_series en el servidor (un INSERT) y
+los planes se obtienen con EXPLAIN ANALYZE; en otros motores se siembra con
+bulk_create y se muestra el EXPLAIN del motor. Usar una base de datos de
+pruebas: las filas sembradas se marcan con created_by='benchmark'.
+
+    DJANGO_SETTINGS_MODULE=config.settings python benchmarks/post_indexes.py --posts 1000000
+    python benchmarks/post_indexes.py --skip-seed --runs 50
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from datetime import timedelta
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+SEED_MARK = 'benchmark'
+AUTHORS = 200
+CATEGORIES = 20
+
+
+def setup_django():
+    sys.path.insert(0, str(BASE_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+    import django
+    django.setup()
+
+
+def seed_reference_data():
+    from apps.post.models.categoria import Categoria
+    from apps.users.models import User
+
+    authors = []
+    for index in range(AUTHORS):
+        user, _ = User.objects.get_or_create(
+            username=f'benchmark-{index}',
+            defaults={'email': f'benchmark-{index}@example.com',
+                      'first_name': f'Autor{index}', 'last_name': f'Apellido{index}',
+                      'is_writer': True, 'created_by': SEED_MARK})
+        authors.append(user)
+    categories = [
+        Categoria.objects.get_or_create(
+            name=f'Benchmark {index}', defaults={'created_by': SEED_MARK})[0]
+        for index in range(CATEGORIES)
+    ]
+    return authors, categories
+
+
+def author_name(user):
+    from apps.core.text import normalize_text
+
+    return normalize_text(f'{user.first_name} {user.last_name}')
+
+
+def seed_postgresql(posts, authors, categories, using):
+    from django.db import connections
+
+    author_ids = [user.pk for user in authors]
+    author_names = [author_name(user) for user in authors]
+    category_ids = [category.pk for category in categories]
+    # 70 % publicados, 20 % borradores (sin fecha), 10 % archivados
+    sql = '''
+        INSERT INTO post_post (
+            autor_id, category_id, titulo, summary, description, slug,
+            contenido, contenido_html, contenido_html_hash, estado,
+            fecha_publicacion, palabras_clave, is_active, autor_nombre,
+            created_date, updated_date, created_by
+        )
+        SELECT
+            (%(authors)s)[1 + n %% cardinality(%(authors)s)],
+            (%(categories)s)[1 + (n / 7) %% cardinality(%(categories)s)],
+            'Benchmark ' || n, NULL, 'benchmark', 'benchmark-' || n,
+            'contenido ' || n, '', '',
+            CASE WHEN n %% 10 < 7 THEN 'publicado'
+                 WHEN n %% 10 < 9 THEN 'borrador' ELSE 'archivado' END,
+            CASE WHEN n %% 10 BETWEEN 7 AND 8 THEN NULL
+                 ELSE now() - (n %% 1095) * interval '1 day'
+                            - (n %% 86400) * interval '1 second' END,
+            '', n %% 10 <> 9, (%(names)s)[1 + n %% cardinality(%(names)s)],
+            now(), now(), %(mark)s
+        FROM generate_series(1, %(posts)s) AS n
+    '''
+    with connections[using].cursor() as cursor:
+        cursor.execute(sql, {'authors': author_ids, 'names': author_names,
+                             'categories': category_ids,
+                             'posts': posts, 'mark': SEED_MARK})
+        cursor.execute('ANALYZE post_post')
+
+
+def seed_generic(posts, authors, categories, using, batch_size=5000):
+    from django.utils import timezone
+    from apps.post.models.post import Post
+
+    now = timezone.now()
+    names = [author_name(user) for user in authors]
+    batch = []
+    for n in range(1, posts + 1):
+        kind = n % 10
+        estado = 'publicado' if kind < 7 else 'borrador' if kind < 9 else 'archivado'
+        batch.append(Post(
+            autor_id=authors[n % len(authors)].pk,
+            category_id=categories[(n // 7) % len(categories)].pk,
+            titulo=f'Benchmark {n}', description='benchmark', slug=f'benchmark-{n}',
+            contenido=f'contenido {n}', estado=estado,
+            fecha_publicacion=None if estado == 'borrador' else
+            now - timedelta(days=n % 1095, seconds=n % 86400),
+            is_active=estado != 'archivado', autor_nombre=names[n % len(authors)],
+            created_by=SEED_MARK))
+        if len(batch) == batch_size:
+            Post.objects.using(using).bulk_create(batch)
+            batch = []
+    if batch:
+        Post.objects.using(using).bulk_create(batch)
+
+
+def seed(posts, using):
+    from apps.core.db import is_postgresql
+    from apps.post.models.post import Post
+
+    existing = Post.objects.using(using).filter(created_by=SEED_MARK).count()
+    if existing >= posts:
+        print(f'Ya hay {existing} artículos sembrados')
+        return
+    authors, categories = seed_reference_data()
+    start = time.perf_counter()
+    Post.objects.using(using).filter(created_by=SEED_MARK).delete()
+    if is_postgresql(using):
+        seed_postgresql(posts, authors, categories, using)
+    else:
+        seed_generic(posts, authors, categories, using)
+    print(f'Sembrados {posts} artículos en {time.perf_counter() - start:.1f}s')
+
+
+def get_query_shapes(using):
+    from apps.post.filters import PostFilter
+    from apps.post.models.post import Post
+    from apps.post.pagination import KeysetPagination
+
+    posts = Post.objects.using(using)
+    sample = posts.filter(created_by=SEED_MARK, estado='publicado').order_by('pk').first()
+    autor_id, category_id = sample.autor_id, sample.category_id
+    autor_index = sample.autor.username.rsplit('-', 1)[1]
+    day = sample.fecha_publicacion.date().isoformat()
+
+    paginator = KeysetPagination()
+    ordering = paginator.get_ordering()
+    visible = posts.filter(estado='publicado', is_active=True)
+    # Cursor a ~90 % del listado: en OFFSET sería la página más cara
+    deep = visible.order_by(*ordering).values('fecha_publicacion', 'id')[
+        visible.count() * 9 // 10]
+    cursor = {'d': deep['fecha_publicacion'], 'i': deep['id'], 'r': False}
+
+    def filtered(data, queryset=visible):
+        return PostFilter(data, queryset=queryset).qs.order_by(*ordering)
+
+    def by_date(queryset):
+        return PostFilter({'fecha_publicacion': day}, queryset=queryset).qs
+
+    return {
+        'lector_lista': visible.order_by(*ordering),
+        'lector_categoria': visible.filter(category_id=category_id).order_by(*ordering),
+        'lector_cursor_profundo': visible.filter(
+            paginator.get_position_filter(cursor)).order_by(*ordering),
+        'lector_dia': by_date(visible).order_by(*ordering),
+        'escritor_lista': posts.filter(autor_id=autor_id, is_active=True).order_by(*ordering),
+        'staff_lista': posts.order_by(*ordering),
+        'staff_dia': by_date(posts).order_by(*ordering),
+        'autor_subcadena': filtered({'autor_nombre': f'ellido{autor_index}'}),
+        'autor_prefijo_nombre': filtered({'autor_prefijo': f'autor{autor_index}'}),
+        'autor_prefijo_apellido': filtered({'autor_prefijo': f'apellido{autor_index}'}),
+    }
+
+
+def run(args):
+    from apps.core.db import is_postgresql
+
+    if not args.skip_seed:
+        seed(args.posts, args.database)
+
+    analyze = is_postgresql(args.database)
+    results = []
+    for name, queryset in get_query_shapes(args.database).items():
+        page = queryset[:args.page_size]
+        list(page.all())  # calentamiento
+        timings = []
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            list(page.all())  # .all(): sin la caché de resultados del queryset
+            timings.append((time.perf_counter() - start) * 1000)
+        results.append((name, statistics.median(timings), max(timings)))
+        if args.explain:
+            print(f'\n== {name}')
+            print(page.explain(analyze=True) if analyze else page.explain())
+
+    print(f"\n{'consulta':<26}{'mediana ms':>12}{'máx ms':>10}")
+    for name, median, worst in results:
+        print(f'{name:<26}{median:>12.2f}{worst:>10.2f}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--posts', type=int, default=1_000_000)
+    parser.add_argument('--skip-seed', action='store_true')
+    parser.add_argument('--runs', type=int, default=20)
+    parser.add_argument('--page-size', type=int, default=10)
+    parser.add_argument('--no-explain', dest='explain', action='store_false')
+    parser.add_argument('--database', default='default')
+    args = parser.parse_args()
+
+    setup_django()
+    run(args)
+
+
+if __name__ == '__main__':
+    main()
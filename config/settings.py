@@ -52,6 +52,7 @@ LOCAL_APPS = [
 INSTALLED_APPS = BASE_APPS + THIRD_APPS + LOCAL_APPS
 
 MIDDLEWARE = [
+    'apps.core.instrumentation.InstrumentationMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -59,8 +60,20 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'apps.core.query_budget.QueryBudgetMiddleware',
+    'apps.core.replicas.ReplicaStickinessMiddleware',
 ]
 
+# Tiempos por petición (SQL, filtrado, serialización, render) en la cabecera
+# Server-Timing y en histogramas por endpoint (GET /api/metricas/, solo
+# staff). INSTRUMENTATION_SERVER_TIMING: 'all', 'staff' u 'off'
+INSTRUMENTATION_ENABLED = True
+INSTRUMENTATION_SERVER_TIMING = 'all' if DEBUG else 'staff'
+
+# Presupuesto de consultas por endpoint (atributo `query_budgets` de cada
+# vista): 'off', 'warn' o 'raise'
+QUERY_BUDGET_MODE = 'warn' if DEBUG else 'off'
+
 ROOT_URLCONF = 'config.urls'
 
 TEMPLATES = [
@@ -97,6 +110,19 @@ DATABASES = {
         },
     }
 }
+
+# Réplicas de lectura: alias de DATABASES a los que se envían las lecturas
+# de las peticiones GET de los ViewSets. Escrituras y autenticación van
+# siempre a 'default'. Para probar en local con dos SQLite:
+#   DATABASES['replica'] = {'ENGINE': 'django.db.backends.sqlite3',
+#                           'NAME': BASE_DIR / 'replica.sqlite3'}
+#   DATABASE_REPLICAS = ['replica']
+# y `manage.py migrate --database replica`.
+DATABASE_ROUTERS = ['apps.core.replicas.ReplicaRouter']
+DATABASE_REPLICAS = []
+# Tras escribir, un usuario lee del primario durante estos segundos
+REPLICA_STICKY_SECONDS = 5
+
 # configuracion en caso de que la base de datos sea sqlite
 
 """
@@ -127,6 +153,34 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Hash de contraseñas: las nuevas usan el primero de la lista; las demás se
+# siguen aceptando y se recalculan con el primero al iniciar sesión
+# (apps.authentication.backends.PooledModelBackend). Argon2 requiere
+# argon2-cffi (`pip install argon2-cffi`).
+PASSWORD_HASHERS = [
+    'apps.authentication.hashers.ScryptPasswordHasher',
+    'apps.authentication.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+]
+# scrypt: N=2^15, r=8, p=3 (32 MiB por hash), uno de los mínimos de OWASP
+PASSWORD_SCRYPT_WORK_FACTOR = 2 ** 15
+PASSWORD_SCRYPT_BLOCK_SIZE = 8
+PASSWORD_SCRYPT_PARALLELISM = 3
+# Argon2id: 2 pasadas sobre 19 MiB con un carril (mínimo de OWASP)
+PASSWORD_ARGON2_TIME_COST = 2
+PASSWORD_ARGON2_MEMORY_COST = 19 * 1024
+PASSWORD_ARGON2_PARALLELISM = 1
+
+AUTHENTICATION_BACKENDS = ['apps.authentication.backends.PooledModelBackend']
+
+# Pool de hashing por proceso (apps.authentication.hashing): hashes a la vez
+# (None: uno por núcleo), en espera y segundos que una petición síncrona
+# espera un hueco antes de responder 503
+PASSWORD_HASHING_WORKERS = None
+PASSWORD_HASHING_QUEUE = 16
+PASSWORD_HASHING_TIMEOUT = 5
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
@@ -154,10 +208,142 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 AUTH_USER_MODEL = 'users.User'
 
 
+# Esquema OpenAPI precalculado (manage.py generate_openapi): las páginas de
+# Swagger UI y ReDoc descargan la especificación de /swagger.json
+OPENAPI_SCHEMA_DIR = BASE_DIR / 'build' / 'openapi'
+SWAGGER_SETTINGS = {'SPEC_URL': 'schema-json'}
+REDOC_SETTINGS = {'SPEC_URL': 'schema-json'}
+
+
 # Media rout
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Los archivos de ContenidoMultimedia y las portadas se guardan por
+# contenido (sha256) en MEDIA_ROOT/blobs/: el mismo archivo subido a varios
+# artículos ocupa una sola vez. `manage.py collect_blobs` borra los que
+# llevan MEDIA_BLOB_GC_GRACE segundos sin referencias
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+    'media': {'BACKEND': 'apps.post.storage.ContentAddressedStorage'},
+}
+MEDIA_BLOB_GC_GRACE = 24 * 60 * 60
+
+# Procesamiento de multimedia en segundo plano (apps.post.tasks)
+MEDIA_THUMBNAIL_SIZE = (480, 480)
+MEDIA_THUMBNAIL_QUALITY = 80
+# Variantes de la portada de los artículos (imagen_portada_srcset). Los
+# formatos que Pillow no sepa escribir se omiten (AVIF necesita Pillow con
+# libavif o el paquete pillow-avif-plugin). Tras cambiarlos:
+# manage.py regenerate_cover_variants --all
+POST_COVER_WIDTHS = (320, 640, 960, 1280)
+POST_COVER_FORMATS = ('avif', 'webp')
+POST_COVER_QUALITY = 80
+# Subidas por partes (/api/post/subidas/): tamaño máximo de cada parte y
+# del archivo, y segundos sin actividad tras los que caducan
+# (manage.py purge_uploads borra las caducadas)
+MEDIA_UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+MEDIA_UPLOAD_MAX_SIZE = 2 * 1024 ** 3
+MEDIA_UPLOAD_EXPIRATION = 24 * 60 * 60
+# ffprobe para los metadatos de video (por defecto el del PATH)
+MEDIA_FFPROBE_PATH = None
+
+# Trabajos en segundo plano (apps.core.jobs). Con DatabaseBackend se
+# ejecutan con `manage.py run_jobs [--queue media]`; ImmediateBackend los
+# ejecuta en el propio proceso al confirmar la transacción.
+JOBS_BACKEND = 'apps.core.jobs.DatabaseBackend'
+JOBS_MAX_ATTEMPTS = 3
+# Espera antes del reintento n: JOBS_RETRY_BACKOFF * 2**(n-1) segundos
+JOBS_RETRY_BACKOFF = 30
+JOBS_POLL_INTERVAL = 2
+# Un trabajo en curso sin latido durante este tiempo se considera
+# abandonado; el worker lo renueva cada JOBS_HEARTBEAT_INTERVAL segundos
+JOBS_LOCK_TIMEOUT = 15 * 60
+JOBS_HEARTBEAT_INTERVAL = 60
+JOBS_DELETE_COMPLETED = True
+
+# Servicio de medios (apps.post.views.media_view): los archivos de artículos
+# no publicados solo los ven quienes pueden ver el artículo. MEDIA_SENDFILE
+# delega el envío en el servidor web: 'x-accel-redirect' (nginx, con una
+# location interna en MEDIA_ACCEL_REDIRECT_PREFIX) o 'x-sendfile' (Apache)
+MEDIA_SENDFILE = None
+MEDIA_ACCEL_REDIRECT_PREFIX = '/protected-media/'
+MEDIA_CACHE_MAX_AGE = 60 * 60
+# Prefijos servidos sin comprobar el artículo (imágenes del editor Markdown)
+MEDIA_PUBLIC_PREFIXES = ('markdownx/',)
+
 # settings.py
 MARKDOWNX_EDITOR_RESIZABLE = True  # Editor redimensionable
 MARKDOWNX_UPLOAD_URLS_PATH = '/markdownx/upload/'  # Ruta para subir imágenes
+# Incrementar para forzar el re-renderizado del HTML de los artículos
+# (manage.py render_contenido)
+POST_MARKDOWN_RENDERER_VERSION = 1
+
+# Paginación de artículos: 'page' (número de página) o 'cursor' (keyset sobre
+# fecha_publicacion, id). Se puede cambiar por petición con ?pagination=
+POST_PAGINATION_MODE = 'page'
+# Conteo total en modo cursor: 'none', 'approx' (PostgreSQL) o 'exact'
+POST_PAGINATION_COUNT = 'none'
+
+# Operaciones masivas (/api/post/posts/bulk/, bulk-archive, bulk-reactivate):
+# elementos por petición y por transacción
+POST_BULK_MAX_ITEMS = 1000
+POST_BULK_CHUNK_SIZE = 200
+
+# Cachés
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# 'post_responses' guarda las respuestas de artículos publicados y sus sellos
+# de versión. LocMemCache es LRU pero local a cada proceso: con varios
+# workers usar un backend compartido, por ejemplo:
+#   'BACKEND': 'apps.core.cache.LRUFileBasedCache',
+#   'LOCATION': os.path.join(BASE_DIR, 'var', 'cache', 'post_responses'),
+# o cualquier servidor compatible con Redis:
+#   'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+#   'LOCATION': 'redis://127.0.0.1:6379/1',
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'post_responses': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'post-responses',
+        'TIMEOUT': 60 * 60,
+        'OPTIONS': {
+            'MAX_ENTRIES': 2000,
+        },
+    },
+}
+
+# Alias de CACHES para la caché de respuestas de artículos (None la desactiva)
+POST_RESPONSE_CACHE_ALIAS = 'post_responses'
+
+# Django REST framework
+REST_FRAMEWORK = {
+    'DEFAULT_AUTHENTICATION_CLASSES': [
+        'apps.authentication.authentication.CachedTokenAuthentication',
+        'rest_framework.authentication.SessionAuthentication',
+    ],
+}
+
+# Tokens de la API: cada proceso cachea token -> usuario durante
+# AUTH_TOKEN_CACHE_TTL segundos. Las invalidaciones (logout, cambios del
+# usuario) se publican como sellos de versión en AUTH_TOKEN_CACHE_ALIAS, que
+# debe ser compartido (Redis, ficheros...) si hay varios procesos
+# (settings_production pone el TTL a 0 sin REDIS_URL).
+AUTH_TOKEN_CACHE_ALIAS = 'default'
+AUTH_TOKEN_CACHE_TTL = 5 * 60
+AUTH_TOKEN_CACHE_MAX_ENTRIES = 10000
+# Cada cuántos segundos se escribe el último uso de los tokens
+AUTH_TOKEN_LAST_USED_INTERVAL = 60
+# Vida de un token desde el inicio de sesión (None: sin caducidad) y
+# sesiones abiertas por usuario: al pasar del límite se cierran las más
+# antiguas. `manage.py purge_tokens` borra los caducados.
+AUTH_TOKEN_MAX_AGE = 30 * 24 * 60 * 60
+AUTH_TOKEN_MAX_PER_USER = 10
+
+# Catálogo de categorías en memoria de cada proceso (apps.post.catalog):
+# se valida con un sello de versión de este alias, compartido si hay
+# varios procesos (sin él, CATEGORY_CATALOG_CACHE = False lo lee en cada uso)
+CATEGORY_CATALOG_ALIAS = 'default'
+CATEGORY_CATALOG_CACHE = True
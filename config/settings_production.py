@@ -0,0 +1,147 @@
+"""
+Perfil de producción: parte de config/settings.py y toma de variables de
+entorno todo lo que depende del despliegue.
+
+    DJANGO_SETTINGS_MODULE=config.settings_production
+
+Conexiones a PostgreSQL (elegir una estrategia):
+
+- Persistentes (por defecto): DB_CONN_MAX_AGE segundos de reutilización
+  por hilo/worker, con DB_CONN_HEALTH_CHECKS para descartar conexiones
+  caídas antes de usarlas. Funciona con psycopg2.
+- Pool nativo de Django 5.1+ (DB_POOL=true): requiere psycopg 3 con
+  psycopg_pool (`pip install -r requirements-pool.txt`). Las conexiones
+  se comparten entre los hilos del proceso; incompatible con
+  DB_CONN_MAX_AGE > 0.
+- Pool externo (PgBouncer en modo transacción): DB_CONN_MAX_AGE=0 y
+  DB_DISABLE_SERVER_SIDE_CURSORS=true, porque los cursores del lado del
+  servidor (exportaciones con .iterator()) no sobreviven entre transacciones.
+
+Ver benchmarks/db_connections.py para comparar las opciones.
+"""
+import copy
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+from config.settings import *  # noqa: F401,F403
+from config.settings import CACHES, INSTALLED_APPS, PASSWORD_HASHERS
+
+
+def env(name, default=None):
+    return os.environ.get(name, default)
+
+
+def env_bool(name, default=False):
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def env_int(name, default):
+    value = os.environ.get(name)
+    return int(value) if value not in (None, '') else default
+
+
+def env_list(name, default=()):
+    value = os.environ.get(name)
+    if value is None:
+        return list(default)
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+DEBUG = env_bool('DJANGO_DEBUG', False)
+
+SECRET_KEY = env('DJANGO_SECRET_KEY')
+if not SECRET_KEY:
+    raise ImproperlyConfigured('Falta la variable de entorno DJANGO_SECRET_KEY')
+
+ALLOWED_HOSTS = env_list('DJANGO_ALLOWED_HOSTS', ['localhost'])
+CSRF_TRUSTED_ORIGINS = env_list('DJANGO_CSRF_TRUSTED_ORIGINS')
+
+# psycopg2 no es una app de Django y con psycopg 3 ni siquiera está instalado
+INSTALLED_APPS = [app for app in INSTALLED_APPS if app != 'psycopg2']
+
+# Base de datos
+DB_POOL = env_bool('DB_POOL', False)
+DB_CONN_MAX_AGE = env_int('DB_CONN_MAX_AGE', 0 if DB_POOL else 60)
+if DB_POOL and DB_CONN_MAX_AGE:
+    raise ImproperlyConfigured(
+        'DB_POOL no es compatible con conexiones persistentes (DB_CONN_MAX_AGE debe ser 0)')
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.postgresql',
+        'NAME': env('DB_NAME', 'blog_api_db'),
+        'USER': env('DB_USER', 'postgres'),
+        'PASSWORD': env('DB_PASSWORD', ''),
+        'HOST': env('DB_HOST', 'localhost'),
+        'PORT': env('DB_PORT', '5432'),
+        # -1 = sin límite; 0 = una conexión por petición
+        'CONN_MAX_AGE': None if DB_CONN_MAX_AGE < 0 else DB_CONN_MAX_AGE,
+        'CONN_HEALTH_CHECKS': env_bool('DB_CONN_HEALTH_CHECKS', True),
+        'DISABLE_SERVER_SIDE_CURSORS': env_bool('DB_DISABLE_SERVER_SIDE_CURSORS', False),
+        'OPTIONS': {
+            'options': '-c timezone=UTC',
+            'connect_timeout': env_int('DB_CONNECT_TIMEOUT', 5),
+        },
+    }
+}
+
+if DB_POOL:
+    try:
+        import psycopg_pool  # noqa: F401
+    except ImportError:
+        raise ImproperlyConfigured(
+            'DB_POOL requiere psycopg 3 con psycopg_pool: pip install -r requirements-pool.txt')
+    # Argumentos de psycopg_pool.ConnectionPool
+    DATABASES['default']['OPTIONS']['pool'] = {
+        'min_size': env_int('DB_POOL_MIN_SIZE', 2),
+        'max_size': env_int('DB_POOL_MAX_SIZE', 10),
+        'timeout': env_int('DB_POOL_TIMEOUT', 10),
+    }
+
+# Réplicas de lectura: mismos credenciales que el primario, otro host
+DATABASE_REPLICAS = []
+for index, host in enumerate(env_list('DB_REPLICA_HOSTS')):
+    alias = f'replica_{index + 1}'
+    DATABASES[alias] = dict(copy.deepcopy(DATABASES['default']), HOST=host)
+    DATABASE_REPLICAS.append(alias)
+REPLICA_STICKY_SECONDS = env_int('DB_REPLICA_STICKY_SECONDS', 5)
+
+# Cachés compartidas entre workers (sellos de versión, tokens, respuestas)
+REDIS_URL = env('REDIS_URL')
+if REDIS_URL:
+    CACHES = {
+        alias: {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+            'KEY_PREFIX': alias,
+            'TIMEOUT': config.get('TIMEOUT', 300),
+        }
+        for alias, config in CACHES.items()
+    }
+else:
+    # Sin caché compartida, una escritura solo cambia los sellos del worker
+    # que la hace y los demás servirían respuestas anteriores o seguirían
+    # aceptando tokens cerrados, de contraseñas cambiadas o de usuarios
+    # desactivados: sin caché de respuestas, de tokens ni de categorías
+    POST_RESPONSE_CACHE_ALIAS = None
+    AUTH_TOKEN_CACHE_TTL = 0
+    CATEGORY_CATALOG_CACHE = False
+
+# Tokens de acceso: vida en segundos y sesiones abiertas por usuario
+AUTH_TOKEN_MAX_AGE = env_int('AUTH_TOKEN_MAX_AGE', 30 * 24 * 60 * 60)
+AUTH_TOKEN_MAX_PER_USER = env_int('AUTH_TOKEN_MAX_PER_USER', 10)
+
+QUERY_BUDGET_MODE = env('QUERY_BUDGET_MODE', 'off')
+INSTRUMENTATION_ENABLED = env_bool('INSTRUMENTATION_ENABLED', True)
+INSTRUMENTATION_SERVER_TIMING = env('INSTRUMENTATION_SERVER_TIMING', 'staff')
+
+# Contraseñas: algoritmo de las nuevas ('scrypt' o 'argon2') y pool de hashing
+PASSWORD_HASHER = env('PASSWORD_HASHER', 'scrypt')
+PASSWORD_HASHERS = sorted(
+    PASSWORD_HASHERS, key=lambda path: not path.lower().endswith(f'.{PASSWORD_HASHER}passwordhasher'))
+PASSWORD_HASHING_WORKERS = env_int('PASSWORD_HASHING_WORKERS', None)
+PASSWORD_HASHING_QUEUE = env_int('PASSWORD_HASHING_QUEUE', 16)
@@ -14,25 +14,31 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
+from django.conf import settings
 from django.contrib import admin
 from django.urls import path, include
 
-from drf_yasg.views import get_schema_view
-from drf_yasg import openapi
 from django.urls import re_path
 
-# Configuración de la vista de Swagger
-schema_view = get_schema_view(
-    openapi.Info(
-        title="Blog API",
-        default_version='v1',
-        description="Documentación del Blog API",
-        terms_of_service="https://www.google.com/policies/terms/",
-        contact=openapi.Contact(email="contact@example.com"),
-        license=openapi.License(name="MIT License"),
-    ),
-    public=True,
-)
+from apps.authentication.views import async_views as auth_async_views
+from apps.core.views.metrics_view import MetricasView
+from apps.core.views.openapi_views import SchemaUIView, schema_json, schema_yaml
+from apps.post.views import async_views as post_async_views
+from apps.post.views.media_view import serve_media
+from apps.users.views import async_views as users_async_views
+
+# Lecturas con vistas async nativas (ASGI, ver README)
+async_urlpatterns = [
+    path('posts/', post_async_views.post_list, name='async-post-list'),
+    path('posts/<int:pk>/', post_async_views.post_detail, name='async-post-detail'),
+    path('categorias/', post_async_views.categoria_list, name='async-categoria-list'),
+    path('perfil/', users_async_views.perfil, name='async-perfil'),
+    path('login/', auth_async_views.login, name='async-login'),
+]
+
+# Documentación: el esquema se genera una vez (manage.py generate_openapi) y
+# las páginas de Swagger UI y ReDoc lo descargan de /swagger.json
+schema_view = SchemaUIView
 
 urlpatterns = [
     path('markdownx/', include('markdownx.urls')),
@@ -40,10 +46,14 @@ urlpatterns = [
     path('api/auth/', include('apps.authentication.urls')),
     path('api/post/', include('apps.post.urls')),        # Rutas de blog
     path('api/users/', include('apps.users.urls')),
+    path('api/async/', include(async_urlpatterns)),
+    path('api/metricas/', MetricasView.as_view(), name='metricas'),
+    # Medios con la visibilidad de su artículo (ver serve_media)
+    re_path(r'^%s(?P<path>.+)$' % settings.MEDIA_URL.lstrip('/'), serve_media, name='media'),
     re_path(r'^swagger/$', schema_view.with_ui('swagger',
             cache_timeout=0), name='schema-swagger-ui'),
-    re_path(r'^swagger(?P<format>\.json|\.yaml)$',
-            schema_view.without_ui(cache_timeout=0), name='schema-json'),
+    path('swagger.json', schema_json, name='schema-json'),
+    path('swagger.yaml', schema_yaml, name='schema-yaml'),
     re_path(r'^redoc/$', schema_view.with_ui('redoc',
             cache_timeout=0), name='schema-redoc'),
 ]